@@ -0,0 +1,28 @@
+-- 001 - Indexes for the hot predicates and joins in queries.sql
+-- schema.sql only defines primary and foreign keys; every Queries-page
+-- click used to be a full scan.
+
+-- Que 1: players by country, ordered by name
+CREATE INDEX idx_players_country_name ON players (country, name);
+
+-- Que 3/7/11: format filter; Que 2: start_date range
+CREATE INDEX idx_matches_format_start ON matches (format, start_date);
+CREATE INDEX idx_matches_start_date ON matches (start_date);
+
+-- Que 8/12/13: venue joins (also serves the venue_id foreign key)
+CREATE INDEX idx_matches_venue ON matches (venue_id, series_id);
+
+-- Que 2/3/10/11/14: per-batsman aggregates, covering runs/balls/strike rate
+CREATE INDEX idx_mb_batsman_match ON match_batting (batsman_id, match_id, runs, balls, strike_rate);
+
+-- Que 13: per-bowler aggregates, covering overs/wickets/economy
+CREATE INDEX idx_mbw_bowler_match ON match_bowling (bowler_id, match_id, overs, wickets, economy);
+
+-- Que 5/12/14/15: wins per team
+CREATE INDEX idx_mr_winning_team ON match_result (winning_team_id, match_id);
+
+-- Que 8: series by start date
+CREATE INDEX idx_series_start_date ON series (start_date);
+
+-- Que 9: career stats above a run threshold
+CREATE INDEX idx_ps_runs ON player_stats (runs, player_id, format);
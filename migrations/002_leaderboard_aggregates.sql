@@ -0,0 +1,64 @@
+-- 002 - Summary tables for the leaderboard queries (Que 3, 5, 10, 13, 15)
+-- Maintained incrementally by utils/aggregates.py after each db_loader run.
+
+-- Batting per player, format and match year
+CREATE TABLE IF NOT EXISTS agg_batting_player_year (
+    player_id INT NOT NULL,
+    format VARCHAR(50) NOT NULL,
+    match_year INT NOT NULL,
+    matches INT,
+    innings INT,
+    runs INT,
+    balls INT,
+    dismissals INT,
+    centuries INT,
+    highest INT,
+    strike_rate_sum DOUBLE,
+    strike_rate_count INT,
+    PRIMARY KEY (player_id, format, match_year)
+);
+CREATE INDEX idx_agg_bat_format ON agg_batting_player_year (format, player_id, runs);
+CREATE INDEX idx_agg_bat_year ON agg_batting_player_year (match_year, player_id);
+
+-- Bowling per player, format and match year
+CREATE TABLE IF NOT EXISTS agg_bowling_player_year (
+    player_id INT NOT NULL,
+    format VARCHAR(50) NOT NULL,
+    match_year INT NOT NULL,
+    matches INT,
+    innings INT,
+    overs DOUBLE,
+    balls INT,
+    runs INT,
+    maidens INT,
+    wickets INT,
+    economy_sum DOUBLE,
+    economy_count INT,
+    PRIMARY KEY (player_id, format, match_year)
+);
+CREATE INDEX idx_agg_bowl_format ON agg_bowling_player_year (format, player_id, wickets);
+
+-- Wins per team
+CREATE TABLE IF NOT EXISTS agg_team_wins (
+    team_id INT PRIMARY KEY,
+    wins INT
+);
+
+-- Bowling per bowler and venue, over matches with >= 4 overs bowled
+CREATE TABLE IF NOT EXISTS agg_venue_bowling (
+    bowler_id INT NOT NULL,
+    venue_id INT NOT NULL,
+    matches INT,
+    wickets INT,
+    economy_sum DOUBLE,
+    economy_count INT,
+    PRIMARY KEY (bowler_id, venue_id)
+);
+CREATE INDEX idx_agg_venue_bowl_matches ON agg_venue_bowling (matches, wickets);
+
+-- Toss decision outcomes
+CREATE TABLE IF NOT EXISTS agg_toss_decision (
+    decision VARCHAR(50) PRIMARY KEY,
+    total_matches INT,
+    won_by_toss_winner INT
+);
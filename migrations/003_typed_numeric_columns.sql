@@ -0,0 +1,24 @@
+-- 003 - Typed numeric columns next to the free-text ones
+-- Filled in by db_loader at ingestion (the next load backfills existing
+-- rows), so range filters and sorts no longer need CAST(REPLACE(...)).
+
+-- Venues: "1,32,000" -> 132000, "1864" -> 1864
+ALTER TABLE venues ADD COLUMN capacity_num INT;
+ALTER TABLE venues ADD COLUMN established_year INT;
+CREATE INDEX idx_venues_capacity ON venues (capacity_num);
+
+-- Fall of wickets: score and over as numbers
+ALTER TABLE match_fow ADD COLUMN score_runs INT;
+ALTER TABLE match_fow ADD COLUMN over_num DECIMAL(5,1);
+
+-- Batting career: "183*" -> 183 + not-out flag
+ALTER TABLE player_stats ADD COLUMN highest_runs INT;
+ALTER TABLE player_stats ADD COLUMN highest_not_out BOOLEAN;
+CREATE INDEX idx_ps_highest ON player_stats (highest_runs);
+
+-- Bowling career: "5/23" -> 5 wickets, 23 runs
+ALTER TABLE player_bowling_stats ADD COLUMN bbi_wickets INT;
+ALTER TABLE player_bowling_stats ADD COLUMN bbi_runs INT;
+ALTER TABLE player_bowling_stats ADD COLUMN bbm_wickets INT;
+ALTER TABLE player_bowling_stats ADD COLUMN bbm_runs INT;
+CREATE INDEX idx_pbs_bbi ON player_bowling_stats (bbi_wickets, bbi_runs);
@@ -0,0 +1,83 @@
+-- 004 - Dictionary-encoded dimensions
+-- format / role / country / batting and bowling style are repeated as
+-- free text on every row. Each gets a small lookup table and an integer
+-- surrogate key on the rows that use it; db_loader resolves the keys while
+-- loading (utils/dimensions.py). The text columns stay for the pages that
+-- still read them; the v_* views decode the keys back to names.
+
+CREATE TABLE IF NOT EXISTS dim_format (
+    format_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_role (
+    role_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_country (
+    country_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_bat_style (
+    bat_style_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_bowl_style (
+    bowl_style_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+ALTER TABLE matches ADD COLUMN format_id INT;
+ALTER TABLE player_stats ADD COLUMN format_id INT;
+ALTER TABLE player_bowling_stats ADD COLUMN format_id INT;
+ALTER TABLE players ADD COLUMN role_id INT;
+ALTER TABLE players ADD COLUMN country_id INT;
+ALTER TABLE players ADD COLUMN bat_style_id INT;
+ALTER TABLE players ADD COLUMN bowl_style_id INT;
+
+CREATE INDEX idx_players_country_id ON players (country_id, name);
+CREATE INDEX idx_players_role_id ON players (role_id);
+CREATE INDEX idx_matches_format_id ON matches (format_id, match_id);
+
+-- Backfill from the rows already loaded
+INSERT IGNORE INTO dim_format (name)
+SELECT DISTINCT TRIM(format) FROM matches WHERE TRIM(format) <> ''
+UNION SELECT DISTINCT TRIM(format) FROM player_stats WHERE TRIM(format) <> ''
+UNION SELECT DISTINCT TRIM(format) FROM player_bowling_stats WHERE TRIM(format) <> '';
+INSERT IGNORE INTO dim_role (name)
+SELECT DISTINCT TRIM(role) FROM players WHERE TRIM(role) <> '';
+INSERT IGNORE INTO dim_country (name)
+SELECT DISTINCT TRIM(country) FROM players WHERE TRIM(country) <> '';
+INSERT IGNORE INTO dim_bat_style (name)
+SELECT DISTINCT TRIM(bat_style) FROM players WHERE TRIM(bat_style) <> '';
+INSERT IGNORE INTO dim_bowl_style (name)
+SELECT DISTINCT TRIM(bowl_style) FROM players WHERE TRIM(bowl_style) <> '';
+
+UPDATE matches SET format_id = (SELECT d.format_id FROM dim_format d WHERE d.name = TRIM(matches.format));
+UPDATE player_stats SET format_id = (SELECT d.format_id FROM dim_format d WHERE d.name = TRIM(player_stats.format));
+UPDATE player_bowling_stats SET format_id = (SELECT d.format_id FROM dim_format d WHERE d.name = TRIM(player_bowling_stats.format));
+UPDATE players SET
+    role_id = (SELECT d.role_id FROM dim_role d WHERE d.name = TRIM(players.role)),
+    country_id = (SELECT d.country_id FROM dim_country d WHERE d.name = TRIM(players.country)),
+    bat_style_id = (SELECT d.bat_style_id FROM dim_bat_style d WHERE d.name = TRIM(players.bat_style)),
+    bowl_style_id = (SELECT d.bowl_style_id FROM dim_bowl_style d WHERE d.name = TRIM(players.bowl_style));
+
+-- Decoded views: same columns as the base tables, names taken from the dimensions
+CREATE VIEW v_players AS
+SELECT p.player_id, p.name, p.nickname,
+       r.name AS role, bs.name AS bat_style, bw.name AS bowl_style,
+       p.dob, p.birthplace, c.name AS country, p.image_url
+FROM players p
+LEFT JOIN dim_role r ON r.role_id = p.role_id
+LEFT JOIN dim_country c ON c.country_id = p.country_id
+LEFT JOIN dim_bat_style bs ON bs.bat_style_id = p.bat_style_id
+LEFT JOIN dim_bowl_style bw ON bw.bowl_style_id = p.bowl_style_id;
+
+CREATE VIEW v_matches AS
+SELECT m.match_id, m.series_id, m.name, f.name AS format, m.start_date, m.end_date,
+       m.state, m.status, m.venue_id
+FROM matches m
+LEFT JOIN dim_format f ON f.format_id = m.format_id;
@@ -0,0 +1,16 @@
+-- 005 - Match year on the fact tables (DuckDB)
+-- Same columns as 005_fact_match_year.sql without the indexes: DuckDB keeps
+-- min/max statistics per row group, and the loaders write one match at a
+-- time, so a filter on match_year already skips the row groups of other
+-- years.
+
+ALTER TABLE match_batting ADD COLUMN match_year INT;
+ALTER TABLE match_bowling ADD COLUMN match_year INT;
+ALTER TABLE match_fow ADD COLUMN match_year INT;
+
+UPDATE match_batting SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_batting.match_id), 0);
+UPDATE match_bowling SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_bowling.match_id), 0);
+UPDATE match_fow SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_fow.match_id), 0);
@@ -0,0 +1,82 @@
+-- 005 - Match year on the fact tables, range-partitioned by year (MySQL)
+-- match_batting / match_bowling / match_fow carry the year of their match,
+-- set by db_loader, and are partitioned on it so date-bounded queries only
+-- read the partitions they need. Yearly partitions stop at p2026: later
+-- years must be split out of p_future by utils/partitions.py
+-- (ensure_partitions), which the loaders run before writing facts.
+--
+-- MySQL partitioning does not allow foreign keys, and every unique key must
+-- include the partition column, so the (unnamed, auto-numbered) foreign
+-- keys from schema.sql are dropped and match_year joins the primary key.
+
+-- match_batting
+ALTER TABLE match_batting DROP FOREIGN KEY match_batting_ibfk_1, DROP FOREIGN KEY match_batting_ibfk_2;
+ALTER TABLE match_batting ADD COLUMN match_year SMALLINT NOT NULL DEFAULT 0;
+UPDATE match_batting mb JOIN matches m ON m.match_id = mb.match_id
+SET mb.match_year = YEAR(m.start_date)
+WHERE m.start_date IS NOT NULL;
+ALTER TABLE match_batting DROP PRIMARY KEY, ADD PRIMARY KEY (match_id, innings_id, batsman_id, match_year);
+ALTER TABLE match_batting PARTITION BY RANGE (match_year) (
+    PARTITION p_hist VALUES LESS THAN (2015),
+    PARTITION p2015 VALUES LESS THAN (2016),
+    PARTITION p2016 VALUES LESS THAN (2017),
+    PARTITION p2017 VALUES LESS THAN (2018),
+    PARTITION p2018 VALUES LESS THAN (2019),
+    PARTITION p2019 VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
+
+-- match_bowling
+ALTER TABLE match_bowling DROP FOREIGN KEY match_bowling_ibfk_1, DROP FOREIGN KEY match_bowling_ibfk_2;
+ALTER TABLE match_bowling ADD COLUMN match_year SMALLINT NOT NULL DEFAULT 0;
+UPDATE match_bowling mbw JOIN matches m ON m.match_id = mbw.match_id
+SET mbw.match_year = YEAR(m.start_date)
+WHERE m.start_date IS NOT NULL;
+ALTER TABLE match_bowling DROP PRIMARY KEY, ADD PRIMARY KEY (match_id, innings_id, bowler_id, match_year);
+ALTER TABLE match_bowling PARTITION BY RANGE (match_year) (
+    PARTITION p_hist VALUES LESS THAN (2015),
+    PARTITION p2015 VALUES LESS THAN (2016),
+    PARTITION p2016 VALUES LESS THAN (2017),
+    PARTITION p2017 VALUES LESS THAN (2018),
+    PARTITION p2018 VALUES LESS THAN (2019),
+    PARTITION p2019 VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
+
+-- match_fow
+ALTER TABLE match_fow DROP FOREIGN KEY match_fow_ibfk_1, DROP FOREIGN KEY match_fow_ibfk_2;
+ALTER TABLE match_fow ADD COLUMN match_year SMALLINT NOT NULL DEFAULT 0;
+UPDATE match_fow mf JOIN matches m ON m.match_id = mf.match_id
+SET mf.match_year = YEAR(m.start_date)
+WHERE m.start_date IS NOT NULL;
+ALTER TABLE match_fow DROP PRIMARY KEY, ADD PRIMARY KEY (match_id, innings_id, fow_order, match_year);
+ALTER TABLE match_fow PARTITION BY RANGE (match_year) (
+    PARTITION p_hist VALUES LESS THAN (2015),
+    PARTITION p2015 VALUES LESS THAN (2016),
+    PARTITION p2016 VALUES LESS THAN (2017),
+    PARTITION p2017 VALUES LESS THAN (2018),
+    PARTITION p2018 VALUES LESS THAN (2019),
+    PARTITION p2019 VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
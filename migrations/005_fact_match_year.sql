@@ -0,0 +1,20 @@
+-- 005 - Match year on the fact tables
+-- match_batting / match_bowling / match_fow carry the year of their match,
+-- set by db_loader, so date-bounded queries can filter the facts directly.
+-- MySQL partitions the tables on it (005_fact_match_year.mysql.sql); here an
+-- index leading with the year does the pruning.
+
+ALTER TABLE match_batting ADD COLUMN match_year INT;
+ALTER TABLE match_bowling ADD COLUMN match_year INT;
+ALTER TABLE match_fow ADD COLUMN match_year INT;
+
+CREATE INDEX idx_mb_year_batsman ON match_batting (match_year, batsman_id, runs, balls);
+CREATE INDEX idx_mbw_year_bowler ON match_bowling (match_year, bowler_id);
+CREATE INDEX idx_mf_year ON match_fow (match_year);
+
+UPDATE match_batting SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_batting.match_id), 0);
+UPDATE match_bowling SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_bowling.match_id), 0);
+UPDATE match_fow SET match_year = COALESCE(
+    (SELECT YEAR(m.start_date) FROM matches m WHERE m.match_id = match_fow.match_id), 0);
@@ -0,0 +1,9 @@
+-- 006 - Data version stamp for the query result cache
+-- One row, bumped by utils/result_cache.bump_data_version() after every load
+-- or streamed refresh commits. Cached results are keyed on it.
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL,
+    updated_at DATETIME
+);
@@ -0,0 +1,127 @@
+-- 007 - Drop the text columns replaced by dimension keys (DuckDB)
+-- Same as 007_drop_dimension_text.sql, but DuckDB cannot drop a column
+-- in the same transaction that drops the indexes covering later columns,
+-- so players and matches are rebuilt like the career stats tables.
+
+-- players
+CREATE TABLE players_new (
+    player_id INT PRIMARY KEY,
+    name VARCHAR(255),
+    nickname VARCHAR(255),
+    dob VARCHAR(100),
+    birthplace VARCHAR(255),
+    image_url VARCHAR(500),
+    role_id INT,
+    country_id INT,
+    bat_style_id INT,
+    bowl_style_id INT
+);
+INSERT INTO players_new
+SELECT player_id, name, nickname, dob, birthplace, image_url, role_id, country_id, bat_style_id, bowl_style_id
+FROM players;
+DROP TABLE players;
+ALTER TABLE players_new RENAME TO players;
+CREATE INDEX idx_players_country_id ON players (country_id, name);
+CREATE INDEX idx_players_role_id ON players (role_id);
+
+-- matches
+CREATE TABLE matches_new (
+    match_id INT PRIMARY KEY,
+    series_id INT,
+    name VARCHAR(255),
+    start_date DATETIME,
+    end_date DATETIME,
+    state VARCHAR(50),
+    status VARCHAR(500),
+    venue_id INT,
+    format_id INT
+);
+INSERT INTO matches_new
+SELECT match_id, series_id, name, start_date, end_date, state, status, venue_id, format_id
+FROM matches;
+DROP TABLE matches;
+ALTER TABLE matches_new RENAME TO matches;
+CREATE INDEX idx_matches_start_date ON matches (start_date);
+CREATE INDEX idx_matches_venue ON matches (venue_id, series_id);
+CREATE INDEX idx_matches_format_id ON matches (format_id, match_id);
+CREATE INDEX idx_matches_format_id_start ON matches (format_id, start_date);
+
+-- player_stats
+CREATE TABLE player_stats_new (
+    player_id INT NOT NULL,
+    format_id INT NOT NULL,
+    matches INT,
+    innings INT,
+    runs INT,
+    balls INT,
+    highest VARCHAR(20),
+    average FLOAT,
+    strike_rate FLOAT,
+    not_outs INT,
+    fours INT,
+    sixes INT,
+    ducks INT,
+    fifties INT,
+    hundreds INT,
+    double_hundreds INT,
+    triple_hundreds INT,
+    quadruple_hundreds INT,
+    highest_runs INT,
+    highest_not_out BOOLEAN,
+    PRIMARY KEY (player_id, format_id)
+);
+INSERT INTO player_stats_new
+SELECT player_id, format_id, matches, innings, runs, balls, highest, average, strike_rate, not_outs,
+       fours, sixes, ducks, fifties, hundreds, double_hundreds, triple_hundreds, quadruple_hundreds,
+       highest_runs, highest_not_out
+FROM player_stats
+WHERE player_id IS NOT NULL AND format_id IS NOT NULL;
+DROP TABLE player_stats;
+ALTER TABLE player_stats_new RENAME TO player_stats;
+CREATE INDEX idx_ps_runs ON player_stats (runs, player_id, format_id);
+CREATE INDEX idx_ps_highest ON player_stats (highest_runs);
+
+-- player_bowling_stats
+CREATE TABLE player_bowling_stats_new (
+    player_id INT NOT NULL,
+    format_id INT NOT NULL,
+    matches INT,
+    innings INT,
+    balls INT,
+    runs INT,
+    maidens INT,
+    wickets INT,
+    average FLOAT,
+    economy FLOAT,
+    strike_rate FLOAT,
+    best_bowling_innings VARCHAR(20),
+    best_bowling_match VARCHAR(20),
+    four_wickets INT,
+    five_wickets INT,
+    ten_wickets INT,
+    bbi_wickets INT,
+    bbi_runs INT,
+    bbm_wickets INT,
+    bbm_runs INT,
+    PRIMARY KEY (player_id, format_id)
+);
+INSERT INTO player_bowling_stats_new
+SELECT player_id, format_id, matches, innings, balls, runs, maidens, wickets, average, economy,
+       strike_rate, best_bowling_innings, best_bowling_match, four_wickets, five_wickets, ten_wickets,
+       bbi_wickets, bbi_runs, bbm_wickets, bbm_runs
+FROM player_bowling_stats
+WHERE player_id IS NOT NULL AND format_id IS NOT NULL;
+DROP TABLE player_bowling_stats;
+ALTER TABLE player_bowling_stats_new RENAME TO player_bowling_stats;
+CREATE INDEX idx_pbs_bbi ON player_bowling_stats (bbi_wickets, bbi_runs);
+
+-- Decoded views for the career stats (v_players / v_matches are from 004)
+CREATE VIEW v_player_stats AS
+SELECT ps.*, f.name AS format
+FROM player_stats ps
+LEFT JOIN dim_format f ON f.format_id = ps.format_id;
+
+CREATE VIEW v_player_bowling_stats AS
+SELECT pbs.*, f.name AS format
+FROM player_bowling_stats pbs
+LEFT JOIN dim_format f ON f.format_id = pbs.format_id;
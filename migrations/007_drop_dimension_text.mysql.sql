@@ -0,0 +1,47 @@
+-- 007 - Drop the text columns replaced by dimension keys (MySQL)
+-- Same as 007_drop_dimension_text.sql; MySQL re-keys the career stats
+-- tables in place instead of rebuilding them. Rows whose format never got
+-- a key (blank headers) cannot be kept under the new primary key.
+
+-- players
+ALTER TABLE players
+    DROP INDEX idx_players_country_name,
+    DROP COLUMN role,
+    DROP COLUMN bat_style,
+    DROP COLUMN bowl_style,
+    DROP COLUMN country;
+
+-- matches
+ALTER TABLE matches
+    DROP INDEX idx_matches_format_start,
+    DROP COLUMN format,
+    ADD INDEX idx_matches_format_id_start (format_id, start_date);
+
+-- player_stats
+DELETE FROM player_stats WHERE format_id IS NULL;
+ALTER TABLE player_stats
+    DROP INDEX idx_ps_runs,
+    MODIFY format_id INT NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (player_id, format_id),
+    DROP COLUMN format,
+    ADD INDEX idx_ps_runs (runs, player_id, format_id);
+
+-- player_bowling_stats
+DELETE FROM player_bowling_stats WHERE format_id IS NULL;
+ALTER TABLE player_bowling_stats
+    MODIFY format_id INT NOT NULL,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (player_id, format_id),
+    DROP COLUMN format;
+
+-- Decoded views for the career stats (v_players / v_matches are from 004)
+CREATE VIEW v_player_stats AS
+SELECT ps.*, f.name AS format
+FROM player_stats ps
+LEFT JOIN dim_format f ON f.format_id = ps.format_id;
+
+CREATE VIEW v_player_bowling_stats AS
+SELECT pbs.*, f.name AS format
+FROM player_bowling_stats pbs
+LEFT JOIN dim_format f ON f.format_id = pbs.format_id;
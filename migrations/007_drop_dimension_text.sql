@@ -0,0 +1,100 @@
+-- 007 - Drop the text columns replaced by dimension keys
+-- Migration 004 added integer keys next to format / role / country /
+-- batting and bowling style but kept the text, so every row stored both.
+-- The queries, aggregates, leaderboards and snapshots now read the names
+-- through the dimension tables (the v_* views), so the text copies go.
+-- player_stats / player_bowling_stats were keyed on the format text and are
+-- re-keyed on format_id; SQLite and DuckDB cannot change a primary key in
+-- place, so those two tables are rebuilt.
+
+-- players
+DROP INDEX IF EXISTS idx_players_country_name;
+ALTER TABLE players DROP COLUMN role;
+ALTER TABLE players DROP COLUMN bat_style;
+ALTER TABLE players DROP COLUMN bowl_style;
+ALTER TABLE players DROP COLUMN country;
+
+-- matches
+DROP INDEX IF EXISTS idx_matches_format_start;
+ALTER TABLE matches DROP COLUMN format;
+CREATE INDEX idx_matches_format_id_start ON matches (format_id, start_date);
+
+-- player_stats
+CREATE TABLE player_stats_new (
+    player_id INT NOT NULL,
+    format_id INT NOT NULL,
+    matches INT,
+    innings INT,
+    runs INT,
+    balls INT,
+    highest VARCHAR(20),
+    average FLOAT,
+    strike_rate FLOAT,
+    not_outs INT,
+    fours INT,
+    sixes INT,
+    ducks INT,
+    fifties INT,
+    hundreds INT,
+    double_hundreds INT,
+    triple_hundreds INT,
+    quadruple_hundreds INT,
+    highest_runs INT,
+    highest_not_out BOOLEAN,
+    PRIMARY KEY (player_id, format_id)
+);
+INSERT INTO player_stats_new
+SELECT player_id, format_id, matches, innings, runs, balls, highest, average, strike_rate, not_outs,
+       fours, sixes, ducks, fifties, hundreds, double_hundreds, triple_hundreds, quadruple_hundreds,
+       highest_runs, highest_not_out
+FROM player_stats
+WHERE player_id IS NOT NULL AND format_id IS NOT NULL;
+DROP TABLE player_stats;
+ALTER TABLE player_stats_new RENAME TO player_stats;
+CREATE INDEX idx_ps_runs ON player_stats (runs, player_id, format_id);
+CREATE INDEX idx_ps_highest ON player_stats (highest_runs);
+
+-- player_bowling_stats
+CREATE TABLE player_bowling_stats_new (
+    player_id INT NOT NULL,
+    format_id INT NOT NULL,
+    matches INT,
+    innings INT,
+    balls INT,
+    runs INT,
+    maidens INT,
+    wickets INT,
+    average FLOAT,
+    economy FLOAT,
+    strike_rate FLOAT,
+    best_bowling_innings VARCHAR(20),
+    best_bowling_match VARCHAR(20),
+    four_wickets INT,
+    five_wickets INT,
+    ten_wickets INT,
+    bbi_wickets INT,
+    bbi_runs INT,
+    bbm_wickets INT,
+    bbm_runs INT,
+    PRIMARY KEY (player_id, format_id)
+);
+INSERT INTO player_bowling_stats_new
+SELECT player_id, format_id, matches, innings, balls, runs, maidens, wickets, average, economy,
+       strike_rate, best_bowling_innings, best_bowling_match, four_wickets, five_wickets, ten_wickets,
+       bbi_wickets, bbi_runs, bbm_wickets, bbm_runs
+FROM player_bowling_stats
+WHERE player_id IS NOT NULL AND format_id IS NOT NULL;
+DROP TABLE player_bowling_stats;
+ALTER TABLE player_bowling_stats_new RENAME TO player_bowling_stats;
+CREATE INDEX idx_pbs_bbi ON player_bowling_stats (bbi_wickets, bbi_runs);
+
+-- Decoded views for the career stats (v_players / v_matches are from 004)
+CREATE VIEW v_player_stats AS
+SELECT ps.*, f.name AS format
+FROM player_stats ps
+LEFT JOIN dim_format f ON f.format_id = ps.format_id;
+
+CREATE VIEW v_player_bowling_stats AS
+SELECT pbs.*, f.name AS format
+FROM player_bowling_stats pbs
+LEFT JOIN dim_format f ON f.format_id = pbs.format_id;
@@ -0,0 +1,10 @@
+-- 008 - One dim_format key per format, whatever its case (MySQL)
+-- Same as 008_format_name_case.sql. The case-insensitive UNIQUE key already
+-- gave "TEST" and "Test" one key here, under whichever spelling was loaded
+-- first; only the stored spelling changes. The summary tables store the
+-- name and are emptied; the next load rebuilds them in full.
+
+UPDATE dim_format SET name = UPPER(name);
+
+DELETE FROM agg_batting_player_year;
+DELETE FROM agg_bowling_player_year;
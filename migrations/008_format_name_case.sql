@@ -0,0 +1,46 @@
+-- 008 - One dim_format key per format, whatever its case
+-- The match feeds send "TEST" and the stats grids "Test". MySQL's
+-- case-insensitive UNIQUE key on dim_format.name gave them one key, the
+-- embedded engines two. Format names are now stored upper-case
+-- (utils/dimensions.py); this merges the keys already loaded onto the
+-- upper-case spelling. The summary tables store the name and are emptied;
+-- the next load rebuilds them in full.
+
+INSERT IGNORE INTO dim_format (name)
+SELECT DISTINCT UPPER(name) FROM dim_format WHERE name <> UPPER(name);
+
+-- a player with stats under both spellings keeps the upper-case row
+DELETE FROM player_stats
+WHERE format_id IN (SELECT format_id FROM dim_format WHERE name <> UPPER(name))
+  AND EXISTS (
+      SELECT 1 FROM player_stats k
+      JOIN dim_format d ON d.format_id = k.format_id
+      JOIN dim_format o ON o.format_id = player_stats.format_id
+      WHERE k.player_id = player_stats.player_id AND d.name = UPPER(o.name)
+  );
+DELETE FROM player_bowling_stats
+WHERE format_id IN (SELECT format_id FROM dim_format WHERE name <> UPPER(name))
+  AND EXISTS (
+      SELECT 1 FROM player_bowling_stats k
+      JOIN dim_format d ON d.format_id = k.format_id
+      JOIN dim_format o ON o.format_id = player_bowling_stats.format_id
+      WHERE k.player_id = player_bowling_stats.player_id AND d.name = UPPER(o.name)
+  );
+
+UPDATE matches SET format_id = (
+    SELECT u.format_id FROM dim_format o JOIN dim_format u ON u.name = UPPER(o.name)
+    WHERE o.format_id = matches.format_id
+) WHERE format_id IN (SELECT format_id FROM dim_format WHERE name <> UPPER(name));
+UPDATE player_stats SET format_id = (
+    SELECT u.format_id FROM dim_format o JOIN dim_format u ON u.name = UPPER(o.name)
+    WHERE o.format_id = player_stats.format_id
+) WHERE format_id IN (SELECT format_id FROM dim_format WHERE name <> UPPER(name));
+UPDATE player_bowling_stats SET format_id = (
+    SELECT u.format_id FROM dim_format o JOIN dim_format u ON u.name = UPPER(o.name)
+    WHERE o.format_id = player_bowling_stats.format_id
+) WHERE format_id IN (SELECT format_id FROM dim_format WHERE name <> UPPER(name));
+
+DELETE FROM dim_format WHERE name <> UPPER(name);
+
+DELETE FROM agg_batting_player_year;
+DELETE FROM agg_bowling_player_year;
@@ -1,8 +1,6 @@
 import streamlit as st
-from utils.fetch_api import fetch_live_matches, fetch_recent_matches, fetch_upcoming_matches  # you may need to create fetch_recent_matches
+from utils import match_feed, match_index, ui
 from datetime import datetime
-from pathlib import Path
-import base64
 
 
 st.set_page_config(page_title="Matches Dashboard", page_icon="🏏", layout="wide")
@@ -15,185 +13,96 @@ def format_milliseconds(ms):
         return "N/A"
 
 
-st.markdown("""
-<style>
-.logo-box {
-    width: 100px; height: 10px;
-}      
-.title {
-    font-size: 3rem;
-    font-weight: 700;
-    text-align: center;
-    flex: 1;
-    color: #273348;
-    color: linear-gradient(90deg, #72e4fe 0%, #7b7ffe 50%, #eebcf7 100%);
-    letter-spacing: 0.5px;
-}       
-.st-emotion-cache-r44huj h1 {
-    font-size: 2.75rem;
-    font-weight: 700;
-    text-align: center;
-    padding: 1.25rem 0px 1rem;
-}       
-</style>
-""", unsafe_allow_html=True)
-
-
-# Logo
-logo_path = Path("assets/Match-logo.png")
-if logo_path.exists():
-    with open(logo_path, "rb") as img_file:
-        b64_img = base64.b64encode(img_file.read()).decode()
-        logo_html = f'<img src="data:image/png;base64,{b64_img}" style="height:100px;">'
-else:
-    logo_html = 'LOGO Here'
-st.markdown(f'<div class="logo-box">{logo_html}</div>', unsafe_allow_html=True)
+ui.header()
 
-# Title
-st.markdown('<div class="title">🏏 MatchInfo</div>', unsafe_allow_html=True)
-st.markdown(""" <div style="border: 2px solid #01b489; margin-bottom: 15px;"> </div>""", unsafe_allow_html=True)
 
+# One in-memory feed per server process: the three lists are fetched
+# concurrently, kept for their TTL and shared by every session. They are
+# flattened into one match index per refresh; sections are slices of it.
+feed = match_feed.get_feed()
+index = match_index.get(feed.get_all())
 
-# --- Section: Live & Upcoming Matches ---
-st.title("🔴 Live Matches")
-live_data = fetch_live_matches()
 
-if not live_data or "typeMatches" not in live_data:
-    st.warning("⚠️ No live or upcoming matches found.")
-else:
-    for block in live_data["typeMatches"]:
-        match_type = block.get("matchType", "Unknown")
-        st.header(f"🏏 {match_type} Matches")
+def match_card(match, updated=False):
+    col1, col2 = st.columns([2, 3])
+    with col1:
+        st.markdown(f"**{match.team1} 🆚 {match.team2}**" + (" 🔄 *updated*" if updated else ""))
+        st.caption(f"Format: {match.format}")
+        st.caption(f"Status: {match.status or 'N/A'}")
 
-        for series in block.get("seriesMatches", []):
-            if "seriesAdWrapper" not in series:
-                continue
+    with col2:
+        st.markdown(f"🏟️ Venue: {match.venue}, {match.city}")
+        readable_ts = format_milliseconds(match.start_ms) if match.start_ms else "N/A"
+        st.markdown(f"🕒 Start Date: {readable_ts}")
+    st.divider()
 
-            series_info = series["seriesAdWrapper"]
-            st.subheader(f"📌 {series_info.get('seriesName', 'Unnamed Series')}")
 
-            for match in series_info.get("matches", []):
-                match_info = match.get("matchInfo", {})
-                if not match_info:
-                    continue
+def render_matches(matches, heading, per_series=None, updated=()):
+    for match_type, series in match_index.groups(matches, per_series).items():
+        st.header(f"🏏 {match_type} {heading}")
+        for series_name, series_matches in series.items():
+            st.subheader(f"📌 {series_name}")
+            for match in series_matches:
+                match_card(match, match.key in updated)
 
-                col1, col2 = st.columns([2, 3])
-                with col1:
-                    team1 = match_info.get('team1', {}).get('teamName', 'Team 1')
-                    team2 = match_info.get('team2', {}).get('teamName', 'Team 2')
-                    st.markdown(f"**{team1} 🆚 {team2}**")
-                    st.caption(f"Format: {match_info.get('matchFormat', 'N/A')}")
-                    st.caption(f"Status: {match_info.get('status', 'N/A')}")
 
-                with col2:
-                    venue = match_info.get('venueInfo', {}).get('ground', 'Unknown')
-                    city = match_info.get('venueInfo', {}).get('city', '')
-                    st.markdown(f"🏟️ Venue: {venue}, {city}")
-                    raw_ts = match_info.get('startDate')
-                    readable_ts = format_milliseconds(int(raw_ts)) if raw_ts else "N/A"
-                    st.markdown(f"🕒 Start Date: {readable_ts}")
+# --- Filters ---
+f1, f2 = st.columns([2, 1])
+f1.text_input("🔍 Search teams, series or venues", key="match_search")
+f2.multiselect("Formats", index.values("format"), key="match_formats")
 
-                st.divider()
+def filters():
+    return {"search": st.session_state.get("match_search") or None,
+            "formats": st.session_state.get("match_formats") or None}
 
 
-# --- Section: Upcoming Matches (Future) ---
+# --- Section: Live & Upcoming Matches ---
+# Refreshed on its own every live TTL; only matches whose state or status
+# changed since this session last drew them are marked as updated
+@st.fragment(run_every=match_feed.LIVE_TTL_S)
+def live_section():
+    st.title("🔴 Live Matches")
+    live = feed.get("live")
+    live_index = match_index.get(feed.get_all())
+    seen = st.session_state.get("live_seen")
+    updated = match_feed.changed(live, seen) if seen is not None else set()
+    st.session_state["live_seen"] = live.digests
+    st.caption(f"Updated {datetime.fromtimestamp(live.fetched_at):%H:%M:%S}"
+               + ("" if live.refreshed else " (showing the last good feed)")
+               + (f" · {len(updated)} match(es) changed" if updated else ""))
+
+    matches = live_index.select(kind="live", **filters())
+    if not matches:
+        st.warning("⚠️ No live or upcoming matches found.")
+        return
+    render_matches(matches, "Matches", updated=updated)
+
+
+live_section()
+now_ms = int(datetime.now().timestamp() * 1000)
 
-st.title("📅 Upcoming Matches")
 
-upcoming_data = fetch_upcoming_matches()  # Ideally fetch from a dedicated upcoming matches endpoint
+# --- Section: Upcoming Matches (Future) ---
 
-if not upcoming_data or "typeMatches" not in upcoming_data:
+st.title("📅 Upcoming Matches")
+# Future start dates only, soonest first, at most 5 per series
+upcoming = index.select(kind="upcoming", start_after=now_ms, **filters())
+if not upcoming:
     st.warning("⚠️ No upcoming matches found.")
 else:
-    for block in upcoming_data["typeMatches"]:
-        match_type = block.get("matchType", "Unknown")
-        st.header(f"🏏 {match_type} Upcoming Matches")
-
-        for series in block.get("seriesMatches", []):
-            if "seriesAdWrapper" not in series:
-                continue
-
-            series_info = series["seriesAdWrapper"]
-            st.subheader(f"📌 {series_info.get('seriesName', 'Unnamed Series')}")
-
-            for match in series_info.get("matches", [])[:5]:  # Limit to first 5 upcoming matches 
-                match_info = match.get("matchInfo", {})
-                if not match_info:
-                    continue
-
-                # Filter for future start dates only (optional, depending on your API)
-                raw_start = match_info.get('startDate')
-                if raw_start and int(raw_start) > int(datetime.now().timestamp() * 1000):
-                    col1, col2 = st.columns([2, 3])
-                    with col1:
-                        team1 = match_info.get('team1', {}).get('teamName', 'Team 1')
-                        team2 = match_info.get('team2', {}).get('teamName', 'Team 2')
-                        st.markdown(f"**{team1} 🆚 {team2}**")
-                        st.caption(f"Format: {match_info.get('matchFormat', 'N/A')}")
-                        st.caption(f"Status: {match_info.get('status', 'N/A')}")
-
-                    with col2:
-                        venue = match_info.get('venueInfo', {}).get('ground', 'Unknown')
-                        city = match_info.get('venueInfo', {}).get('city', '')
-                        st.markdown(f"🏟️ Venue: {venue}, {city}")
-                        readable_ts = format_milliseconds(int(raw_start)) if raw_start else "N/A"
-                        st.markdown(f"🕒 Start Date: {readable_ts}")
-                    st.divider()
+    render_matches(upcoming, "Upcoming Matches", per_series=5)
 
 
 # --- Section: Recent Matches (Past) ---
 
 st.title("⏮️ Recent Matches")
-recent_data = fetch_recent_matches()
-
-if not recent_data or "typeMatches" not in recent_data:
+# Started before now, most recent first, at most 5 per series
+recent = index.select(kind="recent", start_before=now_ms + 1, descending=True, **filters())
+if not recent:
     st.warning("⚠️ No recent matches found.")
 else:
-    for block in recent_data["typeMatches"]:
-        match_type = block.get("matchType", "Unknown")
-        st.header(f"🏏 {match_type} Recent Matches")
-
-        for series in block.get("seriesMatches", []):
-            if "seriesAdWrapper" not in series:
-                continue
-
-            series_info = series["seriesAdWrapper"]
-            st.subheader(f"📌 {series_info.get('seriesName', 'Unnamed Series')}")
-
-            for match in series_info.get("matches", [])[:5]: # Limit to first 5 recent matches
-                match_info = match.get("matchInfo", {})
-                if not match_info:
-                    continue
-
-                # Filter matches with startDate less than now
-                raw_start = match_info.get('startDate')
-                if raw_start and int(raw_start) <= int(datetime.now().timestamp() * 1000):
-                    col1, col2 = st.columns([2, 3])
-                    with col1:
-                        team1 = match_info.get('team1', {}).get('teamName', 'Team 1')
-                        team2 = match_info.get('team2', {}).get('teamName', 'Team 2')
-                        st.markdown(f"**{team1} 🆚 {team2}**")
-                        st.caption(f"Format: {match_info.get('matchFormat', 'N/A')}")
-                        st.caption(f"Status: {match_info.get('status', 'N/A')}")
-
-                    with col2:
-                        venue = match_info.get('venueInfo', {}).get('ground', 'Unknown')
-                        city = match_info.get('venueInfo', {}).get('city', '')
-                        st.markdown(f"🏟️ Venue: {venue}, {city}")
-                        readable_ts = format_milliseconds(int(raw_start)) if raw_start else "N/A"
-                        st.markdown(f"🕒 Start Date: {readable_ts}")
-                    st.divider()
+    render_matches(recent, "Recent Matches", per_series=5)
 
 
 # --- FOOTER ---
-st.markdown(
-    """
-    <div style="text-align: center; padding: 12px; font-size: 14px; color: #aaa;">
-        Build using <a href="https://streamlit.io/" target="_blank" style="color:#FF4B4B; text-decoration: none;">Streamlit</a> & MySQL<br>
-        © 2025 Neeraj Kumar | 
-        <a href="https://github.com/Neeraj08823/Crickbuzz_project" target="_blank" style="color:#FF4B4B; text-decoration: none;">GitHub Repo</a>
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
-st.markdown('</div>', unsafe_allow_html=True)
+ui.footer()
@@ -1,144 +1,165 @@
-import os
-import  requests
 import streamlit as st
-import mysql.connector
 from dotenv import load_dotenv
-import pandas as pd
-from pathlib import Path
-import base64
+import time
+from datetime import date
+from utils import paging, query_catalog, query_exec, ui
 
 st.set_page_config(page_title="Match Analytics", page_icon="🏏", layout="wide")
 
 load_dotenv()
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_USER = os.getenv("DB_USER", "root")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "")
-DB_NAME = os.getenv("DB_NAME", "cricbuzz_db")
-
-def get_connection():
-    if "mysql" in st.secrets:  # when running on Streamlit Cloud
-        return mysql.connector.connect(
-            host=st.secrets["mysql"]["host"],
-            port=st.secrets["mysql"].get("port", "3306"),
-            user=st.secrets["mysql"]["user"],
-            password=st.secrets["mysql"]["password"],
-            database=st.secrets["mysql"]["database"]
-        )
-    else:  # local development with .env
-        return mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
-# ---------- Load Queries from GitHub ----------
-@st.cache_data
-def load_queries():
-    url = "https://github.com/Neeraj08823/Crickbuzz_project/blob/main/queries.sql"
-    sql_text = requests.get(url).text
-    queries = [q.strip() for q in sql_text.split(";") if q.strip()]
-    return queries
-
-queries = load_queries()
-
-
-st.markdown("""
-<style>
-.logo-box {
-    width: 100px; height: 10px;
-}
-            
-.title {
-    font-size: 3rem;
-    font-weight: 700;
-    text-align: center;
-    flex: 1;
-    color: #273348;
-    color: linear-gradient(90deg, #72e4fe 0%, #7b7ffe 50%, #eebcf7 100%);
-    letter-spacing: 0.5px;
-}
-
-.st-emotion-cache-r44huj h1 {
-    font-size: 2.75rem;
-    font-weight: 700;
-    text-align: center;
-    padding: 1.25rem 0px 1rem;
-}
-
-</style>
-""", unsafe_allow_html=True)
-
-# Logo
-logo_path = Path("assets/Match-logo.png")
-if logo_path.exists():
-    with open(logo_path, "rb") as img_file:
-        b64_img = base64.b64encode(img_file.read()).decode()
-        logo_html = f'<img src="data:image/png;base64,{b64_img}" style="height:100px;">'
-else:
-    logo_html = 'LOGO Here'
-st.markdown(f'<div class="logo-box">{logo_html}</div>', unsafe_allow_html=True)
-# Title
-st.markdown('<div class="title">🏏 MatchInfo</div>', unsafe_allow_html=True)
-st.markdown(""" <div style="border: 2px solid #01b489; margin-bottom: 15px;"> </div>""", unsafe_allow_html=True)
-st.title("📑 Match Analytics")
-
-# ---------- Load and Parse SQL Queries ----------
-def parse_queries_with_comments(script):
-    blocks = []
-    current_comment = None
-    current_query = []
-    for line in script.splitlines():
-        if line.strip().startswith('--'):
-            if current_comment and current_query:
-                blocks.append( (current_comment, '\n'.join(current_query).strip().rstrip(';') + ';') )
-                current_query = []
-            current_comment = line.strip()
-        else:
-            if line.strip() or current_query:
-                current_query.append(line)
-    if current_comment and current_query:
-        blocks.append( (current_comment, '\n'.join(current_query).strip().rstrip(';') + ';') )
-    return [block for block in blocks if block[1] and len(block[1].strip()) > 2]
 
-with open("queries.sql", "r") as f:
-    sql_script = f.read()
-queries = parse_queries_with_comments(sql_script)
-comment_list = [item[0][2:].strip() if item[0].startswith('--') else item[0] for item in queries]
+ui.header("📑 Match Analytics")
+
+# ---------- SQL Queries ----------
+# Parsed once per server process; re-parsed only when queries.sql changes
+queries = query_catalog.load_catalog()
+comment_list = [q.label for q in queries]
 
 # ---------- Layout ----------
 col1, col2 = st.columns([1, 2])
 
+# Paging state of the last query asked: cursors[i] is where page i starts
+def start_pager(query_id, page_size, params=None):
+    st.session_state["pager"] = {"query": query_id, "size": page_size, "page": 0, "cursors": [None],
+                                 "params": params, "cancelled": False}
+
+def move_page(step, next_cursor=None):
+    pager = st.session_state["pager"]
+    if step > 0 and len(pager["cursors"]) == pager["page"] + 1:
+        pager["cursors"].append(next_cursor)
+    pager["page"] = max(pager["page"] + step, 0)
+    pager["cancelled"] = False
+
+def time_limit(query):
+    return query.timeout or query_exec.QUERY_TIMEOUT_S
+
+# One typed widget per @param of the query; returns {name: value}
+def param_inputs(query):
+    values = {}
+    for p in query.params:
+        label, key = p.label or p.name, f"param_{query.id}_{p.name}"
+        if p.type in ("int", "year"):
+            values[p.name] = st.number_input(label, value=int(p.default or 0), step=1, key=key)
+        elif p.type == "float":
+            values[p.name] = st.number_input(label, value=float(p.default or 0), key=key)
+        elif p.type == "date":
+            values[p.name] = st.date_input(label, value=date.fromisoformat(p.default) if p.default else None, key=key)
+        elif p.type == "choice":
+            index = p.options.index(p.default) if p.default in p.options else 0
+            values[p.name] = st.selectbox(label, p.options, index=index, key=key)
+        else:
+            values[p.name] = st.text_input(label, value=p.default or "", key=key)
+    return values
+
+# Plan, total and one page of a query; pages are reused per parameter set
+# until db_loader lands new data (data version)
+def load_page(query, pager):
+    page = pager["page"]
+    def work(conn):
+        return paging.cached_page(conn, query, pager.get("params"), page, pager["size"], pager["cursors"][page])
+    return work
+
+# Poll a running query; any rerun while waiting (e.g. Cancel) aborts it
+def wait_for(handle, status):
+    try:
+        while not handle.done():
+            status.caption(f"⏳ Running… {handle.elapsed:.1f}s (limit {handle.timeout_s:g}s)")
+            time.sleep(0.1)
+        status.empty()
+        return handle.result()
+    finally:
+        if not handle.done():
+            handle.cancel()
+
+# Full result for a download, streamed from the database on click
+def export(fn, query, params):
+    with ui.get_pool().connection() as conn, query_exec.execution_limit(conn, time_limit(query)):
+        return fn(conn, query.sql, params)
+
 with col1:
     st.subheader("🧩 Select Query")
     selected_label = st.selectbox("", comment_list, label_visibility='collapsed')
     selected_idx = comment_list.index(selected_label)
+    selected = queries[selected_idx]
+    values = param_inputs(selected)
+    page_size = st.selectbox("Rows per page", paging.PAGE_SIZES, index=1)
     run_query = st.button("Ask❔", use_container_width=True)
     if run_query:
-        st.success("✅ Query Executed Successfully!")
+        try:
+            start_pager(selected.id, page_size, query_catalog.bind(selected, values))
+            st.success("✅ Query Executed Successfully!")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+    with st.expander("🔬 Explain / profile"):
+        st.caption(f"Time limit: {time_limit(selected):g}s")
+        if st.button("Profile query", use_container_width=True):
+            try:
+                params = query_catalog.bind(selected, values)
+                handle = query_exec.submit(ui.get_pool(),
+                                           lambda conn: query_exec.explain_analyze(conn, selected.sql, params),
+                                           time_limit(selected))
+                profile = wait_for(handle, st.empty())
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Elapsed", f"{profile['elapsed_ms']} ms")
+                m2.metric("Rows", profile["rows"] if profile["rows"] is not None else "–")
+                m3.metric("Examined", profile["rows_examined"] if profile["rows_examined"] is not None else "–")
+                st.code(profile["plan"], language="text")
+            except query_exec.QueryTimeout as e:
+                st.error(f"⏱️ {e}")
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
 
 with col2:
-    if run_query:
+    pager = st.session_state.get("pager")
+    if pager:
         st.subheader("📊 Details")
+        query = query_catalog.get(pager["query"])
+        cancel_slot = st.empty()
+        if cancel_slot.button("⏹ Cancel"):
+            pager["cancelled"] = True
         try:
-            conn = get_connection()
-            df = pd.read_sql(queries[selected_idx][1], conn)
-            st.dataframe(df, use_container_width=True)
+            if pager["cancelled"]:
+                cancel_slot.empty()
+                st.warning("⏹ Query cancelled. Ask again to rerun it.")
+            else:
+                handle = query_exec.submit(ui.get_pool(), load_page(query, pager), time_limit(query))
+                plan, total, exact, df, next_cursor, hit, version = wait_for(handle, st.empty())
+                cancel_slot.empty()
+
+                st.dataframe(df, use_container_width=True)
+                page, size = pager["page"], pager["size"]
+                first = page * size
+                st.caption(f"{query.id}: rows {first + 1 if len(df) else 0}–{first + len(df)} of "
+                           f"{'' if exact else '~'}{total} · {plan.mode} paging · "
+                           f"{'⚡ cached' if hit else '🗄️ queried'} in {handle.elapsed * 1000:.1f} ms "
+                           f"(data version {version})")
+
+                nav1, nav2, dl1, dl2 = st.columns(4)
+                nav1.button("◀ Prev", disabled=page == 0, on_click=move_page, args=(-1,), use_container_width=True)
+                nav2.button("Next ▶", disabled=next_cursor is None, on_click=move_page, args=(1, next_cursor),
+                            use_container_width=True)
+                name = query.id.replace(" ", "_").lower()
+                dl1.download_button("⬇️ CSV", data=lambda: export(paging.export_csv, query, pager.get("params")),
+                                    file_name=f"{name}.csv", mime="text/csv", on_click="ignore",
+                                    use_container_width=True)
+                dl2.download_button("⬇️ Parquet", data=lambda: export(paging.export_parquet, query, pager.get("params")),
+                                    file_name=f"{name}.parquet", mime="application/octet-stream",
+                                    on_click="ignore", use_container_width=True)
+
+                pool = ui.get_pool().stats()
+                st.caption(f"🔌 Pool: {pool['in_use']}/{pool['size']} in use, "
+                           f"{pool['reused']} of {pool['acquired']} checkouts reused a connection")
+        except query_exec.QueryTimeout as e:
+            cancel_slot.empty()
+            st.error(f"⏱️ {e}. Narrow the query or raise its -- @timeout in queries.sql.")
+        except query_exec.QueryCancelled:
+            cancel_slot.empty()
+            st.warning("⏹ Query cancelled. Ask again to rerun it.")
         except Exception as e:
+            cancel_slot.empty()
             st.error(f"❌ Error: {e}")
-        finally:
-            if 'conn' in locals() and conn.is_connected():
-                conn.close()
 
 
 # --- FOOTER ---
-st.markdown(
-    """
-    <div style="text-align: center; padding: 12px; font-size: 14px; color: #aaa;">
-        Build using <a href="https://streamlit.io/" target="_blank" style="color:#FF4B4B; text-decoration: none;">Streamlit</a> & MySQL<br>
-        © 2025 Neeraj Kumar | 
-        <a href="https://github.com/Neeraj08823/Crickbuzz_project" target="_blank" style="color:#FF4B4B; text-decoration: none;">GitHub Repo</a>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+ui.footer()
@@ -1,15 +1,19 @@
--- Que 1 - Find all players who represent India
+-- Que 1 - Find all players who represent a country
+-- @param country text = India   Country
 SELECT
   player_id,
   name AS full_name,
   role AS playing_role,
   bat_style AS batting_style,
   bowl_style AS bowling_style
-FROM players
-WHERE country = 'India'
+FROM v_players
+WHERE country = %(country)s
 ORDER BY name;
 
--- Que 2 - Consistency (Avg Runs + StdDev of Runs, since 2022)
+-- Que 2 - Consistency (Avg Runs + StdDev of Runs, since a season)
+-- @param since year = 2022   Since season
+-- @param min_balls int = 10   Min. balls per innings
+-- @param min_matches int = 5   Min. matches
 SELECT 
     mb.batsman_id AS player_id,
     p.name AS player_name,
@@ -19,29 +23,31 @@ SELECT
 FROM match_batting mb
 JOIN matches m ON mb.match_id = m.match_id
 JOIN players p ON mb.batsman_id = p.player_id
-WHERE m.start_date >= '2022-01-01'
-  AND mb.balls >= 10
+WHERE mb.match_year >= %(since)s
+  AND m.start_date >= %(since_start)s
+  AND mb.balls >= %(min_balls)s
 GROUP BY mb.batsman_id, p.name
-HAVING matches_played >= 5
+HAVING matches_played >= %(min_matches)s
 ORDER BY run_stddev ASC, avg_runs DESC;
 
 
--- Que 3 - Top 10 highest run scorers in ODI cricket
+-- Que 3 - Top 10 highest run scorers in a format
+-- @param format choice(TEST|ODI|T20) = ODI   Format
 SELECT
   p.player_id,
   p.name,
-  SUM(mb.runs) AS total_runs,
-  ROUND(SUM(mb.runs) / NULLIF(SUM(CASE WHEN mb.dismissal IS NOT NULL AND mb.dismissal NOT LIKE '%not out%' THEN 1 ELSE 0 END),0), 2) AS batting_avg,
-  SUM(CASE WHEN mb.runs >= 100 THEN 1 ELSE 0 END) AS centuries
-FROM match_batting mb
-JOIN matches m ON m.match_id = mb.match_id
-JOIN players p ON p.player_id = mb.batsman_id
-WHERE m.format = 'ODI'
+  SUM(a.runs) AS total_runs,
+  ROUND(SUM(a.runs) / NULLIF(SUM(a.dismissals),0), 2) AS batting_avg,
+  SUM(a.centuries) AS centuries
+FROM agg_batting_player_year a
+JOIN players p ON p.player_id = a.player_id
+WHERE a.format = %(format)s
 GROUP BY p.player_id, p.name
 ORDER BY total_runs DESC
 LIMIT 10;
 
--- Que 4 - Venues with capacity >= 50000
+-- Que 4 - Venues with a minimum capacity
+-- @param min_capacity int = 50000   Min. capacity
 SELECT
   venue_id,
   name AS venue_name,
@@ -49,37 +55,44 @@ SELECT
   country,
   capacity
 FROM venues
-WHERE
-  CAST(REPLACE(COALESCE(capacity, '0'), ',', '') AS UNSIGNED) >= 50000
-ORDER BY CAST(REPLACE(COALESCE(capacity, '0'), ',', '') AS UNSIGNED) DESC;
+WHERE capacity_num >= %(min_capacity)s
+ORDER BY capacity_num DESC;
 
 -- Que 5 - How many matches each team has won
 SELECT
   t.team_id,
   t.name AS team_name,
-  COUNT(*) AS wins
-FROM match_result mr
-JOIN teams t ON t.team_id = mr.winning_team_id
-GROUP BY t.team_id, t.name
+  w.wins
+FROM agg_team_wins w
+JOIN teams t ON t.team_id = w.team_id
 ORDER BY wins DESC;
 
 -- Que 6 - Count players by playing role
 SELECT
-  COALESCE(role, 'Unknown') AS role,
-  COUNT(*) AS num_players
-FROM players
-GROUP BY role
+  COALESCE(r.name, 'Unknown') AS role,
+  c.num_players
+FROM (
+  SELECT role_id, COUNT(*) AS num_players
+  FROM players
+  GROUP BY role_id
+) c
+LEFT JOIN dim_role r ON r.role_id = c.role_id
 ORDER BY num_players DESC;
 
 -- Que 7 - Highest individual batting score per format
 SELECT
-  m.format,
-  MAX(mb.runs) AS highest_score
-FROM match_batting mb
-JOIN matches m ON m.match_id = mb.match_id
-GROUP BY m.format;
-
--- Que 8 - Series that started in 2024
+  f.name AS format,
+  x.highest_score
+FROM (
+  SELECT m.format_id, MAX(mb.runs) AS highest_score
+  FROM match_batting mb
+  JOIN matches m ON m.match_id = mb.match_id
+  GROUP BY m.format_id
+) x
+LEFT JOIN dim_format f ON f.format_id = x.format_id;
+
+-- Que 8 - Series that started in a season
+-- @param season year = 2024   Season
 SELECT 
     s.series_id,
     s.name AS series_name,
@@ -103,12 +116,14 @@ LEFT JOIN (
     ) x
     WHERE x.rn = 1
 ) hc ON hc.series_id = s.series_id
-WHERE YEAR(s.start_date) = 2024
+WHERE s.start_date >= %(season_start)s AND s.start_date < %(season_end)s
 GROUP BY s.series_id, s.name, hc.host_country, s.type, s.start_date
 ORDER BY s.start_date;
 
 
--- Que 9 - All-rounders with >1000 runs AND >50 wickets
+-- Que 9 - All-rounders with more than N runs AND M wickets
+-- @param min_runs int = 1000   Runs above
+-- @param min_wickets int = 50   Wickets above
 SELECT 
     p.player_id,
     p.name AS player_name,
@@ -116,43 +131,44 @@ SELECT
     b.runs AS total_runs,
     bw.wickets AS total_wickets
 FROM players p
-JOIN player_stats b 
+JOIN v_player_stats b 
     ON p.player_id = b.player_id
-JOIN player_bowling_stats bw 
+JOIN v_player_bowling_stats bw 
     ON p.player_id = bw.player_id 
-    AND b.format = bw.format   -- Match format consistency
-WHERE b.runs > 1000
-  AND bw.wickets > 50
+    AND b.format_id = bw.format_id   -- Match format consistency
+WHERE b.runs > %(min_runs)s
+  AND bw.wickets > %(min_wickets)s
 ORDER BY b.runs DESC;
 
--- Que 10 - Yearly Batting Performance Since 2020
+-- Que 10 - Yearly Batting Performance since a season
+-- @param since year = 2020   Since season
+-- @param min_matches int = 5   Min. matches per year
 SELECT 
-    mb.batsman_id AS player_id,
+    a.player_id,
     p.name AS player_name,
-    YEAR(m.start_date) AS match_year,
-    AVG(mb.runs) AS avg_runs_per_match,
-    AVG(mb.strike_rate) AS avg_strike_rate,
-    COUNT(DISTINCT mb.match_id) AS matches_played
-FROM match_batting mb
-JOIN matches m ON mb.match_id = m.match_id
-JOIN players p ON mb.batsman_id = p.player_id
-WHERE YEAR(m.start_date) >= 2020
-GROUP BY mb.batsman_id, p.name, YEAR(m.start_date)
-HAVING COUNT(DISTINCT mb.match_id) >= 5
+    a.match_year,
+    SUM(a.runs) / NULLIF(SUM(a.innings), 0) AS avg_runs_per_match,
+    SUM(a.strike_rate_sum) / NULLIF(SUM(a.strike_rate_count), 0) AS avg_strike_rate,
+    SUM(a.matches) AS matches_played
+FROM agg_batting_player_year a
+JOIN players p ON a.player_id = p.player_id
+WHERE a.match_year >= %(since)s
+GROUP BY a.player_id, p.name, a.match_year
+HAVING SUM(a.matches) >= %(min_matches)s
 ORDER BY player_name, match_year;
 
 -- Que 11 - Compare player performance across formats (players who played ≥2 formats)
 SELECT
   p.player_id,
   p.name,
-  SUM(CASE WHEN m.format = 'Test' THEN mb.runs ELSE 0 END) AS runs_test,
+  SUM(CASE WHEN m.format = 'TEST' THEN mb.runs ELSE 0 END) AS runs_test,
   SUM(CASE WHEN m.format = 'ODI'  THEN mb.runs ELSE 0 END) AS runs_odi,
-  SUM(CASE WHEN m.format = 'T20I' THEN mb.runs ELSE 0 END) AS runs_t20,
+  SUM(CASE WHEN m.format IN ('T20', 'T20I') THEN mb.runs ELSE 0 END) AS runs_t20,
   ROUND(SUM(mb.runs) / NULLIF(SUM(CASE WHEN mb.dismissal IS NOT NULL AND mb.dismissal NOT LIKE '%not out%' THEN 1 ELSE 0 END),0),2) AS overall_avg,
   COUNT(DISTINCT m.format) AS formats_played
 FROM players p
 JOIN match_batting mb ON mb.batsman_id = p.player_id
-JOIN matches m ON m.match_id = mb.match_id
+JOIN v_matches m ON m.match_id = mb.match_id
 GROUP BY p.player_id, p.name
 HAVING formats_played >= 2
 ORDER BY overall_avg DESC;
@@ -173,44 +189,28 @@ GROUP BY t.team_id, t.name
 ORDER BY (home_wins + away_wins) DESC;
 
 -- Que 13 - Bowlers performance per venue
-WITH bowler_match AS (
-    SELECT 
-        mbw.bowler_id,
-        m.venue_id,
-        mbw.match_id,
-        SUM(mbw.overs) AS overs_in_match,
-        SUM(mbw.wickets) AS wickets_in_match,
-        AVG(mbw.economy) AS avg_econ_in_match
-    FROM match_bowling mbw
-    JOIN matches m ON m.match_id = mbw.match_id
-    GROUP BY mbw.bowler_id, m.venue_id, mbw.match_id
-),
-eligible AS (
-    SELECT * 
-    FROM bowler_match
-    WHERE overs_in_match >= 4
-)
+-- @param min_matches int = 3   Min. matches at the venue
 SELECT 
-    e.bowler_id,
+    a.bowler_id,
     p.name AS bowler_name,
-    e.venue_id,
+    a.venue_id,
     v.name AS venue_name,
-    COUNT(DISTINCT e.match_id) AS matches_played,
-    ROUND(SUM(e.wickets_in_match) / NULLIF(COUNT(DISTINCT e.match_id),0), 2) AS avg_wickets_per_match,
-    ROUND(AVG(e.avg_econ_in_match), 2) AS avg_economy,
-    SUM(e.wickets_in_match) AS total_wickets
-FROM eligible e
-JOIN players p ON p.player_id = e.bowler_id
-JOIN venues v ON v.venue_id = e.venue_id
-GROUP BY e.bowler_id, e.venue_id, p.name, v.name
-HAVING COUNT(DISTINCT e.match_id) >= 3
+    a.matches AS matches_played,
+    ROUND(a.wickets / NULLIF(a.matches, 0), 2) AS avg_wickets_per_match,
+    ROUND(a.economy_sum / NULLIF(a.economy_count, 0), 2) AS avg_economy,
+    a.wickets AS total_wickets
+FROM agg_venue_bowling a
+JOIN players p ON p.player_id = a.bowler_id
+JOIN venues v ON v.venue_id = a.venue_id
+WHERE a.matches >= %(min_matches)s
 ORDER BY total_wickets DESC;
 
 -- Que 14 - Players who excel in close matches
+-- @param max_runs int = 50   Close: won by fewer runs than
 WITH close_matches AS (
   SELECT mr.match_id
   FROM match_result mr
-  WHERE (mr.win_by_runs IS NOT NULL AND mr.win_by_runs < 50)
+  WHERE (mr.win_by_runs IS NOT NULL AND mr.win_by_runs < %(max_runs)s)
      OR (mr.win_by_innings IS NOT NULL AND mr.win_by_innings < 5)
 )
 SELECT
@@ -230,27 +230,26 @@ ORDER BY avg_runs_in_close_matches DESC;
 
 -- Que 15 - Does winning the toss give advantage? % won by toss winner by toss decision
 SELECT
-  mt.decision AS toss_decision,
-  COUNT(*) AS total_matches,
-  SUM(CASE WHEN mt.toss_winner_id = mr.winning_team_id THEN 1 ELSE 0 END) AS matches_won_by_toss_winner,
-  ROUND(100 * SUM(CASE WHEN mt.toss_winner_id = mr.winning_team_id THEN 1 ELSE 0 END) / COUNT(*), 2) AS pct_won_by_toss_winner
-FROM match_toss mt
-JOIN match_result mr ON mr.match_id = mt.match_id
-GROUP BY mt.decision;
+  a.decision AS toss_decision,
+  a.total_matches,
+  a.won_by_toss_winner AS matches_won_by_toss_winner,
+  ROUND(100 * a.won_by_toss_winner / a.total_matches, 2) AS pct_won_by_toss_winner
+FROM agg_toss_decision a;
 
 -- Que 16 - Matches + Batting Avg per Format
+-- @param min_matches int = 20   Min. career matches
 SELECT 
     p.player_id,
     p.name AS player_name,
-    SUM(CASE WHEN ps.format = 'Test' THEN ps.matches ELSE 0 END) AS test_matches,
+    SUM(CASE WHEN ps.format = 'TEST' THEN ps.matches ELSE 0 END) AS test_matches,
     SUM(CASE WHEN ps.format = 'ODI' THEN ps.matches ELSE 0 END) AS odi_matches,
     SUM(CASE WHEN ps.format = 'T20' OR ps.format = 'T20I' THEN ps.matches ELSE 0 END) AS t20_matches,
-    MAX(CASE WHEN ps.format = 'Test' THEN ps.average END) AS test_avg,
+    MAX(CASE WHEN ps.format = 'TEST' THEN ps.average END) AS test_avg,
     MAX(CASE WHEN ps.format = 'ODI' THEN ps.average END) AS odi_avg,
     MAX(CASE WHEN ps.format = 'T20' OR ps.format = 'T20I' THEN ps.average END) AS t20_avg,
     SUM(ps.matches) AS total_matches
 FROM players p
-JOIN player_stats ps ON p.player_id = ps.player_id
+JOIN v_player_stats ps ON p.player_id = ps.player_id
 GROUP BY p.player_id, p.name
-HAVING SUM(ps.matches) >= 20
+HAVING SUM(ps.matches) >= %(min_matches)s
 ORDER BY total_matches DESC;
@@ -0,0 +1,61 @@
+import shutil
+
+import pytest
+
+from utils import cache_warmer, db_loader, db_pool, storage
+from utils.migrate import apply_migrations
+from utils.synthetic_cache import generate_cache
+
+# ----------------------
+# Fixtures
+# ----------------------
+# Every test runs on an embedded SQLite file under tmp_path, loaded from a
+# 1x synthetic cache tree (the same generator bench_loader uses). Nothing
+# here needs a MySQL server.
+
+
+@pytest.fixture(scope="session")
+def synthetic_cache(tmp_path_factory):
+    """A 1x synthetic cache tree, generated once per session (copy it before editing)."""
+    path = tmp_path_factory.mktemp("cache")
+    generate_cache(str(path), scale=1, seed=42)
+    return str(path)
+
+
+@pytest.fixture
+def cache_dir(synthetic_cache, tmp_path):
+    """A private copy of the synthetic cache that a test may edit."""
+    path = str(tmp_path / "cache")
+    shutil.copytree(synthetic_cache, path)
+    return path
+
+
+@pytest.fixture
+def sqlite_db(cache_dir, tmp_path, monkeypatch):
+    """Point storage and db_loader at an empty, migrated SQLite file; returns its path."""
+    path = str(tmp_path / "cricbuzz.sqlite")
+    monkeypatch.setattr(storage, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(storage, "DB_PATH", path)
+    monkeypatch.setattr(db_loader, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(cache_warmer, "CACHE_WARMER", False)
+    storage.init_schema()
+    apply_migrations()
+    yield path
+    db_pool.close_all()
+
+
+
+@pytest.fixture(scope="session")
+def loaded_sqlite(synthetic_cache, tmp_path_factory):
+    """A SQLite file loaded from the synthetic cache once per session; tests must not write to it."""
+    path = str(tmp_path_factory.mktemp("db") / "loaded.sqlite")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(storage, "DB_BACKEND", "sqlite")
+        mp.setattr(storage, "DB_PATH", path)
+        mp.setattr(db_loader, "CACHE_DIR", synthetic_cache)
+        mp.setattr(cache_warmer, "CACHE_WARMER", False)
+        storage.init_schema()
+        apply_migrations()
+        db_loader.load_all()
+        db_pool.close_all()
+    return path
@@ -0,0 +1,25 @@
+import json
+import os
+
+# ----------------------
+# Test helpers
+# ----------------------
+
+
+def edit_payload(cache_dir, fname, edit):
+    """Rewrite one cached JSON file through `edit(payload)`."""
+    path = os.path.join(cache_dir, fname)
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    edit(payload)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+
+def table_rows(conn, table):
+    """Every row of `table`, sorted, with floats rounded so engines compare equal."""
+    cur = conn.cursor()
+    cur.execute(f"SELECT * FROM {table}")
+    rows = [tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in cur.fetchall()]
+    cur.close()
+    return sorted(rows, key=repr)
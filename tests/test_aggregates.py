@@ -0,0 +1,69 @@
+from helpers import edit_payload, table_rows
+
+from utils import db_loader, query_catalog, storage
+from utils.aggregates import AGGREGATES, refresh_aggregates
+from utils.migrate import apply_migrations
+
+MATCH_ID = 100001
+
+
+def reload_one_match(cache_dir):
+    """Edit one match so it moves between aggregate groups, and drop a batsman from its scorecard."""
+    def flip(payload):
+        info = payload["matchInfo"]
+        other = info["team1"] if info["result"]["winningteamId"] != info["team1"]["id"] else info["team2"]
+        info["result"].update(winningTeam=other["name"], winningteamId=other["id"])
+        toss = info["tossResults"]
+        toss["decision"] = "Batting" if toss["decision"] == "Bowling" else "Bowling"
+
+    def score(payload):
+        batsmen = payload["scorecard"][0]["batsman"]
+        batsmen.pop()
+        batsmen[0]["runs"] += 50
+
+    edit_payload(cache_dir, f"match_{MATCH_ID}_info.json", flip)
+    edit_payload(cache_dir, f"match_{MATCH_ID}_scorecard.json", score)
+
+
+def catalog_results(path):
+    """{query id: sorted rows} for every catalog query that reads a summary table."""
+    conn = storage.connect(path=path)
+    results = {}
+    for query in query_catalog.load_catalog():
+        if "agg_" not in query.sql:
+            continue
+        cur = conn.cursor()
+        cur.execute(query.sql, query_catalog.bind(query))
+        results[query.id] = sorted(cur.fetchall(), key=repr)
+        cur.close()
+    conn.close()
+    return results
+
+
+def test_incremental_reload_matches_full_rebuild(sqlite_db, cache_dir, capsys):
+    db_loader.load_all()
+    reload_one_match(cache_dir)
+    capsys.readouterr()
+    db_loader.load_all()
+    assert "agg_batting_player_year (full)" not in capsys.readouterr().out
+
+    conn = storage.connect()
+    incremental = {spec["table"]: table_rows(conn, spec["table"]) for spec in AGGREGATES}
+    refresh_aggregates(None, conn)
+    for spec in AGGREGATES:
+        assert table_rows(conn, spec["table"]) == incremental[spec["table"]], spec["table"]
+    conn.close()
+
+
+def test_incremental_reload_matches_fresh_load(sqlite_db, cache_dir, tmp_path, monkeypatch):
+    db_loader.load_all()
+    reload_one_match(cache_dir)
+    db_loader.load_all()
+
+    fresh = str(tmp_path / "fresh.sqlite")
+    monkeypatch.setattr(storage, "DB_PATH", fresh)
+    storage.init_schema()
+    apply_migrations()
+    db_loader.load_all()
+
+    assert catalog_results(sqlite_db) == catalog_results(fresh)
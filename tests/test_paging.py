@@ -0,0 +1,41 @@
+from collections import Counter
+
+import pytest
+
+from utils import paging, query_catalog, storage
+
+QUERIES = query_catalog.load_catalog()
+
+
+def normalized(rows):
+    return Counter(tuple(round(v, 6) if isinstance(v, float) else v for v in row) for row in rows)
+
+
+@pytest.mark.parametrize("page_size", [7, paging.PAGE_SIZES[0]])
+@pytest.mark.parametrize("query", QUERIES, ids=[q.id for q in QUERIES])
+def test_pages_return_every_row_once(loaded_sqlite, monkeypatch, query, page_size):
+    monkeypatch.setattr(storage, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(storage, "DB_PATH", loaded_sqlite)
+    params = query_catalog.bind(query)
+    conn = storage.connect()
+    try:
+        cur = conn.cursor()
+        cur.execute(query.sql, params)
+        full = cur.fetchall()
+        cur.close()
+
+        plan = paging.plan(conn, query.sql, params)
+        rows, cursor, pages = [], None, 0
+        while True:
+            frame, cursor = paging.fetch_page(conn, query.sql, plan, cursor, page_size, params)
+            assert len(frame) <= page_size
+            rows += list(frame.itertuples(index=False, name=None))
+            pages += 1
+            if cursor is None:
+                break
+            assert pages <= len(full), "paging does not terminate"
+
+        assert normalized(rows) == normalized(full)
+        assert paging.approx_count(conn, query.sql, params) == (len(full), True)
+    finally:
+        conn.close()
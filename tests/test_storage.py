@@ -0,0 +1,80 @@
+import pytest
+
+from utils import storage
+
+UPSERT = ("INSERT INTO t (id, name, n) VALUES (%s, %s, %s) "
+          "ON DUPLICATE KEY UPDATE name=VALUES(name), n=VALUES(n)")
+
+
+def test_translate_mysql_dialect():
+    pk = lambda table: ["id"]
+    assert storage.translate(UPSERT, "sqlite", pk) == (
+        "INSERT INTO t (id, name, n) VALUES (?, ?, ?) "
+        "ON CONFLICT (id) DO UPDATE SET name=excluded.name, n=excluded.n")
+    assert storage.translate("INSERT IGNORE INTO t (id) VALUES (%s)", "duckdb", pk) == (
+        "INSERT OR IGNORE INTO t (id) VALUES (?)")
+    assert storage.translate("SELECT 1 FROM t WHERE name LIKE 'a%'", "duckdb", pk) == (
+        "SELECT 1 FROM t WHERE name ILIKE 'a%'")
+
+
+@pytest.fixture(params=["sqlite", "duckdb"])
+def conn(request, tmp_path):
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    conn = storage.connect(request.param, path=str(tmp_path / f"t.{request.param}"))
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE t (id INT PRIMARY KEY, name VARCHAR(20) NOT NULL, n INT)")
+    conn.commit()
+    cur.close()
+    yield conn
+    conn.close()
+
+
+def rows(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT id, name, n FROM t ORDER BY id")
+    result = cur.fetchall()
+    cur.close()
+    return [tuple(r) for r in result]
+
+
+def test_upserts_apply_in_order(conn):
+    # on DuckDB these are buffered into multi-row INSERTs; the result must not change
+    cur = conn.cursor()
+    for i in range(3):
+        cur.execute(UPSERT, (i, f"p{i}", 1))
+    cur.execute(UPSERT, (1, "again", 2))
+    assert rows(conn) == [(0, "p0", 1), (1, "again", 2), (2, "p2", 1)]
+    cur.execute("UPDATE t SET n = n + 10 WHERE id = %s", (2,))
+    cur.execute(UPSERT, (2, "last", 3))
+    conn.commit()
+    cur.close()
+    assert rows(conn) == [(0, "p0", 1), (1, "again", 2), (2, "last", 3)]
+
+
+def test_executemany_with_repeated_keys(conn):
+    cur = conn.cursor()
+    cur.executemany(UPSERT, [(1, "a", 1), (2, "b", 1), (1, "c", 2)])
+    conn.commit()
+    cur.close()
+    assert rows(conn) == [(1, "c", 2), (2, "b", 1)]
+
+
+def test_rollback_discards_buffered_rows(conn):
+    cur = conn.cursor()
+    cur.execute(UPSERT, (1, "kept", 1))
+    conn.commit()
+    cur.execute(UPSERT, (2, "dropped", 1))
+    conn.rollback()
+    cur.close()
+    assert rows(conn) == [(1, "kept", 1)]
+
+
+def test_constraint_error_is_integrity_error(conn):
+    cur = conn.cursor()
+    with pytest.raises(storage.IntegrityError):
+        cur.execute(UPSERT, (1, None, 1))
+        conn.commit()
+    conn.rollback()
+    cur.close()
+    assert rows(conn) == []
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from helpers import edit_payload, table_rows
+
+from utils import db_loader, storage
+from utils.table_swap import ValidationError, blue_green_load
+
+MATCH_ID = 100001
+
+
+def drop_batsman(payload):
+    payload["scorecard"][0]["batsman"].pop()
+
+
+def row_count(path, table):
+    conn = storage.connect(path=path)
+    cur = conn.cursor()
+    cur.execute(f"SELECT COUNT(*) FROM {table}")
+    (n,) = cur.fetchone()
+    cur.close()
+    conn.close()
+    return n
+
+
+def test_blue_green_accepts_delta_load(sqlite_db, cache_dir):
+    db_loader.load_all()
+    batting = row_count(sqlite_db, "match_batting")
+
+    # a reload that shrinks a fact table (one batsman fewer) is a normal delta
+    edit_payload(cache_dir, f"match_{MATCH_ID}_scorecard.json", drop_batsman)
+    blue_green_load(db_loader.load_all, warm=False)
+
+    assert row_count(sqlite_db, "match_batting") == batting - 1
+    assert row_count(sqlite_db + ".old", "match_batting") == batting
+    assert not os.path.exists(sqlite_db + ".shadow")
+
+
+def test_blue_green_rejects_shrunk_upsert_only_table(sqlite_db):
+    db_loader.load_all()
+    conn = storage.connect(path=sqlite_db)
+    before = table_rows(conn, "players")
+    conn.close()
+
+    def load_and_lose_players():
+        db_loader.load_all()
+        # storage.DB_PATH is the shadow while the load runs
+        shadow = storage.connect()
+        cur = shadow.cursor()
+        cur.execute("DELETE FROM players WHERE player_id IN (SELECT player_id FROM players LIMIT 5)")
+        shadow.commit()
+        cur.close()
+        shadow.close()
+
+    with pytest.raises(ValidationError, match="players"):
+        blue_green_load(load_and_lose_players, warm=False)
+
+    conn = storage.connect(path=sqlite_db)
+    assert table_rows(conn, "players") == before
+    conn.close()
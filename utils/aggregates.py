@@ -0,0 +1,247 @@
+import argparse
+
+from utils import storage
+
+# ----------------------
+# Leaderboard aggregates
+# ----------------------
+# Summary tables from migration 002, kept in step with the fact tables.
+# After a load, only the groups touched by the loaded matches are rebuilt:
+# the affected batsmen and bowlers are looked up from the match ids, their
+# rows deleted and re-aggregated from the facts.
+# Players whose fact rows a load deleted are no longer found from the match
+# ids, so loaders pass them in as `removed` ({fact table: player ids}).
+# agg_team_wins and agg_toss_decision ("full") hold a row per team / toss
+# decision; a reload can move a match out of its old group (new winner or
+# decision), so they are rebuilt whole whenever any match changed.
+
+BATCH_SIZE = 500
+
+AGGREGATES = [
+    {
+        "table": "agg_batting_player_year",
+        "key": "player_id",
+        "source": "match_batting",
+        "affected": "SELECT DISTINCT batsman_id FROM match_batting WHERE match_id IN ({ids})",
+        "filter": "mb.batsman_id IN ({keys})",
+        "build": """
+            INSERT INTO agg_batting_player_year
+                (player_id, format, match_year, matches, innings, runs, balls, dismissals,
+                 centuries, highest, strike_rate_sum, strike_rate_count)
+            SELECT
+                mb.batsman_id,
+                COALESCE(f.name, 'Unknown'),
+                COALESCE(YEAR(m.start_date), 0),
+                COUNT(DISTINCT mb.match_id),
+                COUNT(mb.runs),
+                SUM(mb.runs),
+                SUM(mb.balls),
+                SUM(CASE WHEN mb.dismissal IS NOT NULL AND mb.dismissal NOT LIKE '%not out%' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN mb.runs >= 100 THEN 1 ELSE 0 END),
+                MAX(mb.runs),
+                SUM(mb.strike_rate),
+                COUNT(mb.strike_rate)
+            FROM match_batting mb
+            JOIN matches m ON m.match_id = mb.match_id
+            LEFT JOIN dim_format f ON f.format_id = m.format_id
+            WHERE mb.batsman_id IS NOT NULL {filter}
+            GROUP BY mb.batsman_id, COALESCE(f.name, 'Unknown'), COALESCE(YEAR(m.start_date), 0)
+        """,
+    },
+    {
+        "table": "agg_bowling_player_year",
+        "key": "player_id",
+        "source": "match_bowling",
+        "affected": "SELECT DISTINCT bowler_id FROM match_bowling WHERE match_id IN ({ids})",
+        "filter": "mbw.bowler_id IN ({keys})",
+        "build": """
+            INSERT INTO agg_bowling_player_year
+                (player_id, format, match_year, matches, innings, overs, balls, runs, maidens,
+                 wickets, economy_sum, economy_count)
+            SELECT
+                mbw.bowler_id,
+                COALESCE(f.name, 'Unknown'),
+                COALESCE(YEAR(m.start_date), 0),
+                COUNT(DISTINCT mbw.match_id),
+                COUNT(*),
+                SUM(mbw.overs),
+                SUM(mbw.balls),
+                SUM(mbw.runs),
+                SUM(mbw.maidens),
+                SUM(mbw.wickets),
+                SUM(mbw.economy),
+                COUNT(mbw.economy)
+            FROM match_bowling mbw
+            JOIN matches m ON m.match_id = mbw.match_id
+            LEFT JOIN dim_format f ON f.format_id = m.format_id
+            WHERE mbw.bowler_id IS NOT NULL {filter}
+            GROUP BY mbw.bowler_id, COALESCE(f.name, 'Unknown'), COALESCE(YEAR(m.start_date), 0)
+        """,
+    },
+    {
+        "table": "agg_team_wins",
+        "key": "team_id",
+        "full": True,
+        "build": """
+            INSERT INTO agg_team_wins (team_id, wins)
+            SELECT mr.winning_team_id, COUNT(*)
+            FROM match_result mr
+            WHERE mr.winning_team_id IS NOT NULL
+            GROUP BY mr.winning_team_id
+        """,
+    },
+    {
+        "table": "agg_venue_bowling",
+        "key": "bowler_id",
+        "source": "match_bowling",
+        "affected": "SELECT DISTINCT bowler_id FROM match_bowling WHERE match_id IN ({ids})",
+        "filter": "mbw.bowler_id IN ({keys})",
+        "build": """
+            INSERT INTO agg_venue_bowling (bowler_id, venue_id, matches, wickets, economy_sum, economy_count)
+            SELECT bowler_id, venue_id, COUNT(*), SUM(wickets_in_match),
+                   SUM(avg_econ_in_match), COUNT(avg_econ_in_match)
+            FROM (
+                SELECT mbw.bowler_id, m.venue_id, mbw.match_id,
+                       SUM(mbw.overs) AS overs_in_match,
+                       SUM(mbw.wickets) AS wickets_in_match,
+                       AVG(mbw.economy) AS avg_econ_in_match
+                FROM match_bowling mbw
+                JOIN matches m ON m.match_id = mbw.match_id
+                WHERE m.venue_id IS NOT NULL AND mbw.bowler_id IS NOT NULL {filter}
+                GROUP BY mbw.bowler_id, m.venue_id, mbw.match_id
+            ) bm
+            WHERE overs_in_match >= 4
+            GROUP BY bowler_id, venue_id
+        """,
+    },
+    {
+        "table": "agg_toss_decision",
+        "key": "decision",
+        "full": True,
+        "build": """
+            INSERT INTO agg_toss_decision (decision, total_matches, won_by_toss_winner)
+            SELECT COALESCE(mt.decision, 'Unknown'),
+                   COUNT(*),
+                   SUM(CASE WHEN mt.toss_winner_id = mr.winning_team_id THEN 1 ELSE 0 END)
+            FROM match_toss mt
+            JOIN match_result mr ON mr.match_id = mt.match_id
+            WHERE mt.match_id IS NOT NULL
+            GROUP BY COALESCE(mt.decision, 'Unknown')
+        """,
+    },
+]
+
+
+# Match columns the summary tables read besides the scorecard facts; a load
+# that leaves these unchanged for a match does not need to re-aggregate it
+INPUTS = {
+    "matches": ("format_id", "start_date", "venue_id"),
+    "match_teams": ("team_id",),
+    "match_result": ("winning_team_id",),
+    "match_toss": ("decision", "toss_winner_id"),
+}
+
+
+def match_inputs(cursor, tables, match_ids=None):
+    """{match_id: {(table, *INPUTS values), ...}} of every match (or just these)."""
+    state = {}
+    for table in tables:
+        sql = f"SELECT match_id, {', '.join(INPUTS[table])} FROM {table}"
+        if match_ids is None:
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+        else:
+            rows = []
+            for chunk in _batches(match_ids):
+                cursor.execute(f"{sql} WHERE match_id IN ({_placeholders(len(chunk))})", tuple(chunk))
+                rows += cursor.fetchall()
+        for row in rows:
+            state.setdefault(row[0], set()).add((table,) + tuple(row[1:]))
+    return state
+
+
+def changed_matches(before, after, match_ids):
+    """The match_ids whose match_inputs() differ between two snapshots."""
+    return {mid for mid in match_ids if before.get(mid) != after.get(mid)}
+
+
+def _batches(values, size=BATCH_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _placeholders(n):
+    return ",".join(["%s"] * n)
+
+
+def affected_keys(cursor, spec, match_ids):
+    keys = set()
+    for chunk in _batches(match_ids):
+        sql = spec["affected"].replace("{ids}", _placeholders(len(chunk)))
+        cursor.execute(sql, tuple(chunk) * spec["affected"].count("{ids}"))
+        keys.update(row[0] for row in cursor.fetchall() if row[0] is not None)
+    return keys
+
+
+def rebuild(cursor, spec, keys=None):
+    """Re-aggregate the rows for `keys` (or the whole table when keys is None)."""
+    if keys is None:
+        cursor.execute(f"DELETE FROM {spec['table']}")
+        cursor.execute(spec["build"].replace("{filter}", ""))
+        return
+    for chunk in _batches(keys):
+        marks = _placeholders(len(chunk))
+        cursor.execute(f"DELETE FROM {spec['table']} WHERE {spec['key']} IN ({marks})", tuple(chunk))
+        filter_sql = "AND " + spec["filter"].replace("{keys}", marks)
+        cursor.execute(spec["build"].replace("{filter}", filter_sql), tuple(chunk))
+
+
+def refresh_aggregates(match_ids=None, conn=None, removed=None):
+    """
+    Bring the summary tables up to date after a load.
+
+    match_ids: matches whose facts changed; None rebuilds everything.
+    removed: {fact table: player ids} of fact rows the load deleted.
+    An empty summary table is always rebuilt in full (first run after the
+    migration).
+    """
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+
+    summary = []
+    for spec in AGGREGATES:
+        cur.execute(f"SELECT 1 FROM {spec['table']} LIMIT 1")
+        empty = cur.fetchone() is None
+        if match_ids is None or empty or (match_ids and spec.get("full")):
+            rebuild(cur, spec)
+            summary.append(f"{spec['table']} (full)")
+        elif match_ids:
+            keys = affected_keys(cur, spec, match_ids)
+            keys |= (removed or {}).get(spec.get("source"), set())
+            rebuild(cur, spec, keys)
+            summary.append(f"{spec['table']} ({len(keys)} {spec['key']})")
+
+    conn.commit()
+    cur.close()
+    if own:
+        conn.close()
+    print(f"✅ Aggregates refreshed: {', '.join(summary) or 'nothing to do'}")
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the leaderboard summary tables")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild every summary table from scratch")
+    parser.add_argument("--matches", type=int, nargs="+", help="Refresh only the groups touched by these match ids")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        refresh_aggregates()
+    elif args.matches:
+        refresh_aggregates(set(args.matches))
+    else:
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,317 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import mysql.connector
+
+from utils import db_loader, payloads, query_catalog
+from utils.migrate import apply_migrations
+from utils.stats_grid import decode_grid, grid_cells
+from utils.synthetic_cache import generate_cache
+
+# ----------------------
+# Loader benchmark
+# ----------------------
+# Runs every db_loader.load_* function against a disposable MySQL/MariaDB
+# database filled from a synthetic cache tree, and records wall time,
+# rows/sec and peak RSS per loader in a JSON report. The stats-grid decoder
+# is timed on its own over every player stats payload of the tree, and every
+# query in the query catalog is timed against the loaded database.
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "schema.sql")
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
+
+# Loaders in the same order as db_loader's __main__, with the tables each one fills
+LOADERS = [
+    ("load_teams", ["teams"]),
+    ("load_players", ["players", "player_team"]),
+    ("load_venues", ["venues"]),
+    ("load_series_and_matches", ["series", "matches", "match_teams"]),
+    ("load_match_details", ["match_result", "match_toss", "match_officials", "match_awards", "match_roster"]),
+    ("load_player_stats", ["player_stats"]),
+    ("load_player_bowling_stats", ["player_bowling_stats"]),
+    ("load_scorecards", ["match_batting", "match_bowling", "match_fow"]),
+]
+
+
+def admin_connection():
+    """Connection to the server without selecting a database."""
+    return mysql.connector.connect(
+        host=db_loader.DB_HOST,
+        user=db_loader.DB_USER,
+        port=db_loader.DB_PORT,
+        password=db_loader.DB_PASSWORD,
+    )
+
+
+def schema_statements(path=SCHEMA_PATH):
+    """schema.sql split into statements, minus its CREATE DATABASE / USE lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        script = f.read()
+    statements = []
+    for stmt in script.split(";"):
+        lines = [l for l in stmt.splitlines() if l.strip() and not l.strip().startswith("--")]
+        body = "\n".join(lines).strip()
+        if not body or body.upper().startswith(("CREATE DATABASE", "USE ")):
+            continue
+        statements.append(body)
+    return statements
+
+
+def reset_database(database):
+    """Drop and recreate the benchmark database from schema.sql and the migrations."""
+    conn = admin_connection()
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cur.execute(f"CREATE DATABASE `{database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+    cur.execute(f"USE `{database}`")
+    for stmt in schema_statements():
+        cur.execute(stmt)
+    conn.commit()
+    cur.close()
+    # schema.sql alone is not enough: since migration 003 the loaders write
+    # columns that only the migrations add (capacity_num, highest_runs, ...)
+    apply_migrations(conn)
+    conn.close()
+
+
+def drop_database(database):
+    conn = admin_connection()
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cur.close()
+    conn.close()
+
+
+def count_rows(database, tables):
+    conn = admin_connection()
+    cur = conn.cursor()
+    counts = {}
+    for table in tables:
+        cur.execute(f"SELECT COUNT(*) FROM `{database}`.`{table}`")
+        counts[table] = cur.fetchone()[0]
+    cur.close()
+    conn.close()
+    return counts
+
+
+def _run_loader(name, cache_dir, database, queue):
+    """Child process entry point: run one loader and report its own peak RSS."""
+    db_loader.CACHE_DIR = cache_dir
+    db_loader.DB_NAME = database
+    start = time.perf_counter()
+    getattr(db_loader, name)()
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    queue.put({"wall_time_s": elapsed, "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss})
+
+
+def bench_loader(name, tables, cache_dir, database):
+    """Run a single loader in a fresh process so peak RSS is per loader."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    before = count_rows(database, tables)
+    proc = ctx.Process(target=_run_loader, args=(name, cache_dir, database, queue))
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        raise RuntimeError(f"{name} exited with code {proc.exitcode}")
+    timing = queue.get()
+    after = count_rows(database, tables)
+
+    rows = sum(after[t] - before[t] for t in tables)
+    wall = timing["wall_time_s"]
+    return {
+        "loader": name,
+        "tables": after,
+        "rows": rows,
+        "wall_time_s": round(wall, 4),
+        "rows_per_sec": round(rows / wall, 1) if wall > 0 else None,
+        "peak_rss_kb": timing["peak_rss_kb"],
+    }
+
+
+def _per_format_rebuild(payload):
+    """The decode load_player_stats used before stats_grid: one dict over all rows per format."""
+    headers = payload.get("headers", [])[1:]
+    rows = payload.get("values", [])
+    return {fmt.strip(): {r["values"][0]: r["values"][i + 1] for r in rows} for i, fmt in enumerate(headers)}
+
+
+def bench_decoders(cache_dir, repeat=5):
+    """Time decode_grid against the old per-format rebuild over every player stats payload."""
+    grids = []
+    for fname in sorted(os.listdir(cache_dir)):
+        if fname.startswith("player_") and fname.endswith(("_batting.json", "_bowling.json")):
+            with open(os.path.join(cache_dir, fname), "r", encoding="utf-8") as f:
+                grids.append(json.load(f))
+    cells = sum(grid_cells(p) for p in grids)
+
+    results = {"payloads": len(grids), "cells": cells}
+    for name, decode in (("per_format_rebuild", _per_format_rebuild), ("decode_grid", decode_grid)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for p in grids:
+                decode(p)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {
+            "wall_time_s": round(best, 4),
+            "payloads_per_sec": round(len(grids) / best, 1) if best > 0 else None,
+            "cells_per_sec": round(cells / best, 1) if best > 0 else None,
+        }
+    # > 1 means decode_grid is faster than the rebuild it replaced
+    old, new = results["per_format_rebuild"]["wall_time_s"], results["decode_grid"]["wall_time_s"]
+    results["decode_grid"]["speedup"] = round(old / new, 2) if new > 0 else None
+    return results
+
+
+def bench_queries(database, repeat=3):
+    """Best-of-`repeat` wall time and row count of every catalog query."""
+    conn = admin_connection()
+    conn.database = database
+    cur = conn.cursor()
+    results = []
+    for query in query_catalog.load_catalog():
+        params = query_catalog.bind(query)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cur.execute(query.sql, params)
+            rows = len(cur.fetchall())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({"query": query.id, "rows": rows, "wall_time_s": round(best, 4)})
+    cur.close()
+    conn.close()
+    return results
+
+
+# Cached payload kinds: (file prefix, file suffix, struct)
+PARSE_KINDS = {
+    "player_info": ("player_", "_info.json", payloads.PlayerInfo),
+    "stats_grid": ("player_", ("_batting.json", "_bowling.json"), payloads.StatsGrid),
+    "series_matches": ("series_", "_matches.json", payloads.SeriesMatches),
+    "match_info": ("match_", "_info.json", payloads.MatchCenter),
+    "scorecard": ("match_", "_scorecard.json", payloads.Scorecard),
+}
+
+
+def bench_parsers(cache_dir, repeat=3):
+    """
+    json.loads into dicts vs typed msgspec decoding, per payload kind: best
+    wall time over the raw bytes and the memory the decoded objects retain.
+    """
+    files = sorted(os.listdir(cache_dir))
+    results = {}
+    for kind, (prefix, suffix, payload_type) in PARSE_KINDS.items():
+        blobs = []
+        for fname in files:
+            if fname.startswith(prefix) and fname.endswith(suffix):
+                with open(os.path.join(cache_dir, fname), "rb") as f:
+                    blobs.append(f.read())
+        if not blobs:
+            continue
+        size = sum(len(b) for b in blobs)
+        result = {"files": len(blobs), "bytes": size}
+        for name, parse in (("json", json.loads), ("msgspec", lambda b: payloads.decode(b, payload_type))):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for b in blobs:
+                    parse(b)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            tracemalloc.start()
+            kept = [parse(b) for b in blobs]
+            retained = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del kept
+            result[name] = {
+                "wall_time_s": round(best, 4),
+                "mb_per_sec": round(size / best / 1e6, 1) if best > 0 else None,
+                "retained_kb": round(retained / 1024),
+            }
+        json_t, msgspec_t = result["json"]["wall_time_s"], result["msgspec"]["wall_time_s"]
+        result["speedup"] = round(json_t / msgspec_t, 2) if msgspec_t > 0 else None
+        results[kind] = result
+    return results
+
+
+def run_benchmark(scales, database, keep_cache=False, seed=42, decoders_only=False):
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "database": database,
+        "runs": [],
+    }
+    for scale in scales:
+        cache_dir = tempfile.mkdtemp(prefix=f"cricbuzz_cache_{scale}x_")
+        try:
+            entities = generate_cache(cache_dir, scale=scale, seed=seed)
+            decoders = bench_decoders(cache_dir)
+            for name in ("per_format_rebuild", "decode_grid"):
+                print(f"⏱️ [{scale}x] {name}: {decoders['payloads']} payloads in {decoders[name]['wall_time_s']}s "
+                      f"({decoders[name]['cells_per_sec']} cells/s)")
+            print(f"⏱️ [{scale}x] decode_grid vs per_format_rebuild: {decoders['decode_grid']['speedup']}x")
+            parsers = bench_parsers(cache_dir)
+            for kind, p in parsers.items():
+                print(f"⏱️ [{scale}x] parse {kind}: json {p['json']['wall_time_s']}s, msgspec {p['msgspec']['wall_time_s']}s "
+                      f"(x{p['speedup']}, retained {p['json']['retained_kb']} → {p['msgspec']['retained_kb']} KB)")
+            results, queries = [], []
+            if not decoders_only:
+                reset_database(database)
+                for name, tables in LOADERS:
+                    result = bench_loader(name, tables, cache_dir, database)
+                    print(f"⏱️ [{scale}x] {name}: {result['rows']} rows in {result['wall_time_s']}s "
+                          f"({result['rows_per_sec']} rows/s, peak RSS {result['peak_rss_kb']} KB)")
+                    results.append(result)
+                queries = bench_queries(database)
+                print(f"⏱️ [{scale}x] {len(queries)} catalog queries in "
+                      f"{sum(q['wall_time_s'] for q in queries):.4f}s (best of 3)")
+            report["runs"].append({"scale": scale, "entities": entities, "decoders": decoders,
+                                   "parsers": parsers, "loaders": results,
+                                   "queries": queries})
+        finally:
+            if not keep_cache:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+    return report
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="db_loader throughput benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], choices=[1, 10, 100],
+                        help="Synthetic cache scales to benchmark")
+    parser.add_argument("--database", default="cricbuzz_bench",
+                        help="Disposable database name (dropped and recreated!)")
+    parser.add_argument("--report", default=None, help="Path of the JSON report")
+    parser.add_argument("--keep-db", action="store_true", help="Keep the benchmark database afterwards")
+    parser.add_argument("--keep-cache", action="store_true", help="Keep the generated cache trees")
+    parser.add_argument("--decoders-only", action="store_true",
+                        help="Only time the stats-grid decoder and payload parsers (no database needed)")
+    args = parser.parse_args()
+
+    if args.database == db_loader.DB_NAME:
+        parser.error("--database must not be the live database")
+
+    report = run_benchmark(args.scales, args.database, keep_cache=args.keep_cache,
+                           decoders_only=args.decoders_only)
+    if not (args.keep_db or args.decoders_only):
+        drop_database(args.database)
+
+    report_path = args.report or os.path.join(
+        LOG_DIR, f"bench_loader_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"🎉 Benchmark report written to {report_path}")
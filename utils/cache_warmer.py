@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from utils import leaderboards, match_feed, paging, query_catalog, query_exec, result_cache
+
+# ----------------------
+# Cache warmer
+# ----------------------
+# After a load the first visitor of each page would pay for cold queries.
+# warm() precomputes what the pages read first, through the same cache keys
+# the pages use:
+#
+#   - every catalog query: plan, row count and the first page (default
+#     parameters, default page size), under its own time limit
+#   - the Top Player leaderboards
+#   - the live / upcoming / recent match feeds
+#
+# and reports how long each item took. Results land in the result cache of
+# the process that runs it: inside the Streamlit server a background thread
+# (start_background, started by utils/ui.py) warms whenever the data version
+# moves; `db_loader --warm` or `python -m utils.cache_warmer` warm the shared
+# tier (RESULT_CACHE_PATH), which every server process reads. CACHE_WARMER=0
+# disables the background thread; CACHE_WARM_CHECK_S (default 30) is how
+# often it looks at the data version.
+#
+# Every write path that bumps the data version (db_loader, blue_green_load,
+# StreamIngest.close, scorecard_delta.refresh_match) calls after_bump(),
+# which does not block the writer: it wakes this process's background
+# warmer at once, or, in a CLI process with RESULT_CACHE_PATH set, warms
+# the shared tier on a thread the process waits for before exiting. A CLI
+# process without a shared tier has nothing to warm: the server's own
+# warmer picks the new version up within CACHE_WARM_CHECK_S.
+
+CACHE_WARMER = os.getenv("CACHE_WARMER", "1") != "0"
+WARM_CHECK_S = float(os.getenv("CACHE_WARM_CHECK_S", "30"))
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
+
+_BACKGROUND = []   # BackgroundWarmers running in this process
+
+
+class WarmResult(NamedTuple):
+    item: str          # "Que 7", "leaderboards", "feed:live"
+    seconds: float
+    status: str        # warmed / cached / stale / error: ...
+
+
+def _timed(item, fn):
+    start = time.perf_counter()
+    try:
+        status = fn()
+    except Exception as e:
+        status = f"error: {e}"
+    return WarmResult(item, round(time.perf_counter() - start, 4), status)
+
+
+def warm_query(pool, query, page_size=paging.PAGE_SIZES[1]):
+    params = query_catalog.bind(query)
+    result = query_exec.run(pool, lambda conn: paging.cached_page(conn, query, params, 0, page_size),
+                            query.timeout or query_exec.QUERY_TIMEOUT_S)
+    return "cached" if result[5] else "warmed"
+
+
+def warm_leaderboards(pool):
+    with pool.connection() as conn:
+        board = leaderboards.load(conn)
+    return f"warmed ({len(board.stats)} players)"
+
+
+def warm_feeds():
+    entries = match_feed.get_feed().get_all()
+    return {kind: "warmed" if entry.refreshed else "stale" for kind, entry in entries.items()}
+
+
+def warm(pool, page_size=paging.PAGE_SIZES[1], feeds=True):
+    """Warm every catalog query, the leaderboards and (optionally) the match feeds; [WarmResult]."""
+    results = []
+    # the feeds come from the API, so they are fetched while the queries run
+    feed_thread, feed_result = None, {}
+    if feeds:
+        def fetch():
+            start = time.perf_counter()
+            try:
+                feed_result.update(warm_feeds())
+            except Exception as e:
+                feed_result["all"] = f"error: {e}"
+            feed_result["_s"] = round(time.perf_counter() - start, 4)
+        feed_thread = threading.Thread(target=fetch, daemon=True, name="cache-warmer-feeds")
+        feed_thread.start()
+
+    for query in query_catalog.load_catalog():
+        results.append(_timed(query.id, lambda: warm_query(pool, query, page_size)))
+    results.append(_timed("leaderboards", lambda: warm_leaderboards(pool)))
+
+    if feed_thread is not None:
+        feed_thread.join()
+        seconds = feed_result.pop("_s", 0.0)
+        results += [WarmResult(f"feed:{kind}", seconds, status) for kind, status in feed_result.items()]
+    return results
+
+
+def print_report(results):
+    for r in results:
+        icon = "⚠️" if r.status.startswith("error") else "⏱️"
+        print(f"{icon} {r.item:14} {r.seconds * 1000:9.1f} ms  {r.status}")
+    total = sum(r.seconds for r in results if not r.item.startswith("feed:"))
+    print(f"✅ Warmed {len(results)} items ({total:.2f}s of queries)")
+
+
+def write_report(results, version=None, path=None):
+    """Write the warm-up timings as JSON (default: utils/logs/cache_warm_<timestamp>.json); returns the path."""
+    path = path or os.path.join(LOG_DIR, f"cache_warm_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"data_version": version, "items": [r._asdict() for r in results]}, f, indent=2)
+    return path
+
+
+# ----------------------
+# Background warmer
+# ----------------------
+class BackgroundWarmer:
+    """Daemon thread that re-warms the caches whenever the data version changes."""
+
+    def __init__(self, pool, interval=WARM_CHECK_S):
+        self.pool = pool
+        self.interval = interval
+        self.version = None
+        self.last = []           # [WarmResult] of the latest warm-up
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="cache-warmer")
+
+    def start(self):
+        self._thread.start()
+        _BACKGROUND.append(self)
+        return self
+
+    def wake(self):
+        """Check the data version now instead of at the next interval."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self in _BACKGROUND:
+            _BACKGROUND.remove(self)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self.pool.connection() as conn:
+                    version = result_cache.data_version(conn)
+                if version is not None and version != self.version:
+                    self.last = warm(self.pool)
+                    self.version = version
+            except Exception as e:
+                print(f"⚠️ Cache warm-up failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+def start_background(pool, interval=WARM_CHECK_S):
+    """Start a BackgroundWarmer (None when CACHE_WARMER=0)."""
+    return BackgroundWarmer(pool, interval).start() if CACHE_WARMER else None
+
+
+def _warm_shared(pool):
+    try:
+        results = warm(pool, feeds=False)
+    except Exception as e:
+        print(f"⚠️ Cache warm-up failed: {e}")
+        return
+    total = sum(r.seconds for r in results)
+    errors = sum(r.status.startswith("error") for r in results)
+    icon = "⚠️" if errors else "✅"
+    print(f"{icon} Warmed {len(results)} items in {total:.2f}s after the data version bump ({errors} errors)")
+
+
+def after_bump(pool):
+    """
+    Warm the caches for a freshly bumped data version without blocking the
+    caller: wakes this process's BackgroundWarmer, or warms the shared tier
+    (RESULT_CACHE_PATH) on a non-daemon thread. Returns the warmer or thread,
+    or None when there is nothing to warm (CACHE_WARMER=0, no shared tier).
+    """
+    if not CACHE_WARMER:
+        return None
+    if _BACKGROUND:
+        for warmer in _BACKGROUND:
+            warmer.wake()
+        return _BACKGROUND[0]
+    if not result_cache.RESULT_CACHE_PATH:
+        return None
+    thread = threading.Thread(target=_warm_shared, args=(pool,), name="cache-warmer-bump")
+    thread.start()
+    return thread
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    from utils import db_loader, db_pool
+
+    parser = argparse.ArgumentParser(description="Warm the result cache after a load")
+    parser.add_argument("--page-size", type=int, default=paging.PAGE_SIZES[1])
+    parser.add_argument("--no-feeds", action="store_true", help="Skip the match feed prefetch")
+    parser.add_argument("--report", default=None, help="Path of the JSON report (default: utils/logs/cache_warm_<timestamp>.json)")
+    args = parser.parse_args()
+
+    if not result_cache.RESULT_CACHE_PATH:
+        print("⚠️ RESULT_CACHE_PATH is not set; results only warm this process's cache")
+    pool = db_loader.get_pool()
+    with pool.connection() as conn:
+        version = result_cache.data_version(conn)
+    results = warm(pool, args.page_size, feeds=not args.no_feeds)
+    print_report(results)
+    print(f"✅ Warm-up report written to {write_report(results, version, args.report)}")
+    db_pool.close_all()
@@ -1,10 +1,19 @@
+import argparse
 import os
-import json
 import re
 import mysql.connector
 from dotenv import load_dotenv
 from glob import glob
 from datetime import datetime
+from utils import db_pool, storage
+from utils.aggregates import changed_matches, match_inputs, refresh_aggregates
+from utils.dimensions import DimensionCache
+from utils.load_stats import LoadStats
+from utils.migrate import apply_migrations
+from utils.partitions import ensure_partitions, match_years
+from utils.result_cache import bump_data_version
+from utils import payloads
+from utils.stats_grid import decode_grid
 
 # ----------------------
 # Helpers
@@ -18,11 +27,17 @@ DB_PORT = os.getenv("DB_PORT", "")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_NAME = os.getenv("DB_NAME", "cricbuzz_db")
 
-CACHE_DIR = "cache"
+# Cache tree written by fetch_api.py (override with CACHE_DIR, e.g. for benchmarks)
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache"))
 
-# Database connection
-def get_connection():
-    return mysql.connector.connect(
+# Per-loader / per-table timings and row counts of the current run (utils/load_stats.py)
+STATS = LoadStats()
+
+# Database connection (MySQL, or the embedded engine selected by DB_BACKEND),
+# borrowed from the shared pool; use `with get_pool().connection() as conn:`
+# (or close() in a finally) so the connection always goes back
+def get_pool():
+    return db_pool.get_pool(
         host=DB_HOST,
         user=DB_USER,
         port=DB_PORT,
@@ -30,6 +45,9 @@ def get_connection():
         database=DB_NAME
     )
 
+def get_connection():
+    return get_pool().acquire()
+
 # Safe integer conversion
 def safe_int(val):
     try:
@@ -54,672 +72,680 @@ def epoch_to_datetime(epoch_ms):
     except Exception:
         return None
 
+# "1,32,000" / "25,000 (approx)" / 1864 → first number in the text
+def parse_number_text(val):
+    """Return the first integer in a free-text value (thousands separators allowed)."""
+    if val is None:
+        return None
+    m = re.search(r"\d[\d,]*", str(val))
+    return safe_int(m.group(0).replace(",", "")) if m else None
 
+# "183*" → (183, True)
+def parse_highest(val):
+    """Split a highest-score string into (runs, not_out)."""
+    m = re.match(r"\s*(\d+)(\*?)", str(val)) if val is not None else None
+    if not m:
+        return None, None
+    return int(m.group(1)), m.group(2) == "*"
 
-# ----------------------
-# Loaders
-# ----------------------
+# "5/23" → (5, 23)
+def parse_best_bowling(val):
+    """Split a best-bowling figure into (wickets, runs)."""
+    m = re.match(r"\s*(\d+)\s*/\s*(\d+)", str(val)) if val is not None else None
+    if not m:
+        return None, None
+    return int(m.group(1)), int(m.group(2))
 
-def load_teams():
-    path = os.path.join(CACHE_DIR, "teams_list.json")
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-    for team in data.get("list", []):
-        if "teamId" not in team:
-            continue
 
-        country = team.get("countryName")
-        if not country:
-            # fallback: use teamName if no country provided
-            country = team.get("teamName")
 
+# ----------------------
+# Row builders
+# ----------------------
+# One function per payload kind: takes a decoded utils.payloads struct and
+# writes its rows with the given cursor. The file loaders below and the
+# streaming ingest (utils/stream_ingest.py) both go through these.
+
+def write_team(cursor, team):
+    """Upsert one teams_list entry; returns False when it has no teamId."""
+    if team.team_id is None:
+        return False
+
+    # fallback: use teamName if no country provided
+    country = team.country_name or team.team_name
+
+    cursor.execute("""
+        INSERT INTO teams (team_id, name, short_name, country, image_url)
+        VALUES (%s,%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE name=VALUES(name), short_name=VALUES(short_name),
+        country=VALUES(country), image_url=VALUES(image_url)
+    """, (
+        safe_int(team.team_id),
+        team.team_name,
+        team.team_s_name,
+        country,
+        f"http://i.cricketcb.com/i/stats/images/{team.image_id}.jpg" if team.image_id else None
+    ))
+    return True
+
+def write_player(cursor, dims, p):
+    """Upsert a player info payload and its team links."""
+    cursor.execute("""
+        INSERT INTO players (player_id, name, nickname, dob, birthplace, image_url,
+                             role_id, bat_style_id, bowl_style_id, country_id)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE
+                name=VALUES(name),
+                nickname=VALUES(nickname),
+                dob=VALUES(dob),
+                birthplace=VALUES(birthplace),
+                image_url=VALUES(image_url),
+                role_id=VALUES(role_id),
+                bat_style_id=VALUES(bat_style_id),
+                bowl_style_id=VALUES(bowl_style_id),
+                country_id=VALUES(country_id)
+    """, (
+        safe_int(p.id),
+        p.name,
+        p.nick_name,
+        p.dob_format,
+        p.birth_place,
+        p.image,
+        dims.id("role", p.role),
+        dims.id("bat_style", p.bat),
+        dims.id("bowl_style", p.bowl),
+        dims.id("country", p.intl_team)
+    ))
+
+    for t in p.team_name_ids:
         cursor.execute("""
-            INSERT INTO teams (team_id, name, short_name, country, image_url)
-            VALUES (%s,%s,%s,%s,%s)
-            ON DUPLICATE KEY UPDATE name=VALUES(name), short_name=VALUES(short_name),
-            country=VALUES(country), image_url=VALUES(image_url)
+            INSERT IGNORE INTO player_team (player_id, team_id)
+            VALUES (%s,%s)
         """, (
-            safe_int(team.get("teamId")),
-            team.get("teamName"),
-            team.get("teamSName"),
-            country,
-            f"http://i.cricketcb.com/i/stats/images/{team.get('imageId')}.jpg" if team.get("imageId") else None
+            safe_int(p.id),
+            safe_int(t.team_id)
         ))
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-    print("✅ Teams loaded")
-
-def load_players():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+def write_venue(cursor, vid, v):
+    """Upsert a venue info payload."""
+    cursor.execute("""
+        INSERT INTO venues (venue_id, name, city, country, timezone, established, capacity, known_as, ends, home_team, floodlights, image_url,
+                            capacity_num, established_year)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE name=VALUES(name), city=VALUES(city), country=VALUES(country),
+        timezone=VALUES(timezone), established=VALUES(established), capacity=VALUES(capacity),
+        known_as=VALUES(known_as), ends=VALUES(ends), home_team=VALUES(home_team),
+        floodlights=VALUES(floodlights), image_url=VALUES(image_url),
+        capacity_num=VALUES(capacity_num), established_year=VALUES(established_year)
+    """, (
+        vid,
+        v.ground,
+        v.city,
+        v.country,
+        v.timezone,
+        str(v.established),
+        v.capacity,
+        v.known_as,
+        v.ends,
+        v.home_team,
+        v.floodlights,
+        v.image_url,
+        parse_number_text(v.capacity),
+        parse_number_text(v.established)
+    ))
+
+def write_match_info(cursor, dims, info):
+    """Upsert the series, match and match_teams rows of one matchInfo; returns the match id."""
+    # --- SERIES UPSERT ---
+    sid = safe_int(info.series_id)
+    sname = info.series_name
+    sstart = epoch_to_datetime(info.series_start_dt)
+    send = epoch_to_datetime(info.series_end_dt)
+
+    # Use seriesType, else fallback to matchFormat
+    stype = info.series_type or info.match_format
+
+    if sid:
+        cursor.execute("""
+            INSERT INTO series (series_id, name, type, start_date, end_date)
+            VALUES (%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE
+                name=VALUES(name),
+                type=VALUES(type),
+                start_date=VALUES(start_date),
+                end_date=VALUES(end_date)
+        """, (sid, sname, stype, sstart, send))
+
+    # --- MATCH INSERT ---
+    mid = safe_int(info.match_id)
+    if not mid:
+        return None
+    mdesc = info.match_desc
+    mformat = info.match_format
+    mstart = epoch_to_datetime(info.start_date)
+    mend = epoch_to_datetime(info.end_date)
+    state = info.state
+    status = info.status
+    vid = safe_int(info.venue_info.id) if info.venue_info else None
+
+    cursor.execute("""
+        INSERT INTO matches (match_id, series_id, name, start_date, end_date, state, status, venue_id, format_id)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE
+            series_id=VALUES(series_id),
+            name=VALUES(name),
+            format_id=VALUES(format_id),
+            start_date=VALUES(start_date),
+            end_date=VALUES(end_date),
+            state=VALUES(state),
+            status=VALUES(status),
+            venue_id=VALUES(venue_id)
+    """, (mid, sid, mdesc, mstart, mend, state, status, vid, dims.id("format", mformat)))
+
+    # --- match_teams ---
+    for side in ("team1", "team2"):
+        t = getattr(info, side)
+        tid = safe_int(t.team_id) if t else None
+        if tid:
+            cursor.execute("""
+                INSERT IGNORE INTO match_teams (match_id, team_id, team_role)
+                VALUES (%s,%s,%s)
+            """, (mid, tid, side))
+    return mid
+
+def write_match_details(cursor, dims, mi):
+    """Upsert result, toss, officials, awards and rosters of one match centre payload; returns the match id."""
+    match_id = mi.match_id if mi else None
+    if not match_id:
+        return None
 
-    for fname in os.listdir(CACHE_DIR):
-        if not fname.startswith("player_") or not fname.endswith("_info.json"):
-            continue
-        path = os.path.join(CACHE_DIR, fname)
-        with open(path, "r", encoding="utf-8") as f:
-            p = json.load(f)
+    # --- Match Result ---
+    result = mi.result
+    if result:
+        cursor.execute("""
+            INSERT INTO match_result (match_id, result_type, winning_team, winning_team_id,
+                                    winning_margin, win_by_runs, win_by_innings)
+            VALUES (%s,%s,%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE result_type=VALUES(result_type),
+                                    winning_team=VALUES(winning_team),
+                                    winning_team_id=VALUES(winning_team_id),
+                                    winning_margin=VALUES(winning_margin),
+                                    win_by_runs=VALUES(win_by_runs),
+                                    win_by_innings=VALUES(win_by_innings)
+        """, (
+            match_id,
+            result.result_type,
+            result.winning_team,
+            result.winningteam_id,
+            result.winning_margin,
+            result.win_by_runs,
+            result.win_by_innings
+        ))
 
+    # --- Toss ---
+    toss = mi.toss_results
+    if toss:
         cursor.execute("""
-            INSERT INTO players (player_id, name, nickname, role, bat_style, bowl_style, dob, birthplace, country, image_url)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            ON DUPLICATE KEY UPDATE 
-                    name=VALUES(name), 
-                    nickname=VALUES(nickname),
-                    role=VALUES(role),
-                    bat_style=VALUES(bat_style), 
-                    bowl_style=VALUES(bowl_style), 
-                    dob=VALUES(dob),
-                    birthplace=VALUES(birthplace), 
-                    country=VALUES(country), 
-                    image_url=VALUES(image_url)
+            INSERT INTO match_toss (match_id, toss_winner_id, toss_winner_name, decision)
+            VALUES (%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE toss_winner_id=VALUES(toss_winner_id),
+                                    toss_winner_name=VALUES(toss_winner_name),
+                                    decision=VALUES(decision)
         """, (
-            safe_int(p.get("id")),
-            p.get("name"),
-            p.get("nickName"),
-            p.get("role"),
-            p.get("bat"),
-            p.get("bowl"),
-            p.get("DoBFormat"),
-            p.get("birthPlace"),
-            p.get("intlTeam"),
-            p.get("image")
+            match_id,
+            toss.toss_winner_id,
+            toss.toss_winner_name,
+            toss.decision
         ))
 
-        for t in p.get("teamNameIds", []):
-            cursor.execute("""
-                INSERT IGNORE INTO player_team (player_id, team_id)
-                VALUES (%s,%s)
+    # --- Officials ---
+    columns = {
+        "umpire1": ("umpire1_id", "umpire1_name", "umpire1_country"),
+        "umpire2": ("umpire2_id", "umpire2_name", "umpire2_country"),
+        "umpire3": ("umpire3_id", "umpire3_name", "umpire3_country"),
+        "referee": ("referee_id", "referee_name", "referee_country"),
+    }
+    for role in ["umpire1", "umpire2", "umpire3", "referee"]:
+        official = getattr(mi, role)
+        if official:
+            id_col, name_col, country_col = columns[role]
+
+            cursor.execute(f"""
+                INSERT INTO match_officials (match_id, {id_col}, {name_col}, {country_col})
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    {id_col} = VALUES({id_col}),
+                    {name_col} = VALUES({name_col}),
+                    {country_col} = VALUES({country_col})
             """, (
-                safe_int(p.get("id")),
-                safe_int(t.get("teamId"))
+                match_id,
+                official.id,
+                official.name,
+                official.country
             ))
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-    print("✅ Players loaded")
-
-def load_venues():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-    for fname in os.listdir(CACHE_DIR):
-        if not fname.startswith("venue_") or not fname.endswith("_info.json"):
-            continue
-        path = os.path.join(CACHE_DIR, fname)
-        with open(path, "r", encoding="utf-8") as f:
-            v = json.load(f)
-
-        vid = int(fname.split("_")[1])
+    # --- Awards ---
+    for p in mi.players_of_the_match:
         cursor.execute("""
-            INSERT INTO venues (venue_id, name, city, country, timezone, established, capacity, known_as, ends, home_team, floodlights, image_url)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            ON DUPLICATE KEY UPDATE name=VALUES(name), city=VALUES(city), country=VALUES(country),
-            timezone=VALUES(timezone), established=VALUES(established), capacity=VALUES(capacity),
-            known_as=VALUES(known_as), ends=VALUES(ends), home_team=VALUES(home_team),
-            floodlights=VALUES(floodlights), image_url=VALUES(image_url)
+            INSERT INTO match_awards (match_id, award_type, player_id, player_name, team_name)
+            VALUES (%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE player_name=VALUES(player_name),
+                                    team_name=VALUES(team_name)
         """, (
-            vid,
-            v.get("ground"),
-            v.get("city"),
-            v.get("country"),
-            v.get("timezone"),
-            str(v.get("established")),
-            v.get("capacity"),
-            v.get("knownAs"),
-            v.get("ends"),
-            v.get("homeTeam"),
-            v.get("floodlights"),
-            v.get("imageUrl")
+            match_id, "PlayerOfMatch",
+            p.id, p.full_name or p.name, p.team_name
         ))
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-    print("✅ Venues loaded")
-
-def load_series_and_matches():
-    from glob import glob
-
-    files = glob(os.path.join(CACHE_DIR, "series_*_matches.json"))
-    if not files:
-        print("⚠️ No series_*_matches.json files found in cache.")
-        return
+    for p in mi.players_of_the_series:
+        cursor.execute("""
+            INSERT INTO match_awards (match_id, award_type, player_id, player_name, team_name)
+            VALUES (%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE player_name=VALUES(player_name),
+                                    team_name=VALUES(team_name)
+        """, (
+            match_id, "PlayerOfSeries",
+            p.id, p.full_name or p.name, p.team_name
+        ))
 
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SET FOREIGN_KEY_CHECKS = 0")
-    series_count = 0
-    match_count = 0
-    mt_teams = 0
-    mt_scores = 0
-
-    for path in files:
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-        except Exception:
+    # --- Roster (players & staff) ---
+    for team_key in ["team1", "team2"]:
+        team = getattr(mi, team_key)
+        if not team:
             continue
-
-        for detail in data.get("matchDetails", []):
-            m_map = detail.get("matchDetailsMap") or {}
-            matches_list = m_map.get("match") if isinstance(m_map, dict) else None
-            if not matches_list:
+        team_id = team.id
+        for p in team.player_details:
+            player_id = p.id
+            if not player_id:
                 continue
 
-            for m in matches_list:
-                info = m.get("matchInfo") or {}
-                if not info:
-                    continue
-
-                # --- SERIES UPSERT ---
-                sid = safe_int(info.get("seriesId"))
-                sname = info.get("seriesName")
-                sstart = epoch_to_datetime(info.get("seriesStartDt"))
-                send = epoch_to_datetime(info.get("seriesEndDt"))
-
-                # Use seriesType, else fallback to matchFormat
-                stype = info.get("seriesType") or info.get("matchFormat")
-
-                if sid:
-                    cur.execute("""
-                        INSERT INTO series (series_id, name, type, start_date, end_date)
-                        VALUES (%s,%s,%s,%s,%s)
-                        ON DUPLICATE KEY UPDATE
-                            name=VALUES(name),
-                            type=VALUES(type),
-                            start_date=VALUES(start_date),
-                            end_date=VALUES(end_date)
-                    """, (sid, sname, stype, sstart, send))
-                    series_count += 1
-
-                # --- MATCH INSERT ---
-                mid = safe_int(info.get("matchId"))
-                if not mid:
-                    continue
-                mdesc = info.get("matchDesc")
-                mformat = info.get("matchFormat")
-                mstart = epoch_to_datetime(info.get("startDate"))
-                mend = epoch_to_datetime(info.get("endDate"))
-                state = info.get("state")
-                status = info.get("status")
-                vid = None
-                venue_info = info.get("venueInfo")
-                if venue_info:
-                    vid = safe_int(venue_info.get("id"))
-
-                cur.execute("""
-                    INSERT INTO matches (match_id, series_id, name, format, start_date, end_date, state, status, venue_id)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                    ON DUPLICATE KEY UPDATE
-                        series_id=VALUES(series_id),
-                        name=VALUES(name),
-                        format=VALUES(format),
-                        start_date=VALUES(start_date),
-                        end_date=VALUES(end_date),
-                        state=VALUES(state),
-                        status=VALUES(status),
-                        venue_id=VALUES(venue_id)
-                """, (mid, sid, mdesc, mformat, mstart, mend, state, status, vid))
-                match_count += 1
-
-                # --- match_teams ---
-                for side in ("team1", "team2"):
-                    t = info.get(side) or {}
-                    tid = safe_int(t.get("teamId"))
-                    if tid:
-                        cur.execute("""
-                            INSERT IGNORE INTO match_teams (match_id, team_id, team_role)
-                            VALUES (%s,%s,%s)
-                        """, (mid, tid, side))
-                        mt_teams += 1
-
-    conn.commit()
-    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cur.close()
-    conn.close()
-
-    print(f"✅ Series inserted")
-    print(f"✅ Matches inserted")
-    print(f"✅ Match Teams inserted")
-    if mt_scores:
-        print(f"✅ match_scores inserts: {mt_scores}")
+            cursor.execute("""
+                INSERT INTO players (player_id, name, country_id, role_id, bat_style_id, bowl_style_id)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    name = VALUES(name),
+                    country_id = VALUES(country_id),
+                    role_id = VALUES(role_id),
+                    bat_style_id = VALUES(bat_style_id),
+                    bowl_style_id = VALUES(bowl_style_id)
+            """, (
+                player_id,
+                p.name,
+                dims.id("country", p.team_name),
+                dims.id("role", p.role),
+                dims.id("bat_style", p.batting_style),
+                dims.id("bowl_style", p.bowling_style),
+            ))
 
+            cursor.execute("""
+                INSERT INTO match_roster
+                    (match_id, team_id, player_id, player_name, full_name, nick_name,
+                    role, batting_style, bowling_style, face_image_id,
+                    is_captain, is_keeper, is_substitute)
+                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                ON DUPLICATE KEY UPDATE
+                    player_name=VALUES(player_name),
+                    full_name=VALUES(full_name),
+                    nick_name=VALUES(nick_name),
+                    role=VALUES(role),
+                    batting_style=VALUES(batting_style),
+                    bowling_style=VALUES(bowling_style),
+                    face_image_id=VALUES(face_image_id),
+                    is_captain=VALUES(is_captain),
+                    is_keeper=VALUES(is_keeper),
+                    is_substitute=VALUES(is_substitute)
+            """, (
+                match_id,
+                team_id,
+                player_id,
+                p.name,
+                p.full_name,
+                p.nick_name,
+                p.role,
+                p.batting_style,
+                p.bowling_style,
+                p.face_image_id,
+                p.captain,
+                p.keeper,
+                p.substitute
+            ))
+    return safe_int(match_id)
+
+def write_batting_stats(cursor, dims, player_id, data):
+    """Upsert one player's batting stats grid (one row per format)."""
+    # each format (Test, ODI, T20, IPL, etc.)
+    for fmt, stats in decode_grid(data).items():
+        format_id = dims.id("format", fmt)
+        if format_id is None:
+            continue
+        highest_runs, highest_not_out = parse_highest(stats.get("Highest"))
 
+        cursor.execute("""
+            INSERT INTO player_stats
+            (player_id, format_id, matches, innings, runs, balls, highest,
+            average, strike_rate, not_outs, fours, sixes, ducks,
+            fifties, hundreds, double_hundreds, triple_hundreds, quadruple_hundreds,
+            highest_runs, highest_not_out)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE
+                matches=VALUES(matches), innings=VALUES(innings),
+                runs=VALUES(runs), balls=VALUES(balls), highest=VALUES(highest),
+                average=VALUES(average), strike_rate=VALUES(strike_rate),
+                not_outs=VALUES(not_outs), fours=VALUES(fours), sixes=VALUES(sixes),
+                ducks=VALUES(ducks), fifties=VALUES(fifties), hundreds=VALUES(hundreds),
+                double_hundreds=VALUES(double_hundreds),
+                triple_hundreds=VALUES(triple_hundreds),
+                quadruple_hundreds=VALUES(quadruple_hundreds),
+                highest_runs=VALUES(highest_runs),
+                highest_not_out=VALUES(highest_not_out)
+        """, (
+            player_id, format_id,
+            safe_int(stats.get("Matches")),
+            safe_int(stats.get("Innings")),
+            safe_int(stats.get("Runs")),
+            safe_int(stats.get("Balls")),
+            stats.get("Highest"),
+            safe_float(stats.get("Average")),
+            safe_float(stats.get("SR")),
+            safe_int(stats.get("Not Out")),
+            safe_int(stats.get("Fours")),
+            safe_int(stats.get("Sixes")),
+            safe_int(stats.get("Ducks")),
+            safe_int(stats.get("50s")),
+            safe_int(stats.get("100s")),
+            safe_int(stats.get("200s")),
+            safe_int(stats.get("300s")),
+            safe_int(stats.get("400s")),
+            highest_runs,
+            highest_not_out
+        ))
 
-def load_match_details():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+def write_bowling_stats(cursor, dims, player_id, data):
+    """Upsert one player's bowling stats grid (one row per format)."""
+    for fmt, vals in decode_grid(data).items():
+        format_id = dims.id("format", fmt)
+        if format_id is None:
+            continue
+        bbi_wickets, bbi_runs = parse_best_bowling(vals.get("BBI"))
+        bbm_wickets, bbm_runs = parse_best_bowling(vals.get("BBM"))
+        cursor.execute("""
+            INSERT INTO player_bowling_stats
+            (player_id, format_id, matches, innings, balls, runs, maidens,
+            wickets, average, economy, strike_rate,
+            best_bowling_innings, best_bowling_match,
+            four_wickets, five_wickets, ten_wickets,
+            bbi_wickets, bbi_runs, bbm_wickets, bbm_runs)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            ON DUPLICATE KEY UPDATE
+                matches=VALUES(matches),
+                innings=VALUES(innings),
+                balls=VALUES(balls),
+                runs=VALUES(runs),
+                maidens=VALUES(maidens),
+                wickets=VALUES(wickets),
+                average=VALUES(average),
+                economy=VALUES(economy),
+                strike_rate=VALUES(strike_rate),
+                best_bowling_innings=VALUES(best_bowling_innings),
+                best_bowling_match=VALUES(best_bowling_match),
+                four_wickets=VALUES(four_wickets),
+                five_wickets=VALUES(five_wickets),
+                ten_wickets=VALUES(ten_wickets),
+                bbi_wickets=VALUES(bbi_wickets),
+                bbi_runs=VALUES(bbi_runs),
+                bbm_wickets=VALUES(bbm_wickets),
+                bbm_runs=VALUES(bbm_runs)
+        """, (
+            player_id, format_id,
+            safe_int(vals.get("Matches")),
+            safe_int(vals.get("Innings")),
+            safe_int(vals.get("Balls")),
+            safe_int(vals.get("Runs")),
+            safe_int(vals.get("Maidens")),
+            safe_int(vals.get("Wickets")),
+            safe_float(vals.get("Avg")),
+            safe_float(vals.get("Eco")),
+            safe_float(vals.get("SR")),
+            vals.get("BBI"),
+            vals.get("BBM"),
+            safe_int(vals.get("4w")),
+            safe_int(vals.get("5w")),
+            safe_int(vals.get("10w")),
+            bbi_wickets, bbi_runs,
+            bbm_wickets, bbm_runs
+        ))
 
-    results_count = toss_count = officials_count = awards_count = roster_count = 0
 
-    for fname in os.listdir(CACHE_DIR):
-        if not fname.startswith("match_") or not fname.endswith("_info.json"):
-            continue
+# ----------------------
+# Loaders
+# ----------------------
 
-        path = os.path.join(CACHE_DIR, fname)
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+# One unreadable or malformed cache file is skipped, not the whole load
+def load_payload(path, payload_type):
+    """STATS.load() that warns and returns None for a missing or malformed file."""
+    try:
+        return STATS.load(path, payload_type)
+    except (OSError, payloads.PayloadError) as e:
+        print(f"⚠️ Skipping {e}")
+        return None
 
-        mi = data.get("matchInfo", {})
-        match_id = mi.get("matchId")
-        if not match_id:
-            continue
+def load_teams():
+    data = load_payload(os.path.join(CACHE_DIR, "teams_list.json"), payloads.TeamsList)
+    if data is None:
+        return
 
-        # --- Match Result ---
-        result = mi.get("result")
-        if result:
-            cursor.execute("""
-                INSERT INTO match_result (match_id, result_type, winning_team, winning_team_id,
-                                        winning_margin, win_by_runs, win_by_innings)
-                VALUES (%s,%s,%s,%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE result_type=VALUES(result_type),
-                                        winning_team=VALUES(winning_team),
-                                        winning_team_id=VALUES(winning_team_id),
-                                        winning_margin=VALUES(winning_margin),
-                                        win_by_runs=VALUES(win_by_runs),
-                                        win_by_innings=VALUES(win_by_innings)
-            """, (
-                match_id,
-                result.get("resultType"),
-                result.get("winningTeam"),
-                result.get("winningteamId"),
-                result.get("winningMargin"),
-                result.get("winByRuns"),
-                result.get("winByInnings")
-            ))
-            results_count += cursor.rowcount
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for team in data.teams:
+            write_team(cursor, team)
 
-        # --- Toss ---
-        toss = mi.get("tossResults")
-        if toss:
-            cursor.execute("""
-                INSERT INTO match_toss (match_id, toss_winner_id, toss_winner_name, decision)
-                VALUES (%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE toss_winner_id=VALUES(toss_winner_id),
-                                        toss_winner_name=VALUES(toss_winner_name),
-                                        decision=VALUES(decision)
-            """, (
-                match_id,
-                toss.get("tossWinnerId"),
-                toss.get("tossWinnerName"),
-                toss.get("decision")
-            ))
-            toss_count += cursor.rowcount
-
-        # --- Officials ---
-        columns = {
-            "umpire1": ("umpire1_id", "umpire1_name", "umpire1_country"),
-            "umpire2": ("umpire2_id", "umpire2_name", "umpire2_country"),
-            "umpire3": ("umpire3_id", "umpire3_name", "umpire3_country"),
-            "referee": ("referee_id", "referee_name", "referee_country"),
-        }
-        for role in ["umpire1", "umpire2", "umpire3", "referee"]:
-            official = mi.get(role)
-            if official:
-                id_col, name_col, country_col = columns[role]
-
-                cursor.execute(f"""
-                    INSERT INTO match_officials (match_id, {id_col}, {name_col}, {country_col})
-                    VALUES (%s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE
-                        {id_col} = VALUES({id_col}),
-                        {name_col} = VALUES({name_col}),
-                        {country_col} = VALUES({country_col})
-                """, (
-                    match_id,
-                    official.get("id"),
-                    official.get("name"),
-                    official.get("country")
-                ))
-                officials_count += cursor.rowcount
-
-        # --- Awards ---
-        for p in mi.get("playersOfTheMatch", []):
-            cursor.execute("""
-                INSERT INTO match_awards (match_id, award_type, player_id, player_name, team_name)
-                VALUES (%s,%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE player_name=VALUES(player_name),
-                                        team_name=VALUES(team_name)
-            """, (
-                match_id, "PlayerOfMatch",
-                p.get("id"), p.get("fullName") or p.get("name"), p.get("teamName")
-            ))
-            awards_count += cursor.rowcount
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    print("✅ Teams loaded")
 
-        for p in mi.get("playersOfTheSeries", []):
-            cursor.execute("""
-                INSERT INTO match_awards (match_id, award_type, player_id, player_name, team_name)
-                VALUES (%s,%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE player_name=VALUES(player_name),
-                                        team_name=VALUES(team_name)
-            """, (
-                match_id, "PlayerOfSeries",
-                p.get("id"), p.get("fullName") or p.get("name"), p.get("teamName")
-            ))
-            awards_count += cursor.rowcount
+def load_players():
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        dims = DimensionCache(cursor)
 
-        # --- Roster (players & staff) ---
-        for team_key in ["team1", "team2"]:
-            team = mi.get(team_key)
-            if not team:
+        for fname in os.listdir(CACHE_DIR):
+            if not fname.startswith("player_") or not fname.endswith("_info.json"):
                 continue
-            team_id = team.get("id")
-            for p in team.get("playerDetails", []):
-                player_id = p.get("id")
-                if not player_id:
-                    continue
+            info = load_payload(os.path.join(CACHE_DIR, fname), payloads.PlayerInfo)
+            if info is not None:
+                write_player(cursor, dims, info)
 
-                cursor.execute("""
-                    INSERT INTO players (player_id, name, country, role, bat_style, bowl_style)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE
-                        name = VALUES(name),
-                        country = VALUES(country),
-                        role = VALUES(role),
-                        bat_style = VALUES(bat_style),
-                        bowl_style = VALUES(bowl_style)
-                """, (
-                    player_id,
-                    p.get("name"),
-                    p.get("teamName"),
-                    p.get("role"),
-                    p.get("battingStyle"),
-                    p.get("bowlingStyle"),
-                ))
-
-                cursor.execute("""
-                    INSERT INTO match_roster
-                        (match_id, team_id, player_id, player_name, full_name, nick_name,
-                        role, batting_style, bowling_style, face_image_id,
-                        is_captain, is_keeper, is_substitute)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                    ON DUPLICATE KEY UPDATE
-                        player_name=VALUES(player_name),
-                        full_name=VALUES(full_name),
-                        nick_name=VALUES(nick_name),
-                        role=VALUES(role),
-                        batting_style=VALUES(batting_style),
-                        bowling_style=VALUES(bowling_style),
-                        face_image_id=VALUES(face_image_id),
-                        is_captain=VALUES(is_captain),
-                        is_keeper=VALUES(is_keeper),
-                        is_substitute=VALUES(is_substitute)
-                """, (
-                    match_id,
-                    team_id,
-                    player_id,
-                    p.get("name"),
-                    p.get("fullName"),
-                    p.get("nickName"),
-                    p.get("role"),
-                    p.get("battingStyle"),
-                    p.get("bowlingStyle"),
-                    p.get("faceImageId"),
-                    p.get("captain", False),
-                    p.get("keeper", False),
-                    p.get("substitute", False)
-                ))
-                roster_count += cursor.rowcount
-
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-
-    print("✅ Match Details inserted")
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    print("✅ Players loaded")
 
-def load_player_stats():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+def load_venues():
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for fname in os.listdir(CACHE_DIR):
+            if not fname.startswith("venue_") or not fname.endswith("_info.json"):
+                continue
+            vid = int(fname.split("_")[1])
+            info = load_payload(os.path.join(CACHE_DIR, fname), payloads.VenueInfo)
+            if info is not None:
+                write_venue(cursor, vid, info)
+
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    print("✅ Venues loaded")
 
-    for fname in os.listdir(CACHE_DIR):
-        if not fname.startswith("player_") or not fname.endswith("_batting.json"):
-            continue
+def load_series_and_matches():
+    files = glob(os.path.join(CACHE_DIR, "series_*_matches.json"))
+    if not files:
+        print("⚠️ No series_*_matches.json files found in cache.")
+        return set()
+
+    with get_pool().connection() as conn:
+        cur = STATS.cursor(conn)
+        cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+        dims = DimensionCache(cur)
+        # only matches whose aggregated columns changed need re-aggregating
+        before = match_inputs(cur, ("matches", "match_teams"))
+        written = set()
+
+        for path in files:
+            data = load_payload(path, payloads.SeriesMatches)
+            if data is None:
+                continue
 
-        # Extract player_id from filename
-        try:
-            player_id = int(fname.split("_")[1])
-        except:
-            continue
+            for detail in data.match_details:
+                if not detail.match_details_map:
+                    continue
 
-        path = os.path.join(CACHE_DIR, fname)
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+                for m in detail.match_details_map.match:
+                    if not m.match_info:
+                        continue
+                    mid = write_match_info(cur, dims, m.match_info)
+                    if mid:
+                        written.add(mid)
 
-        headers = data.get("headers", [])[1:]   # skip "ROWHEADER"
-        rows = data.get("values", [])
+        touched = changed_matches(before, match_inputs(cur, ("matches", "match_teams")), written)
+        conn.commit()
+        cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cur.close()
 
-        for i, fmt in enumerate(headers):       # each format (Test, ODI, T20, IPL, etc.)
-            fmt = fmt.strip()
-            stats = {r["values"][0]: r["values"][i+1] for r in rows}
+    print(f"✅ Series inserted")
+    print(f"✅ Matches inserted ({len(touched)} of {len(written)} matches changed)")
+    print(f"✅ Match Teams inserted")
+    return touched
 
-            cursor.execute("""
-                INSERT INTO player_stats
-                (player_id, format, matches, innings, runs, balls, highest,
-                average, strike_rate, not_outs, fours, sixes, ducks,
-                fifties, hundreds, double_hundreds, triple_hundreds, quadruple_hundreds)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE
-                    matches=VALUES(matches), innings=VALUES(innings),
-                    runs=VALUES(runs), balls=VALUES(balls), highest=VALUES(highest),
-                    average=VALUES(average), strike_rate=VALUES(strike_rate),
-                    not_outs=VALUES(not_outs), fours=VALUES(fours), sixes=VALUES(sixes),
-                    ducks=VALUES(ducks), fifties=VALUES(fifties), hundreds=VALUES(hundreds),
-                    double_hundreds=VALUES(double_hundreds),
-                    triple_hundreds=VALUES(triple_hundreds),
-                    quadruple_hundreds=VALUES(quadruple_hundreds)
-            """, (
-                player_id, fmt,
-                safe_int(stats.get("Matches")),
-                safe_int(stats.get("Innings")),
-                safe_int(stats.get("Runs")),
-                safe_int(stats.get("Balls")),
-                stats.get("Highest"),
-                safe_float(stats.get("Average")),
-                safe_float(stats.get("SR")),
-                safe_int(stats.get("Not Out")),
-                safe_int(stats.get("Fours")),
-                safe_int(stats.get("Sixes")),
-                safe_int(stats.get("Ducks")),
-                safe_int(stats.get("50s")),
-                safe_int(stats.get("100s")),
-                safe_int(stats.get("200s")),
-                safe_int(stats.get("300s")),
-                safe_int(stats.get("400s"))
-            ))
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-    print("✅ Player stats inserted")
 
-def load_player_bowling_stats():
-    from glob import glob
+def load_match_details():
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        dims = DimensionCache(cursor)
+        before = match_inputs(cursor, ("match_result", "match_toss"))
+        written = set()
+
+        for fname in os.listdir(CACHE_DIR):
+            if not fname.startswith("match_") or not fname.endswith("_info.json"):
+                continue
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            data = load_payload(os.path.join(CACHE_DIR, fname), payloads.MatchCenter)
+            if data is None:
+                continue
+            match_id = write_match_details(cursor, dims, data.match_info)
+            if match_id:
+                written.add(match_id)
 
-    files = glob(os.path.join(CACHE_DIR, "player_*_bowling.json"))
+        touched = changed_matches(before, match_inputs(cursor, ("match_result", "match_toss")), written)
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
 
-    inserted = 0
-    for fpath in files:
-        player_id = int(os.path.basename(fpath).split("_")[1])
-        with open(fpath, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    print(f"✅ Match Details inserted ({len(touched)} of {len(written)} matches changed)")
+    return touched
 
-        headers = data.get("headers", [])[1:]
-        rows = data.get("values", [])
+def load_player_stats():
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        dims = DimensionCache(cursor)
 
-        stats = {fmt: {} for fmt in headers}
+        for fname in os.listdir(CACHE_DIR):
+            if not fname.startswith("player_") or not fname.endswith("_batting.json"):
+                continue
 
-        for row in rows:
-            values = row.get("values", [])
-            if not values:
+            # Extract player_id from filename
+            try:
+                player_id = int(fname.split("_")[1])
+            except:
                 continue
-            metric = values[0]
-            for i, fmt in enumerate(headers, start=1):
-                stats[fmt][metric] = values[i]
 
-        for fmt, vals in stats.items():
-            cursor.execute("""
-                INSERT INTO player_bowling_stats
-                (player_id, format, matches, innings, balls, runs, maidens,
-                wickets, average, economy, strike_rate,
-                best_bowling_innings, best_bowling_match,
-                four_wickets, five_wickets, ten_wickets)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ON DUPLICATE KEY UPDATE
-                    matches=VALUES(matches),
-                    innings=VALUES(innings),
-                    balls=VALUES(balls),
-                    runs=VALUES(runs),
-                    maidens=VALUES(maidens),
-                    wickets=VALUES(wickets),
-                    average=VALUES(average),
-                    economy=VALUES(economy),
-                    strike_rate=VALUES(strike_rate),
-                    best_bowling_innings=VALUES(best_bowling_innings),
-                    best_bowling_match=VALUES(best_bowling_match),
-                    four_wickets=VALUES(four_wickets),
-                    five_wickets=VALUES(five_wickets),
-                    ten_wickets=VALUES(ten_wickets)
-            """, (
-                player_id, fmt,
-                safe_int(vals.get("Matches")),
-                safe_int(vals.get("Innings")),
-                safe_int(vals.get("Balls")),
-                safe_int(vals.get("Runs")),
-                safe_int(vals.get("Maidens")),
-                safe_int(vals.get("Wickets")),
-                safe_float(vals.get("Avg")),
-                safe_float(vals.get("Eco")),
-                safe_float(vals.get("SR")),
-                vals.get("BBI"),
-                vals.get("BBM"),
-                safe_int(vals.get("4w")),
-                safe_int(vals.get("5w")),
-                safe_int(vals.get("10w"))
-            ))
-            inserted += 1
+            data = load_payload(os.path.join(CACHE_DIR, fname), payloads.StatsGrid)
+            if data is not None:
+                write_batting_stats(cursor, dims, player_id, data)
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    print("✅ Player stats inserted")
 
-    print(f"✅ Bowling Stats inserted")
+def load_player_bowling_stats():
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        dims = DimensionCache(cursor)
 
+        for fpath in glob(os.path.join(CACHE_DIR, "player_*_bowling.json")):
+            player_id = int(os.path.basename(fpath).split("_")[1])
+            data = load_payload(fpath, payloads.StatsGrid)
+            if data is not None:
+                write_bowling_stats(cursor, dims, player_id, data)
 
-def load_scorecards():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
 
-    files = glob(os.path.join(CACHE_DIR, "match_*_scorecard.json"))
-    inserted = 0
+    print(f"✅ Bowling Stats inserted")
 
-    for fpath in files:
-        with open(fpath, "r", encoding="utf-8") as f:
-            sc = json.load(f)
 
-        mid = safe_int(sc.get("matchId"))
-        if not mid:
-            mid = safe_int(re.search(r"match_(\d+)_", fpath).group(1))
-        if not mid:
-            continue
+def load_scorecards(removed=None):
+    """Apply every cached scorecard as a delta; player ids of deleted rows go into `removed`."""
+    from utils.scorecard_delta import apply_scorecard
 
-        for inng in sc.get("scorecard", []):
-            iid = safe_int(inng.get("inningsid"))
+    with get_pool().connection() as conn:
+        cursor = STATS.cursor(conn)
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
 
-            # 🏏 Batting
-            for b in inng.get("batsman", []):
-                pid = safe_int(b.get("id"))
-                if not pid:
-                    continue
+        files = glob(os.path.join(CACHE_DIR, "match_*_scorecard.json"))
+        inserted = 0
+        touched = set()
+        # fact rows carry their match's year (the partition key on MySQL)
+        years = match_years(cursor)
 
-                try:
-                    cursor.execute("""
-                        INSERT IGNORE INTO match_batting
-                        (match_id, innings_id, batsman_id, player_name, runs, balls, fours, sixes,
-                        strike_rate, dismissal)
-                        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                        ON DUPLICATE KEY UPDATE player_name=VALUES(player_name)
-                    """, (
-                        mid, iid, pid,
-                        b.get("name"), safe_int(b.get("runs")), safe_int(b.get("balls")),
-                        safe_int(b.get("fours")), safe_int(b.get("sixes")),
-                        safe_float(b.get("strkrate")), b.get("outdec")
-                    ))
-                except mysql.connector.IntegrityError:
-                    continue
+        for fpath in files:
+            sc = load_payload(fpath, payloads.Scorecard)
+            if sc is None:
+                continue
 
-            # 🎯 Bowling
-            for bow in inng.get("bowler", []):
-                pid = safe_int(bow.get("id"))
-                if not pid:
-                    continue
+            mid = safe_int(sc.match_id)
+            if not mid:
+                mid = safe_int(re.search(r"match_(\d+)_", fpath).group(1))
+            if not mid:
+                continue
 
-                try:
-                    cursor.execute("""
-                        INSERT IGNORE INTO match_bowling
-                        (match_id, innings_id, bowler_id, player_name, overs, maidens, runs, wickets, economy, balls)
-                        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                        ON DUPLICATE KEY UPDATE player_name=VALUES(player_name)
-                    """, (
-                        mid, iid, pid,
-                        bow.get("name"), 
-                        safe_float(bow.get("overs")), 
-                        safe_int(bow.get("maidens")),
-                        safe_int(bow.get("runs")), 
-                        safe_int(bow.get("wickets")),
-                        safe_float(bow.get("economy")), 
-                        safe_int(bow.get("balls"))
-                    ))
-                except mysql.connector.IntegrityError:
-                    continue
+            # only rows that are new or differ from the stored ones are written
+            changes = apply_scorecard(cursor, sc, mid, years.get(mid, 0), removed)
+            if any(up or dele for up, dele in changes.values()):
+                touched.add(mid)
+            inserted += 1
 
-            # Fall of Wickets
-            for idx, fow in enumerate(inng.get("fow", {}).get("fow", []), start=1):
-                pid = safe_int(fow.get("batsmanid"))
-                if not pid:
-                    continue
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+    print(f"✅ Match Scorecards inserted ({len(touched)} of {inserted} matches changed)")
+    return touched
 
-                try:
-                    cursor.execute("""
-                        INSERT IGNORE INTO match_fow
-                        (match_id, innings_id, fow_order, batsman_id, player_name, score, overs)
-                        VALUES (%s,%s,%s,%s,%s,%s,%s)
-                        ON DUPLICATE KEY UPDATE player_name=VALUES(player_name)
-                    """, (
-                        mid, iid, idx, pid,
-                        str(fow.get("batsmanname")), str(fow.get("runs")), str(fow.get("overnbr"))
-                    ))
-                except mysql.connector.IntegrityError:
-                    continue
 
-        inserted += 1
+def load_all():
+    """Run every loader in dependency order, then refresh the summary tables."""
+    touched = set()
+    for loader in (load_teams, load_players, load_venues, load_series_and_matches, load_match_details,
+                   load_player_stats, load_player_bowling_stats):
+        with STATS.stage(loader.__name__):
+            touched |= loader() or set()
+    removed = {}
+    with STATS.stage("load_scorecards"):
+        touched |= load_scorecards(removed)
 
-    conn.commit()
-    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-    cursor.close()
-    conn.close()
-    print(f"✅ Match Scorecards inserted")
+    with STATS.stage("refresh_aggregates"):
+        with get_pool().connection() as conn:
+            refresh_aggregates(touched, STATS.connection(conn), removed)
+            # warmed by the caller once live (it may be a blue-green shadow)
+            bump_data_version(conn)
+    return touched
 
 
 
@@ -727,13 +753,48 @@ def load_scorecards():
 # Main
 # ----------------------
 if __name__ == "__main__":
-    load_teams()
-    load_players()
-    load_venues()
-    load_series_and_matches()
-    load_match_details()
-    load_player_stats()
-    load_player_bowling_stats()
-    load_scorecards()
+    parser = argparse.ArgumentParser(description="Load cached Cricbuzz data into the database")
+    parser.add_argument("--snapshot", action="store_true", help="Export Parquet snapshots after loading")
+    parser.add_argument("--blue-green", action="store_true",
+                        help="Load into shadow tables, validate them and swap them in atomically")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run each loader under cProfile (utils/logs/profile_<loader>_<timestamp>.prof)")
+    parser.add_argument("--stats-report", default=None,
+                        help="Path of the JSON timing report (default: utils/logs/load_stats_<timestamp>.json)")
+    parser.add_argument("--warm", action="store_true",
+                        help="Warm the result cache (RESULT_CACHE_PATH) with every catalog query afterwards")
+    args = parser.parse_args()
+    STATS.profile = args.profile
+
+    if storage.is_embedded():
+        storage.init_schema()
+    apply_migrations()
+    ensure_partitions()
+
+    # the new data version is warmed in the background (cache_warmer.after_bump)
+    # once it is live; --warm warms in the foreground instead, with a report
+    if args.blue_green:
+        from utils.table_swap import blue_green_load
+        blue_green_load(load_all, warm=not args.warm)
+    else:
+        load_all()
+        if not args.warm:
+            from utils import cache_warmer
+            cache_warmer.after_bump(get_pool())
     print("🎉 Full data load complete (all tables)")
+    STATS.print_summary()
+    for name, pool in db_pool.pool_stats().items():
+        print(f"⏱️ Pool {name}: {pool['created']} connections for {pool['acquired']} checkouts "
+              f"(peak {pool['peak_in_use']}/{pool['size']} in use)")
+    print(f"✅ Load stats written to {STATS.write_report(args.stats_report)}")
+
+    if args.snapshot:
+        from utils.snapshot import export_snapshot
+        export_snapshot()
+
+    if args.warm:
+        from utils import cache_warmer
+        results = cache_warmer.warm(get_pool())
+        cache_warmer.print_report(results)
+        print(f"✅ Warm-up report written to {cache_warmer.write_report(results)}")
 
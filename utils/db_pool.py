@@ -0,0 +1,292 @@
+import argparse
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from utils import query_exec, storage
+
+# ----------------------
+# Connection pool
+# ----------------------
+# Loaders and pages borrow connections from a pool instead of opening one
+# per loader / per Streamlit rerun, so the MySQL handshake and auth are paid
+# once per connection, not once per query.
+#
+#   pool = get_pool(database="cricbuzz_db")
+#   with pool.connection() as conn:          # or conn = pool.acquire(); conn.close()
+#       pd.read_sql(sql, conn)
+#
+# A borrowed connection's close() hands it back. On return any open
+# transaction is rolled back and, on MySQL, the session is reset
+# (COM_RESET_CONNECTION: session variables such as FOREIGN_KEY_CHECKS or
+# MAX_EXECUTION_TIME, user variables, temporary tables), so the next
+# borrower starts clean and sees fresh loads; a connection that cannot be
+# reset is discarded. Prefer `with pool.connection()` so a failing caller
+# still hands its connection back.
+# Idle connections are pinged before reuse (when idle longer than
+# ping_after) and replaced after `recycle` seconds, well inside MySQL's
+# wait_timeout. acquire() waits up to `timeout` seconds when all `size`
+# connections are busy and then raises PoolTimeout.
+#
+# Sizing: DB_POOL_SIZE (default 5) and DB_POOL_TIMEOUT (default 30 s).
+# Works on every storage backend; on DuckDB / SQLite it saves re-opening
+# the file and re-reading primary keys.
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool timeout."""
+
+
+class PooledConnection:
+    """A borrowed connection; close() returns it to the pool."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    @property
+    def raw(self):
+        """The underlying driver connection (None once returned)."""
+        return self._conn
+
+    def is_connected(self):
+        return self._conn is not None and self._conn.is_connected()
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise AttributeError(f"{name}: connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ConnectionPool:
+    """Fixed-size, thread-safe pool of storage.connect() connections."""
+
+    def __init__(self, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, recycle=1800, ping_after=30,
+                 connect_timeout=10, **connect_kwargs):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.connect_kwargs = dict(connect_kwargs)
+        if not storage.is_embedded() and connect_timeout:
+            self.connect_kwargs.setdefault("connection_timeout", connect_timeout)
+        self.backend = storage.DB_BACKEND
+        self.path = storage.DB_PATH
+
+        self._lock = threading.Condition()
+        self._idle = []                  # [(conn, created_at, returned_at)]
+        self._created_at = {}            # id(conn) -> created_at
+        self._in_use = 0
+        self._closed = False
+        self._metrics = {"created": 0, "acquired": 0, "reused": 0, "discarded": 0, "waits": 0,
+                         "timeouts": 0, "wait_s": 0.0, "max_wait_s": 0.0, "peak_in_use": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def _connect(self):
+        conn = storage.connect(backend=self.backend, path=self.path, **self.connect_kwargs)
+        self._created_at[id(conn)] = time.monotonic()
+        self._count("created")
+        return conn
+
+    def _healthy(self, conn, created_at, returned_at):
+        now = time.monotonic()
+        if self.recycle and now - created_at > self.recycle:
+            return False
+        if now - returned_at < self.ping_after:
+            return True
+        try:
+            # mysql.connector pings the server here
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        self._count("discarded")
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        """Borrow a connection (PooledConnection); waits up to `timeout` seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        with self._lock:
+            if self._closed:
+                raise PoolTimeout("pool is closed")
+            waited = False
+            while not self._idle and self._in_use >= self.size:
+                waited = True
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0 or not self._lock.wait(remaining):
+                    if not self._idle and self._in_use >= self.size:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeout(f"no free connection after {timeout}s ({self.size} in use)")
+            if waited:
+                wait = time.monotonic() - start
+                self._metrics["waits"] += 1
+                self._metrics["wait_s"] += wait
+                self._metrics["max_wait_s"] = max(self._metrics["max_wait_s"], wait)
+            candidate = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            self._metrics["acquired"] += 1
+            self._metrics["peak_in_use"] = max(self._metrics["peak_in_use"], self._in_use)
+
+        # connect / health-check outside the lock
+        try:
+            if candidate is not None:
+                conn, created_at, returned_at = candidate
+                if self._healthy(conn, created_at, returned_at):
+                    self._count("reused")
+                    return PooledConnection(self, conn)
+                self._discard(conn)
+            return PooledConnection(self, self._connect())
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+    def _reset(self, conn):
+        conn.rollback()
+        if not storage.is_embedded(self.backend):
+            # the reset frees the server-side prepared statements, so the
+            # cursors query_exec cached for them must go first
+            query_exec.discard_prepared(conn)
+            # mysql.connector: COM_RESET_CONNECTION (COM_CHANGE_USER on old servers)
+            conn.reset_session()
+
+    def release(self, conn):
+        """Return a raw connection (called by PooledConnection.close)."""
+        try:
+            self._reset(conn)
+            healthy = not self._closed
+        except Exception:
+            healthy = False
+        with self._lock:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((conn, self._created_at.get(id(conn), time.monotonic()), time.monotonic()))
+            self._lock.notify()
+        if not healthy:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self):
+        """Close idle connections; busy ones are closed when they come back."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Utilisation metrics: sizes, reuse and wait counters."""
+        with self._lock:
+            stats = dict(self._metrics, size=self.size, in_use=self._in_use, idle=len(self._idle))
+        stats["utilization"] = round(stats["in_use"] / self.size, 2) if self.size else None
+        stats["reuse_ratio"] = round(stats["reused"] / stats["acquired"], 2) if stats["acquired"] else None
+        stats["wait_s"] = round(stats["wait_s"], 4)
+        stats["max_wait_s"] = round(stats["max_wait_s"], 4)
+        return stats
+
+
+# ----------------------
+# Shared pools
+# ----------------------
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _key(connect_kwargs):
+    if storage.is_embedded():
+        return (storage.DB_BACKEND, storage.DB_PATH)
+    return (storage.DB_BACKEND,) + tuple(sorted((k, str(v)) for k, v in connect_kwargs.items() if v not in (None, "")))
+
+
+def get_pool(size=None, timeout=None, **connect_kwargs):
+    """
+    The process-wide pool for this backend / database (created on first use).
+    connect_kwargs are storage.connect()'s MySQL arguments.
+    """
+    key = _key(connect_kwargs)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(size=size or DB_POOL_SIZE, timeout=timeout or DB_POOL_TIMEOUT, **connect_kwargs)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_all():
+    """Close and forget every pool (e.g. after a database file was swapped)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """{pool key: stats()} for every live pool."""
+    with _POOLS_LOCK:
+        return {"/".join(str(part) for part in key): pool.stats() for key, pool in _POOLS.items()}
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the database connection pool")
+    parser.add_argument("--check", action="store_true", help="Borrow every connection once, run SELECT 1 and print pool metrics")
+    args = parser.parse_args()
+
+    if args.check:
+        from utils import db_loader
+
+        pool = get_pool(host=db_loader.DB_HOST, user=db_loader.DB_USER, port=db_loader.DB_PORT,
+                        password=db_loader.DB_PASSWORD, database=db_loader.DB_NAME)
+        start = time.perf_counter()
+        conns = [pool.acquire() for _ in range(pool.size)]
+        opened = time.perf_counter() - start
+        for conn in conns:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+            cur.close()
+            conn.close()
+        start = time.perf_counter()
+        with pool.connection():
+            pass
+        reused = time.perf_counter() - start
+        print(f"✅ {pool.size} connections opened in {opened * 1000:.1f} ms; reuse took {reused * 1000:.3f} ms")
+        for name, value in pool.stats().items():
+            print(f"{name:12} {value}")
+    else:
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,59 @@
+# ----------------------
+# Dimension keys
+# ----------------------
+# Lookup tables from migration 004. Loaders turn the free-text values
+# (format, role, country, batting/bowling style) into small integer keys
+# through a DimensionCache, so each distinct name costs one round trip per
+# load instead of one per row.
+#
+# Names are matched case-insensitively, as MySQL's utf8mb4_unicode_ci UNIQUE
+# key on `name` would, so every backend gives "TEST" and "Test" one key.
+# Format names are stored upper-case: the match feeds send "TEST" and the
+# stats grids "Test", and neither should win by load order.
+
+DIMENSIONS = {
+    "format": ("dim_format", "format_id"),
+    "role": ("dim_role", "role_id"),
+    "country": ("dim_country", "country_id"),
+    "bat_style": ("dim_bat_style", "bat_style_id"),
+    "bowl_style": ("dim_bowl_style", "bowl_style_id"),
+}
+
+# Spelling stored for a name, per dimension (others keep the first one seen)
+NORMALIZE = {
+    "format": str.upper,
+}
+
+
+class DimensionCache:
+    """name -> surrogate key for every dimension, filled from the database on first use."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self._ids = {}
+
+    def _preload(self, dim):
+        table, key = DIMENSIONS[dim]
+        self.cursor.execute(f"SELECT name, {key} FROM {table} ORDER BY {key}")
+        ids = self._ids[dim] = {}
+        for name, id_ in self.cursor.fetchall():
+            ids.setdefault(name.casefold(), id_)
+
+    def id(self, dim, name):
+        """Key for `name` in `dim`, inserting the name if it is new. Blank -> None."""
+        if name is None:
+            return None
+        name = str(name).strip()
+        if not name:
+            return None
+        name = NORMALIZE.get(dim, str)(name)
+        if dim not in self._ids:
+            self._preload(dim)
+        ids = self._ids[dim]
+        folded = name.casefold()
+        if folded not in ids:
+            table, key = DIMENSIONS[dim]
+            self.cursor.execute(f"INSERT IGNORE INTO {table} (name) VALUES (%s)", (name,))
+            self.cursor.execute(f"SELECT {key} FROM {table} WHERE name = %s", (name,))
+            ids[folded] = self.cursor.fetchone()[0]
+        return ids[folded]
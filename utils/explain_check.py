@@ -0,0 +1,99 @@
+import argparse
+import re
+import sys
+
+from utils import query_catalog, storage
+
+# ----------------------
+# EXPLAIN check for queries.sql
+# ----------------------
+# Runs EXPLAIN on every query in queries.sql and fails when a table is read
+# with a full scan that is not expected. Some queries legitimately read a
+# whole table (e.g. counting every player by role); those are listed below
+# per query, using the table alias EXPLAIN reports.
+
+QUERIES_PATH = query_catalog.QUERIES_PATH
+
+# Small dimension tables that are always fine to scan
+ALWAYS_SCANNED = {"teams", "t"}
+
+EXPECTED_FULL_SCANS = {
+    "Que 5": {"w"},                # one summary row per team
+    "Que 6": {"players"},          # groups every player by role
+    "Que 7": {"mb"},               # max score per format over all innings
+    "Que 8": {"m", "v"},           # host-country subquery groups every match
+    "Que 11": {"p", "mb"},         # every player across formats
+    "Que 12": {"m", "mr", "v", "mt"},
+    "Que 13": {"a"},               # bowler/venue summary rows
+    "Que 14": {"mr"},              # close matches filter on result flags
+    "Que 15": {"a"},               # one summary row per toss decision
+    "Que 16": {"p", "ps"},         # every player's career stats
+}
+
+
+def load_queries(path=QUERIES_PATH):
+    """[(query_id, title, sql, params)] from the query catalog, with default parameters."""
+    return [(q.id, q.title, q.sql, query_catalog.bind(q)) for q in query_catalog.load_catalog(path)]
+
+
+def full_scans(cursor, sql, backend=None, params=None):
+    """Tables (as aliased in the plan) that the query reads with a full scan."""
+    backend = backend or storage.DB_BACKEND
+    if backend == "mysql":
+        cursor.execute(f"EXPLAIN {sql}", params)
+        cols = [d[0] for d in cursor.description]
+        scans = set()
+        for row in cursor.fetchall():
+            r = dict(zip(cols, row))
+            table = r.get("table") or ""
+            if r.get("type") == "ALL" and not table.startswith("<"):
+                scans.add(table)
+        return scans
+    if backend == "sqlite":
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        # SQLite reports scans of materialized CTEs and derived tables under
+        # their name / alias
+        derived = set(re.findall(r"(?:\bWITH|,)\s*(\w+)\s+AS\s*\(", sql, flags=re.I))
+        derived |= set(re.findall(r"\)\s*(?:AS\s+)?(\w+)", sql, flags=re.I))
+        scans = set()
+        for row in cursor.fetchall():
+            detail = row[-1]
+            m = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$", detail)
+            if m and m.group(1) not in derived:
+                scans.add(m.group(2) or m.group(1))
+        return scans
+    raise ValueError(f"EXPLAIN check is not supported on {backend} (columnar scans are its access path)")
+
+
+def run_check(conn=None, path=QUERIES_PATH):
+    """Return {query_id: unexpected full scans} for every query that has any."""
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+    failures = {}
+    for qid, title, sql, params in load_queries(path):
+        scans = full_scans(cur, sql, params=params) - ALWAYS_SCANNED - EXPECTED_FULL_SCANS.get(qid, set())
+        if scans:
+            failures[qid] = scans
+            print(f"❌ {qid} - {title}: full scan on {', '.join(sorted(scans))}")
+        else:
+            print(f"✅ {qid} - {title}")
+    cur.close()
+    if own:
+        conn.close()
+    return failures
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN every query in queries.sql")
+    parser.add_argument("--queries", default=QUERIES_PATH, help="Path to queries.sql")
+    args = parser.parse_args()
+
+    failures = run_check(path=args.queries)
+    if failures:
+        print(f"⚠️ {len(failures)} queries have unexpected full table scans")
+        sys.exit(1)
+    print("🎉 No unexpected full table scans")
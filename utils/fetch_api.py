@@ -2,20 +2,21 @@ import argparse
 import os
 from glob import glob
 from utils.fetch_api_base import fetch_with_cache
-import json
+from utils import payloads
 
 
 # --------------------------
 # Live and Upcoming Matches
 # --------------------------
+# Typed feeds (payloads.MatchesFeed, None when the fetch fails)
 def fetch_live_matches():
-    return fetch_with_cache("matches/v1/live", "matches_live.json")
+    return fetch_with_cache("matches/v1/live", "matches_live.json", payload_type=payloads.MatchesFeed)
 
 def fetch_upcoming_matches():
-    return fetch_with_cache("matches/v1/upcoming", "matches_upcoming.json")
+    return fetch_with_cache("matches/v1/upcoming", "matches_upcoming.json", payload_type=payloads.MatchesFeed)
 
 def fetch_recent_matches():
-    return fetch_with_cache("matches/v1/recent", "matches_recent.json")
+    return fetch_with_cache("matches/v1/recent", "matches_recent.json", payload_type=payloads.MatchesFeed)
 
 # ----------------------
 # Matches
@@ -160,24 +161,18 @@ def fetch_all_players():
     players = []
     for fpath in player_files:
         try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = payloads.load(fpath, payloads.PlayerInfo)
             pid = int(os.path.basename(fpath).split("_")[1])
-            name = data.get("name")
-            country = data.get("country")
-            role = data.get("role")
-            bat_style = data.get("battingStyle")
-            bowl_style = data.get("bowlingStyle")
 
             players.append({
                 "id": pid,
-                "name": name,
-                "country": country,
-                "role": role,
-                "bat_style": bat_style,
-                "bowl_style": bowl_style
+                "name": data.name,
+                "country": data.intl_team,
+                "role": data.role,
+                "bat_style": data.bat,
+                "bowl_style": data.bowl
             })
-        except Exception as e:
+        except (OSError, ValueError) as e:
             print(f"⚠️ Could not parse {fpath}: {e}")
             continue
 
@@ -197,16 +192,13 @@ def fetch_all_player_stats():
 
     for fpath in match_files:
         try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            for tkey in ["team1", "team2"]:
-                team = data.get("matchInfo", {}).get(tkey, {})
-                for p in team.get("playerDetails", []):
-                    pid = p.get("id")
-                    if pid:
-                        player_ids.add(pid)
-        except Exception:
+            mi = payloads.load(fpath, payloads.MatchCenter).match_info
+        except (OSError, payloads.PayloadError):
             continue
+        for team in (mi.team1, mi.team2) if mi else ():
+            for p in team.player_details if team else ():
+                if p.id:
+                    player_ids.add(p.id)
 
     print(f"➡️ Found {len(player_ids)} unique players across all matches")
 
@@ -242,9 +234,9 @@ def fetch_all_stats():
 # ----------------------
 # Scorecards
 # ----------------------
-def fetch_scorecard(match_id):
-    """Fetch full scorecard for a match and cache it."""
-    return fetch_with_cache(f"mcenter/v1/{match_id}/scard", f"match_{match_id}_scorecard.json")
+def fetch_scorecard(match_id, refresh=False):
+    """Fetch full scorecard for a match and cache it (refresh=True re-fetches a cached one)."""
+    return fetch_with_cache(f"mcenter/v1/{match_id}/scard", f"match_{match_id}_scorecard.json", refresh=refresh)
 
 def fetch_all_scorecards():
     """Fetch scorecards for all cached matches."""
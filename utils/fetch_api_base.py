@@ -1,9 +1,11 @@
 import os
-import requests
 import json
 from dotenv import load_dotenv
 from datetime import datetime
+import queue
+import threading
 import time
+from utils import payloads
 
 load_dotenv()
 
@@ -25,17 +27,13 @@ def log_warning(message: str):
         f.write(f"[{timestamp}] {message}\n")
     print(f"⚠️ {message}")
 
-def fetch_with_cache(endpoint, filename, retries=3, backoff=2):
+def request_payload(endpoint, parse, retries=3, backoff=2):
     """
-    Fetch data from API with caching and retry logic.
-    Logs warnings for failures.
+    GET an API endpoint with retry logic.
+    Returns (raw response bytes, parse(raw)), or None on quota / repeated failure.
+    A parse error (bad JSON, PayloadError) counts as a failed attempt.
     """
-    cache_path = os.path.join(CACHE_DIR, filename)
-
-    # ✅ Use cache if already exists
-    if os.path.exists(cache_path):
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    import requests  # imported on first use; cached payloads never need it
 
     url = f"https://{API_HOST}/{endpoint}"
 
@@ -48,16 +46,11 @@ def fetch_with_cache(endpoint, filename, retries=3, backoff=2):
             # Handle quota exceeded
             if response.status_code == 429:
                 log_warning(f"Quota exceeded for {endpoint} (API key ending {API_KEY[-5:]})")
-                return {}
+                return None
 
             response.raise_for_status()
-            data = response.json()
-
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            print(f"✅ Cached {filename}")
-            return data
+            raw = response.content
+            return raw, parse(raw)
 
         except (requests.RequestException, ValueError) as e:
             attempt += 1
@@ -69,4 +62,108 @@ def fetch_with_cache(endpoint, filename, retries=3, backoff=2):
                 time.sleep(wait_time)
             else:
                 log_warning(f"❌ Failed after {retries} attempts: {endpoint}")
-                return {}
\ No newline at end of file
+                return None
+
+
+def fetch_with_cache(endpoint, filename, retries=3, backoff=2, refresh=False, payload_type=None):
+    """
+    Fetch data from API with caching and retry logic.
+    Logs warnings for failures.
+    refresh=True skips the cached copy and overwrites it (live data).
+    payload_type (a utils.payloads struct) returns a typed payload instead of
+    a dict, or None when the fetch fails.
+    """
+    cache_path = os.path.join(CACHE_DIR, filename)
+
+    # ✅ Use cache if already exists
+    if not refresh and os.path.exists(cache_path):
+        if payload_type:
+            return payloads.load(cache_path, payload_type)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    if payload_type:
+        result = request_payload(endpoint, lambda raw: payloads.decode(raw, payload_type, source=filename),
+                                 retries, backoff)
+        if result is None:
+            return None
+        raw, data = result
+        # the API's own bytes: already valid JSON, no need to re-encode
+        with open(cache_path, 'wb') as f:
+            f.write(raw)
+    else:
+        result = request_payload(endpoint, json.loads, retries, backoff)
+        if result is None:
+            return {}
+        raw, data = result
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    print(f"✅ Cached {filename}")
+    return data
+
+
+# ----------------------
+# Streaming fetches
+# ----------------------
+class CacheWriter:
+    """
+    Writes fetched payloads to the cache on a background thread, so a
+    fetch-to-database ingest never waits on disk. Files are written to a
+    temporary name and renamed, so readers never see a partial file.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_pending=256):
+        self.cache_dir = cache_dir
+        self.written = 0
+        self.errors = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="cache-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, filename, raw):
+        """Queue raw payload bytes for `filename` (blocks only when max_pending are queued)."""
+        self._queue.put((filename, raw))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            filename, raw = item
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                with open(path + ".tmp", "wb") as f:
+                    f.write(raw)
+                os.replace(path + ".tmp", path)
+                self.written += 1
+            except OSError as e:
+                self.errors += 1
+                log_warning(f"Could not cache {filename}: {e}")
+
+    def close(self):
+        """Flush every queued file and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def fetch_payload(endpoint, filename, payload_type, writer=None, retries=3, backoff=2):
+    """
+    Fetch an endpoint and decode it straight into `payload_type`, skipping the
+    cache read. The raw response is handed to `writer` (a CacheWriter) to be
+    cached off the hot path; writer=None does not cache it. None on failure.
+    """
+    result = request_payload(endpoint, lambda raw: payloads.decode(raw, payload_type, source=filename),
+                             retries, backoff)
+    if result is None:
+        return None
+    raw, payload = result
+    if writer is not None:
+        writer.put(filename, raw)
+    return payload
@@ -0,0 +1,140 @@
+import argparse
+import os
+import threading
+import time
+from typing import NamedTuple
+
+from utils import result_cache
+
+# ----------------------
+# Country leaderboards
+# ----------------------
+# The Top Player page shows, per country, the top 10 run scorers and each
+# one's per-format stats. Instead of one GROUP BY round trip per country
+# change and another per player, every country's top 10 and their stats
+# come from a single windowed query:
+#
+#   ROW_NUMBER() OVER (PARTITION BY country ORDER BY SUM(runs) DESC)
+#
+# built once per data version (so once after each load) and kept in the
+# result cache as a compact Leaderboards snapshot of tuples. Switching
+# country or player is then a dict lookup. The page re-checks the data
+# version at most every LEADERBOARD_CHECK_S seconds (default 30).
+
+TOP_N = 10
+LEADERBOARD_CHECK_S = float(os.getenv("LEADERBOARD_CHECK_S", "30"))
+
+# per-format stat columns, in the order they are stored
+FIELDS = ("matches", "runs", "highest", "sixes", "hundreds", "double_hundreds")
+
+TEAMS_SQL = """
+    SELECT country
+    FROM teams
+    WHERE team_id BETWEEN 2 AND 27
+    ORDER BY country
+"""
+
+LEADERBOARD_SQL = f"""
+    SELECT r.country, r.player_id, r.name, ps.format,
+           {", ".join(f"ps.{f}" for f in FIELDS)}
+    FROM (
+        SELECT p.country, p.player_id, p.name,
+               ROW_NUMBER() OVER (PARTITION BY p.country
+                                  ORDER BY COALESCE(SUM(ps.runs), 0) DESC, p.player_id) AS rnk
+        FROM v_players p
+        JOIN v_player_stats ps ON ps.player_id = p.player_id
+        WHERE p.country IS NOT NULL
+        GROUP BY p.country, p.player_id, p.name
+    ) r
+    JOIN v_player_stats ps ON ps.player_id = r.player_id
+    WHERE r.rnk <= %s
+    ORDER BY r.country, r.rnk, ps.format
+"""
+
+
+class Leaderboards(NamedTuple):
+    version: object
+    countries: tuple      # team countries, alphabetical
+    players: dict         # country -> ((player_id, name), ...) best first
+    stats: dict           # player_id -> {format: (FIELDS values)}
+
+    def top_players(self, country):
+        return self.players.get(country, ())
+
+    def player_stats(self, player_id):
+        """{format: {field: value}} for one leaderboard player."""
+        return {fmt: dict(zip(FIELDS, values)) for fmt, values in self.stats.get(int(player_id), {}).items()}
+
+
+def build(conn, version=None, top_n=TOP_N):
+    """Leaderboards for every country from one leaderboard query (plus the team list)."""
+    cur = conn.cursor()
+    try:
+        cur.execute(TEAMS_SQL)
+        countries = tuple(row[0] for row in cur.fetchall())
+        cur.execute(LEADERBOARD_SQL, (top_n,))
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    players, stats = {}, {}
+    for country, player_id, name, fmt, *values in rows:
+        if player_id not in stats:
+            players.setdefault(country, []).append((player_id, name))
+            stats[player_id] = {}
+        stats[player_id][fmt] = tuple(values)
+    return Leaderboards(version, countries, {c: tuple(p) for c, p in players.items()}, stats)
+
+
+def load(conn):
+    """The Leaderboards of the current data version (built on the first call after a load)."""
+    version = result_cache.data_version(conn)
+    board, _ = result_cache.get_cache().get_or_run("leaderboards", {"top": TOP_N}, version,
+                                                   lambda: build(conn, version))
+    return board
+
+
+_CURRENT = None           # (checked_at, Leaderboards)
+_CURRENT_LOCK = threading.Lock()
+
+
+def get(pool):
+    """
+    The process's Leaderboards; the data version is re-checked (one pooled
+    round trip) only every LEADERBOARD_CHECK_S seconds.
+    """
+    global _CURRENT
+    current = _CURRENT
+    if current and time.monotonic() - current[0] < LEADERBOARD_CHECK_S:
+        return current[1]
+    with _CURRENT_LOCK:
+        current = _CURRENT
+        if current and time.monotonic() - current[0] < LEADERBOARD_CHECK_S:
+            return current[1]
+        with pool.connection() as conn:
+            board = load(conn)
+        _CURRENT = (time.monotonic(), board)
+        return board
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    from utils import storage
+
+    parser = argparse.ArgumentParser(description="Build the per-country Top Player leaderboards")
+    parser.add_argument("--country", help="Print this country's leaderboard")
+    args = parser.parse_args()
+
+    conn = storage.connect()
+    start = time.perf_counter()
+    board = build(conn, result_cache.data_version(conn))
+    elapsed = time.perf_counter() - start
+    conn.close()
+    print(f"✅ {len(board.players)} countries, {len(board.stats)} players in {elapsed * 1000:.1f} ms "
+          f"(data version {board.version})")
+    if args.country:
+        for rank, (player_id, name) in enumerate(board.top_players(args.country), 1):
+            runs = sum(values[FIELDS.index("runs")] or 0 for values in board.stats[player_id].values())
+            print(f"{rank:2}. {name} ({player_id}) {runs} runs, formats: {', '.join(board.stats[player_id])}")
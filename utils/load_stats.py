@@ -0,0 +1,234 @@
+import cProfile
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils import payloads, storage
+
+# ----------------------
+# Loader instrumentation
+# ----------------------
+# db_loader runs every loader inside LoadStats.stage(). Payload files are
+# read through LoadStats.load() and statements go through a TimedCursor, so
+# each stage records:
+#
+#   files / bytes      payload files read and their size
+#   parse_s            reading + decoding payloads
+#   db_s               time inside cursor.execute / executemany
+#   other_s            the rest (row building, dimension lookups, Python)
+#   cpu_s              process CPU time; db_s far above (cpu_s - parse_s)
+#                      means the stage waits on the database server
+#
+# and per table: statements and rows inserted / updated / skipped /
+# deleted. MySQL reports an upsert as 1 (inserted), 2 (updated) or 0
+# (unchanged, counted as skipped). SQLite / DuckDB report 1 for both insert
+# and update, and executemany only gives a total, so those rows are counted
+# as "upserted".
+#
+# profile=True also runs each stage under cProfile and writes
+# <log dir>/profile_<stage>_<timestamp>.prof (python -m pstats / snakeviz).
+# For py-spy, attach to or launch the loader as usual; every stage is a
+# named top-level function, so flame graphs split by loader.
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
+
+_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?", re.I)
+
+
+def _table_of(sql):
+    m = _TABLE_RE.match(sql)
+    if m:
+        return m.group(1)
+    return "(read)" if sql.lstrip()[:6].upper() == "SELECT" else "(other)"
+
+
+def _new_table():
+    return {"statements": 0, "db_s": 0.0, "inserted": 0, "updated": 0, "skipped": 0,
+            "upserted": 0, "deleted": 0}
+
+
+def _new_stage():
+    return {"files": 0, "bytes": 0, "parse_s": 0.0, "db_s": 0.0, "wall_s": 0.0, "cpu_s": 0.0,
+            "tables": {}}
+
+
+class TimedCursor:
+    """Cursor proxy that times every statement and tallies its rows per table."""
+
+    def __init__(self, cursor, stats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, operation, params=None):
+        start = time.perf_counter()
+        result = self._cursor.execute(operation, params)
+        self._stats._record(operation, time.perf_counter() - start, self._cursor.rowcount, None)
+        return result
+
+    def executemany(self, operation, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        start = time.perf_counter()
+        result = self._cursor.executemany(operation, seq_of_params)
+        self._stats._record(operation, time.perf_counter() - start, self._cursor.rowcount, len(seq_of_params))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class TimedConnection:
+    """Connection proxy whose cursors are TimedCursors (for code that opens its own)."""
+
+    def __init__(self, conn, stats):
+        self._conn = conn
+        self._stats = stats
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs), self._stats)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class LoadStats:
+    """Per-stage, per-table counters for one load run."""
+
+    def __init__(self, profile=False, log_dir=LOG_DIR):
+        self.profile = profile
+        self.log_dir = log_dir
+        self.stages = {}
+        self.current = None
+        self.started_at = datetime.now()
+        self._shapes = {}
+
+    def _stage(self):
+        return self.stages.setdefault(self.current or "(none)", _new_stage())
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute everything inside the block to stage `name`."""
+        previous, self.current = self.current, name
+        stage = self._stage()
+        profiler = cProfile.Profile() if self.profile else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield stage
+        finally:
+            if profiler:
+                profiler.disable()
+                os.makedirs(self.log_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(
+                    self.log_dir, f"profile_{name}_{self.started_at.strftime('%Y%m%d_%H%M%S')}.prof"))
+            stage["wall_s"] += time.perf_counter() - wall
+            stage["cpu_s"] += time.process_time() - cpu
+            self.current = previous
+
+    def load(self, path, payload_type):
+        """payloads.load() that records the file, its size and the decode time."""
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            raw = f.read()
+        payload = payloads.decode(raw, payload_type, source=path)
+        stage = self._stage()
+        stage["parse_s"] += time.perf_counter() - start
+        stage["files"] += 1
+        stage["bytes"] += len(raw)
+        return payload
+
+    def cursor(self, conn):
+        """A TimedCursor over conn.cursor()."""
+        return TimedCursor(conn.cursor(), self)
+
+    def connection(self, conn):
+        """A TimedConnection over conn."""
+        return TimedConnection(conn, self)
+
+    def _record(self, sql, elapsed, rowcount, batch):
+        if sql not in self._shapes:
+            verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+            self._shapes[sql] = (_table_of(sql), verb, "DUPLICATE KEY" in sql.upper())
+        name, verb, upsert = self._shapes[sql]
+
+        stage = self._stage()
+        stage["db_s"] += elapsed
+        table = stage["tables"].setdefault(name, _new_table())
+        table["statements"] += 1
+        table["db_s"] += elapsed
+
+        if verb == "DELETE":
+            table["deleted"] += max(rowcount, 0)
+        elif verb not in ("INSERT", "REPLACE", "UPDATE"):
+            return
+        elif batch is not None or rowcount < 0:
+            table["upserted"] += 1 if batch is None else batch
+        elif rowcount == 0:
+            table["skipped"] += 1
+        elif upsert and not storage.is_embedded():
+            table["updated" if rowcount == 2 else "inserted"] += 1
+        elif upsert:
+            # no insert / update distinction available (see header)
+            table["upserted"] += rowcount
+        elif verb == "UPDATE":
+            table["updated"] += rowcount
+        else:
+            table["inserted"] += rowcount
+
+    # ----------------------
+    # Report
+    # ----------------------
+    def report(self):
+        """JSON-ready summary: per stage totals, derived rates and per-table rows."""
+        stages = {}
+        for name, s in self.stages.items():
+            rows = sum(t["inserted"] + t["updated"] + t["upserted"] + t["deleted"]
+                       for t in s["tables"].values())
+            other = max(s["wall_s"] - s["parse_s"] - s["db_s"], 0.0)
+            stages[name] = {
+                "files": s["files"],
+                "bytes": s["bytes"],
+                "wall_s": round(s["wall_s"], 4),
+                "cpu_s": round(s["cpu_s"], 4),
+                "parse_s": round(s["parse_s"], 4),
+                "db_s": round(s["db_s"], 4),
+                "other_s": round(other, 4),
+                "rows": rows,
+                "rows_per_sec": round(rows / s["wall_s"], 1) if s["wall_s"] > 0 else None,
+                "bound": _bound(s["parse_s"], s["db_s"], other),
+                "tables": {t: {k: round(v, 4) if isinstance(v, float) else v for k, v in c.items()}
+                           for t, c in sorted(s["tables"].items())},
+            }
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "backend": storage.DB_BACKEND,
+            "stages": stages,
+        }
+
+    def print_summary(self):
+        for name, s in self.report()["stages"].items():
+            if not s["wall_s"]:
+                continue
+            print(f"⏱️ {name}: {s['files']} files ({s['bytes'] / 1e6:.1f} MB), "
+                  f"parse {s['parse_s']}s, db {s['db_s']}s, other {s['other_s']}s, "
+                  f"{s['rows']} rows ({s['rows_per_sec']} rows/s, {s['bound']}-bound)")
+
+    def write_report(self, path=None):
+        """Write report() as JSON (default: <log dir>/load_stats_<timestamp>.json); returns the path."""
+        path = path or os.path.join(self.log_dir, f"load_stats_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+def _bound(parse_s, db_s, other_s):
+    """Which of parse / db / cpu (row building) dominates a stage."""
+    return max((("parse", parse_s), ("db", db_s), ("cpu", other_s)), key=lambda kv: kv[1])[0]
@@ -0,0 +1,208 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+
+from utils import payloads
+from utils.fetch_api_base import API_KEY, CACHE_DIR, fetch_with_cache
+
+# ----------------------
+# Match feed
+# ----------------------
+# The Match Timelines page reads the live / upcoming / recent match lists
+# from one in-memory MatchFeed per server process instead of calling the
+# three fetches one after another on every rerun:
+#
+#   feed = get_feed()
+#   entries = feed.get_all()          # {"live": FeedEntry, ...}
+#
+# Each list is kept for its TTL (MATCH_FEED_LIVE_TTL_S, default 30 s, for
+# live; MATCH_FEED_TTL_S, default 300 s, for upcoming and recent). Expired
+# lists are refreshed concurrently, and a refresh is single-flight: every
+# session asking for the same list while it is being fetched waits on the
+# same request. A failed refresh keeps serving the last good list (or the
+# disk cache) until the next TTL. Without an API_KEY the disk cache written
+# by fetch_api.py is served as is.
+#
+# Every entry carries a digest per match (state, status, ...), so the page's
+# auto-refresh can tell which matches changed since it last drew them.
+
+LIVE_TTL_S = float(os.getenv("MATCH_FEED_LIVE_TTL_S", "30"))
+FEED_TTL_S = float(os.getenv("MATCH_FEED_TTL_S", "300"))
+
+FEEDS = {
+    # kind: (endpoint, cache file, ttl)
+    "live": ("matches/v1/live", "matches_live.json", LIVE_TTL_S),
+    "upcoming": ("matches/v1/upcoming", "matches_upcoming.json", FEED_TTL_S),
+    "recent": ("matches/v1/recent", "matches_recent.json", FEED_TTL_S),
+}
+
+
+class FeedEntry(NamedTuple):
+    feed: object            # payloads.MatchesFeed, or None when nothing could be fetched
+    fetched_at: float       # time.time()
+    digests: dict           # match key -> digest of what the page shows
+    refreshed: bool         # False when this is a stale copy after a failed refresh
+
+
+def match_key(info):
+    """Stable key of a match in a feed (match id, or teams + start when it has none)."""
+    if info.match_id is not None:
+        return str(info.match_id)
+    teams = tuple(t.team_name if t else None for t in (info.team1, info.team2))
+    return f"{teams}|{info.start_date}"
+
+
+def digest(info):
+    return (info.state, info.status, info.start_date, info.end_date, info.match_desc)
+
+
+def iter_matches(feed):
+    """(match type, series name, MatchInfo) for every match in a feed."""
+    if feed is None:
+        return
+    for block in feed.type_matches:
+        for series in block.series_matches:
+            wrapper = series.series_ad_wrapper
+            if not wrapper:
+                continue
+            for match in wrapper.matches:
+                if match.match_info:
+                    yield block.match_type, wrapper.series_name, match.match_info
+
+
+def _entry(feed, refreshed=True):
+    return FeedEntry(feed, time.time(), {match_key(info): digest(info) for _, _, info in iter_matches(feed)},
+                     refreshed)
+
+
+def cached_feed(kind):
+    """The list as last written to the disk cache, or None."""
+    path = os.path.join(CACHE_DIR, FEEDS[kind][1])
+    try:
+        return payloads.load(path, payloads.MatchesFeed)
+    except (OSError, payloads.PayloadError):
+        return None
+
+
+def fetch_feed(kind):
+    """Fetch one list from the API (the disk cache without an API_KEY); None on failure."""
+    endpoint, filename, _ = FEEDS[kind]
+    if not API_KEY:
+        return cached_feed(kind)
+    return fetch_with_cache(endpoint, filename, retries=1, refresh=True, payload_type=payloads.MatchesFeed)
+
+
+class MatchFeed:
+    """TTL-bounded, single-flight cache of the live / upcoming / recent match lists."""
+
+    def __init__(self, fetch=fetch_feed, ttl=None):
+        self.fetch = fetch
+        self.ttl = {kind: spec[2] for kind, spec in FEEDS.items()}
+        self.ttl.update(ttl or {})
+        self._entries = {}           # kind -> FeedEntry
+        self._inflight = {}          # kind -> Future
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=len(FEEDS), thread_name_prefix="match-feed")
+        self._metrics = {"hits": 0, "refreshes": 0, "joined": 0, "failures": 0}
+
+    def _fresh(self, kind):
+        entry = self._entries.get(kind)
+        return entry if entry and time.time() - entry.fetched_at < self.ttl[kind] else None
+
+    def _refresh(self, kind):
+        try:
+            feed = self.fetch(kind)
+        except Exception:
+            feed = None
+        with self._lock:
+            if feed is None:
+                self._metrics["failures"] += 1
+                # keep the last good list until the next TTL
+                old = self._entries.get(kind)
+                entry = old._replace(fetched_at=time.time(), refreshed=False) if old else \
+                    _entry(cached_feed(kind), False)
+            else:
+                self._metrics["refreshes"] += 1
+                entry = _entry(feed)
+            self._entries[kind] = entry
+            self._inflight.pop(kind, None)
+        return entry
+
+    def _future(self, kind):
+        """A finished or in-flight Future for `kind`'s entry (single-flight)."""
+        with self._lock:
+            entry = self._fresh(kind)
+            if entry is not None:
+                self._metrics["hits"] += 1
+                done = Future()
+                done.set_result(entry)
+                return done
+            future = self._inflight.get(kind)
+            if future is not None:
+                self._metrics["joined"] += 1
+                return future
+            future = self._pool.submit(self._refresh, kind)
+            self._inflight[kind] = future
+            return future
+
+    def get(self, kind):
+        """The FeedEntry for one list, refreshed first when its TTL has run out."""
+        return self._future(kind).result()
+
+    def get_all(self, kinds=tuple(FEEDS)):
+        """{kind: FeedEntry}; expired lists are fetched concurrently."""
+        futures = {kind: self._future(kind) for kind in kinds}
+        return {kind: future.result() for kind, future in futures.items()}
+
+    def expires_in(self, kind):
+        entry = self._entries.get(kind)
+        return max(self.ttl[kind] - (time.time() - entry.fetched_at), 0.0) if entry else 0.0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._metrics, inflight=len(self._inflight),
+                        age_s={k: round(time.time() - e.fetched_at, 1) for k, e in self._entries.items()})
+
+
+def changed(entry, seen):
+    """Keys of matches in `entry` whose digest differs from `seen` ({key: digest})."""
+    return {key for key, d in entry.digests.items() if seen.get(key) != d}
+
+
+_FEED = None
+_FEED_LOCK = threading.Lock()
+
+
+def get_feed():
+    """The process-wide MatchFeed."""
+    global _FEED
+    with _FEED_LOCK:
+        if _FEED is None:
+            _FEED = MatchFeed()
+        return _FEED
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch the live / upcoming / recent match lists")
+    parser.add_argument("--sessions", type=int, default=1, help="Simulate this many concurrent page sessions")
+    args = parser.parse_args()
+
+    feed = get_feed()
+    results = []
+    start = time.perf_counter()
+    threads = [threading.Thread(target=lambda: results.append(feed.get_all())) for _ in range(args.sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    for kind, entry in results[0].items():
+        state = "fresh" if entry.refreshed else "stale"
+        print(f"{kind:9} {len(entry.digests):4} matches ({state})")
+    print(f"✅ {args.sessions} session(s) served in {elapsed * 1000:.1f} ms: {feed.stats()}")
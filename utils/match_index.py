@@ -0,0 +1,204 @@
+import argparse
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple, Optional
+
+from utils import match_feed
+
+# ----------------------
+# Match summary index
+# ----------------------
+# The Match Timelines sections used to re-walk every feed's
+# typeMatches -> seriesMatches -> seriesAdWrapper -> matches tree on each
+# rerun. The feeds are flattened instead, once per feed refresh, into
+# compact MatchSummary records (tuples, no per-record __dict__) with
+# indexes by feed kind, state, format and series, plus a start-time order
+# for range queries:
+#
+#   index = match_index.get(feed.get_all())
+#   index.select(kind="upcoming", start_after=now_ms, search="india", limit=20)
+#
+# select() intersects the indexes and returns a sorted slice; groups()
+# arranges records by match type and series for the page.
+
+_MISSING = float("inf")      # matches without a start time sort last
+
+
+class MatchSummary(NamedTuple):
+    key: str                   # match_feed.match_key()
+    kind: str                  # live / upcoming / recent
+    match_id: Optional[int]
+    match_type: str            # International, League, Domestic, Women
+    series_id: Optional[int]
+    series_name: str
+    format: str
+    desc: Optional[str]
+    state: Optional[str]
+    status: Optional[str]
+    start_ms: Optional[int]
+    end_ms: Optional[int]
+    team1: str
+    team2: str
+    venue: str
+    city: str
+
+    @property
+    def search_text(self):
+        return " ".join(filter(None, (self.team1, self.team2, self.series_name, self.venue, self.city,
+                                      self.desc, self.status))).lower()
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def summarize(kind, match_type, series_name, info):
+    """MatchSummary of one payloads.MatchInfo."""
+    venue = info.venue_info
+    return MatchSummary(
+        key=match_feed.match_key(info),
+        kind=kind,
+        match_id=_int(info.match_id),
+        match_type=match_type or "Unknown",
+        series_id=_int(info.series_id),
+        series_name=series_name or info.series_name or "Unnamed Series",
+        format=info.match_format or "N/A",
+        desc=info.match_desc,
+        state=info.state,
+        status=info.status,
+        start_ms=_int(info.start_date),
+        end_ms=_int(info.end_date),
+        team1=info.team1.team_name if info.team1 and info.team1.team_name else "Team 1",
+        team2=info.team2.team_name if info.team2 and info.team2.team_name else "Team 2",
+        venue=venue.ground if venue and venue.ground else "Unknown",
+        city=venue.city if venue and venue.city else "",
+    )
+
+
+def _start(record):
+    return record.start_ms if record.start_ms is not None else _MISSING
+
+
+class MatchIndex:
+    """Match summaries of every feed, indexed for filtered, sorted slices."""
+
+    def __init__(self, records):
+        # positions below refer to this start-time order
+        self.records = tuple(sorted(records, key=_start))
+        self._starts = [_start(r) for r in self.records]
+        self._text = [r.search_text for r in self.records]
+        self.by_kind, self.by_state, self.by_format, self.by_series = {}, {}, {}, {}
+        for pos, r in enumerate(self.records):
+            self.by_kind.setdefault(r.kind, []).append(pos)
+            self.by_state.setdefault(r.state, []).append(pos)
+            self.by_format.setdefault(r.format, []).append(pos)
+            self.by_series.setdefault(r.series_name, []).append(pos)
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build from match_feed.MatchFeed.get_all() ({kind: FeedEntry})."""
+        records = []
+        for kind, entry in entries.items():
+            seen = set()
+            for match_type, series_name, info in match_feed.iter_matches(entry.feed):
+                record = summarize(kind, match_type, series_name, info)
+                if record.key not in seen:
+                    seen.add(record.key)
+                    records.append(record)
+        return cls(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def values(self, field, kind=None):
+        """Sorted distinct values of a field (for filter widgets)."""
+        positions = self.by_kind.get(kind, ()) if kind else range(len(self.records))
+        return sorted({getattr(self.records[p], field) for p in positions} - {None})
+
+    def select(self, kind=None, state=None, formats=None, series=None, start_after=None, start_before=None,
+               search=None, descending=False, limit=None):
+        """
+        Records matching every given filter, by start time (newest first when
+        descending). formats may be one format or a collection of them;
+        start_after / start_before are epoch ms (after is exclusive).
+        """
+        lo = bisect_right(self._starts, start_after) if start_after is not None else 0
+        hi = bisect_left(self._starts, start_before) if start_before is not None else len(self.records)
+        candidates = None
+        if isinstance(formats, str):
+            formats = (formats,)
+        for index, wanted in ((self.by_kind, (kind,) if kind else None),
+                              (self.by_state, (state,) if state else None),
+                              (self.by_format, formats or None),
+                              (self.by_series, (series,) if series else None)):
+            if wanted is None:
+                continue
+            positions = {p for w in wanted for p in index.get(w, ())}
+            candidates = positions if candidates is None else candidates & positions
+        positions = sorted(p for p in candidates if lo <= p < hi) if candidates is not None else range(lo, hi)
+        if search:
+            needle = search.lower().strip()
+            positions = [p for p in positions if needle in self._text[p]]
+        if descending:
+            positions = list(reversed(positions))
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.records[p] for p in positions]
+
+
+def groups(records, per_series=None):
+    """{match type: {series name: [records]}} in first-seen order, at most per_series each."""
+    grouped = {}
+    for r in records:
+        series = grouped.setdefault(r.match_type, {}).setdefault(r.series_name, [])
+        if per_series is None or len(series) < per_series:
+            series.append(r)
+    return grouped
+
+
+_INDEX = None             # (feed stamps, MatchIndex)
+_INDEX_LOCK = threading.Lock()
+
+
+def get(entries):
+    """The MatchIndex of these feed entries; rebuilt only when a feed was refreshed."""
+    global _INDEX
+    stamp = tuple(sorted((kind, id(entry.feed), entry.fetched_at if entry.refreshed else None)
+                         for kind, entry in entries.items()))
+    current = _INDEX
+    if current and current[0] == stamp:
+        return current[1]
+    with _INDEX_LOCK:
+        if _INDEX and _INDEX[0] == stamp:
+            return _INDEX[1]
+        index = MatchIndex.from_entries(entries)
+        _INDEX = (stamp, index)
+        return index
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and query the match summary index")
+    parser.add_argument("--kind", choices=sorted(match_feed.FEEDS), help="Only this feed")
+    parser.add_argument("--format", help="Only this match format (e.g. T20)")
+    parser.add_argument("--search", help="Team, series or venue text")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    entries = match_feed.get_feed().get_all()
+    start = time.perf_counter()
+    index = MatchIndex.from_entries(entries)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = index.select(kind=args.kind, formats=args.format, search=args.search, limit=args.limit)
+    selected = time.perf_counter() - start
+    print(f"✅ {len(index)} matches indexed in {built * 1000:.2f} ms; "
+          f"{len(rows)} selected in {selected * 1000:.3f} ms")
+    for r in rows:
+        print(f"{r.kind:8} {r.format:5} {r.team1} v {r.team2} - {r.series_name} ({r.state or 'N/A'})")
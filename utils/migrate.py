@@ -0,0 +1,111 @@
+import argparse
+import os
+import re
+from datetime import datetime
+
+from utils import storage
+
+# ----------------------
+# Schema migrations
+# ----------------------
+# schema.sql is the baseline; everything after it lives in migrations/ as
+# NNN_name.sql files applied in order and recorded in schema_migrations.
+# A backend-specific variant (NNN_name.mysql.sql / .duckdb.sql / .sqlite.sql)
+# replaces the generic file on that backend.
+
+MIGRATIONS_DIR = os.path.join(storage.ROOT_DIR, "migrations")
+_FILE_RE = re.compile(r"^(\d{3})_(\w+?)(?:\.(mysql|duckdb|sqlite))?\.sql$")
+
+
+def discover_migrations(backend=None, directory=MIGRATIONS_DIR):
+    """[(version, name, path)] for the given backend, ordered by version."""
+    backend = backend or storage.DB_BACKEND
+    found = {}
+    for fname in sorted(os.listdir(directory)):
+        m = _FILE_RE.match(fname)
+        if not m:
+            continue
+        version, name, dialect = m.groups()
+        if dialect and dialect != backend:
+            continue
+        # a backend-specific file wins over the generic one
+        if dialect or version not in found:
+            found[version] = (version, name, os.path.join(directory, fname))
+    return [found[v] for v in sorted(found)]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(10) PRIMARY KEY,
+            name VARCHAR(255),
+            applied_at DATETIME
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migrations(conn=None, target=None):
+    """Apply pending migrations up to `target` (default: all). Returns the versions applied."""
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+    ensure_migrations_table(cur)
+    conn.commit()
+
+    done = applied_versions(cur)
+    applied = []
+    for version, name, path in discover_migrations():
+        if version in done:
+            continue
+        if target and version > target:
+            break
+        with open(path, "r", encoding="utf-8") as f:
+            for stmt in storage.split_statements(f.read()):
+                cur.execute(stmt)
+        cur.execute(
+            "INSERT INTO schema_migrations (version, name, applied_at) VALUES (%s,%s,%s)",
+            (version, name, datetime.now()),
+        )
+        conn.commit()
+        applied.append(version)
+        print(f"✅ Applied migration {version}_{name}")
+
+    cur.close()
+    if own:
+        conn.close()
+    if not applied:
+        print("✅ Schema up to date")
+    return applied
+
+
+def migration_status(conn=None):
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+    ensure_migrations_table(cur)
+    done = applied_versions(cur)
+    cur.close()
+    if own:
+        conn.close()
+    return [(version, name, version in done) for version, name, _ in discover_migrations()]
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("--status", action="store_true", help="Show applied / pending migrations")
+    parser.add_argument("--target", help="Apply migrations up to this version only (e.g. 002)")
+    args = parser.parse_args()
+
+    if args.status:
+        for version, name, done in migration_status():
+            print(f"{'✅' if done else '⏳'} {version}_{name}")
+    else:
+        apply_migrations(target=args.target)
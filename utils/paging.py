@@ -0,0 +1,355 @@
+import argparse
+import csv
+import io
+import re
+import tempfile
+from typing import NamedTuple
+
+from utils import query_exec, result_cache, storage
+
+# ----------------------
+# Result paging
+# ----------------------
+# The Queries page shows one page of a result at a time instead of pulling
+# the whole frame through pd.read_sql / st.dataframe. A query is wrapped as
+#
+#   SELECT * FROM (<query>) q WHERE <after last row> ORDER BY <keys> LIMIT n
+#
+# where the keys are the query's own ORDER BY columns (mapped to its output
+# columns), so each page starts at an index seek or a sorted position
+# instead of re-reading and discarding every earlier row. The remaining
+# output columns are appended to the ORDER BY so ties have a stable order;
+# rows that tie with the last row shown are skipped with a small OFFSET.
+# NULL keys sort last on every backend.
+#
+# A query whose ORDER BY cannot be mapped (an expression, or no ORDER BY at
+# all) falls back to LIMIT / OFFSET over all its columns.
+#
+# Downloads stream the full result from the cursor into a temporary file
+# (CSV, or Parquet one row group per chunk) without building a DataFrame.
+
+PAGE_SIZES = (50, 100, 500)
+EXPORT_CHUNK = 5000
+
+_DIR_RE = re.compile(r"\s+(ASC|DESC)\s*$", re.I)
+_ALIAS_RE = re.compile(r"^(.*?)\s+(?:AS\s+)?`?(\w+)`?$", re.I | re.S)
+
+
+class Plan(NamedTuple):
+    columns: tuple     # output column names
+    keys: tuple        # ((column, descending), ...); empty -> offset paging
+
+    @property
+    def mode(self):
+        return "keyset" if self.keys else "offset"
+
+
+def _quote(name):
+    return f'"{name}"' if storage.is_embedded() else f"`{name}`"
+
+
+def _top_level(masked):
+    """[(start, end)] spans of masked SQL that are outside parentheses."""
+    spans, depth, start = [], 0, 0
+    for i, ch in enumerate(masked):
+        if ch == "(":
+            if depth == 0:
+                spans.append((start, i))
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                start = i + 1
+    spans.append((start, len(masked)))
+    return spans
+
+
+def _split_top(text):
+    """Split on commas outside parentheses."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _find_top(masked, pattern):
+    """Match objects of `pattern` that start outside parentheses."""
+    spans = _top_level(masked)
+    return [m for m in re.finditer(pattern, masked, re.I)
+            if any(a <= m.start() < b for a, b in spans)]
+
+
+def _norm(expr):
+    return re.sub(r"\s+", "", expr).replace("`", "").lower()
+
+
+def order_by_keys(sql, columns):
+    """The query's final ORDER BY as ((output column, descending), ...), or () if unmappable."""
+    masked, _ = storage._mask(sql)
+    orders = _find_top(masked, r"\bORDER\s+BY\b")
+    if not orders:
+        return ()
+    clause = masked[orders[-1].end():]
+    limit = _find_top(clause, r"\bLIMIT\b")
+    if limit:
+        clause = clause[:limit[0].start()]
+
+    # expression -> alias for the outermost select list
+    aliases = {}
+    selects = _find_top(masked, r"\bSELECT\b")
+    froms = [m for m in _find_top(masked, r"\bFROM\b") if selects and m.start() > selects[-1].end()]
+    if selects and froms:
+        for item in _split_top(masked[selects[-1].end():froms[0].start()]):
+            m = _ALIAS_RE.match(item)
+            if m:
+                aliases[_norm(m.group(1))] = m.group(2)
+
+    lowered = {c.lower(): c for c in columns}
+    keys = []
+    for term in _split_top(clause.rstrip().rstrip(";")):
+        m = _DIR_RE.search(term)
+        desc = bool(m and m.group(1).upper() == "DESC")
+        expr = term[:m.start()].strip() if m else term.strip()
+        if expr.isdigit() and 0 < int(expr) <= len(columns):
+            column = columns[int(expr) - 1]
+        elif _norm(expr) in aliases and aliases[_norm(expr)].lower() in lowered:
+            column = lowered[aliases[_norm(expr)].lower()]
+        elif re.fullmatch(r"`?(?:\w+`?\.`?)?(\w+)`?", expr) and expr.split(".")[-1].strip("`").lower() in lowered:
+            column = lowered[expr.split(".")[-1].strip("`").lower()]
+        else:
+            return ()
+        if column not in (k for k, _ in keys):
+            keys.append((column, desc))
+    return tuple(keys)
+
+
+def plan(conn, sql, params=None):
+    """Output columns and keyset keys of a query (runs it with LIMIT 0)."""
+    columns, _ = query_exec.fetch(conn, f"SELECT * FROM ({sql}) AS q LIMIT 0", params)
+    columns = tuple(columns)
+    if len({c.lower() for c in columns}) != len(columns):
+        # duplicate output names cannot be addressed from the wrapper
+        return Plan(columns, ())
+    return Plan(columns, order_by_keys(sql, columns))
+
+
+def _order_clause(plan):
+    terms = []
+    for column, desc in plan.keys:
+        terms.append(f"CASE WHEN {_quote(column)} IS NULL THEN 1 ELSE 0 END")
+        terms.append(f"{_quote(column)} {'DESC' if desc else 'ASC'}")
+    keyed = {k for k, _ in plan.keys}
+    terms += [f"{_quote(c)} ASC" for c in plan.columns if c not in keyed]
+    return ", ".join(terms)
+
+
+def _after(plan, values, bind):
+    """Rows at or after `values` in key order (non-strict; ties are skipped by OFFSET)."""
+    (column, desc), rest = plan.keys[0], plan.keys[1:]
+    value, col = values[0], _quote(column)
+    if value is None:
+        # NULLs sort last: only the NULL group can follow
+        equal, greater = f"{col} IS NULL", None
+    else:
+        name = bind(value)
+        equal = f"{col} = %({name})s"
+        greater = f"({col} IS NULL OR {col} {'<' if desc else '>'} %({name})s)"
+    inner = _after(Plan(plan.columns, rest), values[1:], bind) if rest else None
+    tail = f"({equal} AND {inner})" if inner else equal
+    return f"({greater} OR {tail})" if greater else tail
+
+
+def fetch_page(conn, sql, plan, cursor=None, page_size=100, params=None):
+    """
+    (DataFrame, next cursor) for the page starting at `cursor` (None = first).
+    The next cursor is None on the last page.
+    """
+    bound = dict(params or {})
+    where, offset = "", 0
+    if plan.keys and cursor is not None:
+        values, offset = cursor
+
+        def bind(value):
+            name = f"_k{len(bound)}"
+            bound[name] = value
+            return name
+        where = f"WHERE {_after(plan, values, bind)}"
+    elif cursor is not None:
+        offset = cursor
+
+    # limit / offset are parameters too, so every page of a query shares one
+    # prepared statement (one for the first page, one for the rest)
+    bound["_limit"], bound["_offset"] = int(page_size) + 1, int(offset)
+    page_sql = (f"SELECT * FROM ({sql}) AS q {where} ORDER BY {_order_clause(plan)} "
+                f"LIMIT %(_limit)s OFFSET %(_offset)s")
+    _, rows = query_exec.fetch(conn, page_sql, bound)
+
+    import pandas as pd  # imported on first use, not when a page loads
+
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    frame = pd.DataFrame.from_records(rows, columns=list(plan.columns))
+    if not more:
+        return frame, None
+    if not plan.keys:
+        return frame, offset + len(rows)
+
+    idx = [plan.columns.index(k) for k, _ in plan.keys]
+    last = tuple(rows[-1][i] for i in idx)
+    ties = 0
+    for row in reversed(rows):
+        if tuple(row[i] for i in idx) != last:
+            break
+        ties += 1
+    if ties == len(rows) and cursor is not None and tuple(cursor[0]) == last:
+        ties += cursor[1]
+    return frame, (last, ties)
+
+
+def approx_count(conn, sql, params=None):
+    """
+    (row count, exact). MySQL: the optimizer's estimate from EXPLAIN, no rows
+    are read. DuckDB / SQLite: an exact COUNT(*), which is cheap locally.
+    """
+    cur = conn.cursor()
+    try:
+        if storage.is_embedded():
+            cur.execute(f"SELECT COUNT(*) FROM ({sql}) AS q", params)
+            return cur.fetchone()[0], True
+        cur.execute(f"EXPLAIN SELECT * FROM ({sql}) AS q", params)
+        cols = [d[0] for d in cur.description]
+        estimate = 1.0
+        for row in cur.fetchall():
+            r = dict(zip(cols, row))
+            if str(r.get("id")) == "1" and r.get("rows") is not None:
+                estimate *= float(r["rows"]) * float(r.get("filtered") or 100) / 100
+        return int(round(estimate)), False
+    finally:
+        cur.close()
+
+
+def cached_page(conn, query, params=None, page=0, page_size=100, cursor=None):
+    """
+    (plan, total, exact, DataFrame, next cursor, hit, data version) of one page
+    of a catalog query through the result cache. The Queries page and the
+    cache warmer share these keys, so a warmed first page is a page hit.
+    """
+    cache = result_cache.get_cache()
+    version = result_cache.data_version(conn)
+    extra = params or {}
+    query_plan, _ = cache.get_or_run(query.id, {"_plan": True, **extra}, version,
+                                     lambda: plan(conn, query.sql, params))
+    (total, exact), _ = cache.get_or_run(query.id, {"_count": True, **extra}, version,
+                                         lambda: approx_count(conn, query.sql, params))
+    (frame, next_cursor), hit = cache.get_or_run(
+        query.id, {"_page": page, "_size": page_size, **extra}, version,
+        lambda: fetch_page(conn, query.sql, query_plan, cursor, page_size, params))
+    return query_plan, total, exact, frame, next_cursor, hit, version
+
+
+# ----------------------
+# Streamed export
+# ----------------------
+def _stream(conn, sql, params):
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    columns = [d[0] for d in cur.description]
+    return cur, columns
+
+
+def export_csv(conn, sql, params=None, chunk=EXPORT_CHUNK):
+    """The full result as CSV in a temporary file (rewound), written chunk by chunk."""
+    out = tempfile.TemporaryFile()
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    cur, columns = _stream(conn, sql, params)
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    while True:
+        rows = cur.fetchmany(chunk)
+        if not rows:
+            break
+        writer.writerows(rows)
+    cur.close()
+    text.detach()
+    out.seek(0)
+    return out
+
+
+def export_parquet(conn, sql, params=None, chunk=EXPORT_CHUNK):
+    """The full result as Parquet in a temporary file (rewound), one row group per chunk."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out = tempfile.TemporaryFile()
+    cur, columns = _stream(conn, sql, params)
+    writer = None
+    while True:
+        rows = cur.fetchmany(chunk)
+        if not rows:
+            break
+        table = pa.Table.from_pandas(pd.DataFrame.from_records(rows, columns=columns), preserve_index=False)
+        if writer is None:
+            # a column that is all NULL in the first chunk is typed as text
+            schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema])
+            writer = pq.ParquetWriter(out, schema)
+            table = table.cast(schema)
+        elif table.schema != writer.schema:
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+    cur.close()
+    if writer is None:
+        pq.write_table(pa.table({c: pa.array([], pa.null()) for c in columns}), out)
+    else:
+        writer.close()
+    out.seek(0)
+    return out
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    from utils import query_catalog
+
+    parser = argparse.ArgumentParser(description="Page through or export a query from queries.sql")
+    parser.add_argument("query", help="Query id (e.g. 1 or 'Que 1')")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=1, help="Number of pages to print")
+    parser.add_argument("--export", help="Write the full result to this .csv or .parquet file")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                        help="Query parameter (repeatable; defaults from queries.sql)")
+    args = parser.parse_args()
+
+    query = query_catalog.get(args.query)
+    params = query_catalog.bind(query, dict(p.split("=", 1) for p in args.param))
+    conn = storage.connect()
+    if args.export:
+        export = export_parquet if args.export.endswith(".parquet") else export_csv
+        with export(conn, query.sql, params) as src, open(args.export, "wb") as dst:
+            while True:
+                block = src.read(1 << 20)
+                if not block:
+                    break
+                dst.write(block)
+        print(f"✅ {query.id} exported to {args.export}")
+    else:
+        p = plan(conn, query.sql, params)
+        total, exact = approx_count(conn, query.sql, params)
+        print(f"{query.label}: {'' if exact else '~'}{total} rows, {p.mode} paging on "
+              f"{', '.join(k + (' DESC' if d else '') for k, d in p.keys) or 'all columns'}")
+        cursor = None
+        for n in range(args.pages):
+            frame, cursor = fetch_page(conn, query.sql, p, cursor, args.page_size, params)
+            print(f"--- page {n + 1} ---")
+            print(frame.to_string(index=False))
+            if cursor is None:
+                break
+    conn.close()
@@ -0,0 +1,115 @@
+import argparse
+from datetime import datetime
+
+from utils import storage
+
+# ----------------------
+# Fact table partitions
+# ----------------------
+# Migration 005 gives match_batting / match_bowling / match_fow a match_year
+# column. On MySQL the tables are RANGE-partitioned on it: p_hist holds
+# everything before the first yearly partition, pYYYY one year each and
+# p_future the rest. The migration creates p2015..p2026 only; every later
+# year has to be split out of p_future by ensure_partitions(), which
+# db_loader, stream_ingest and scorecard_delta run before writing facts
+# (or run `python -m utils.partitions --ensure` from a yearly job), so fresh
+# matches never pile up in the catch-all partition.
+#
+# match_year is part of the MySQL primary key, so when a match's year
+# changes apply_scorecard() deletes its rows filed under the old year and
+# writes them again.
+
+FACT_TABLES = ("match_batting", "match_bowling", "match_fow")
+
+
+def match_years(cursor):
+    """{match_id: year} for every match (0 when the start date is unknown)."""
+    cursor.execute("SELECT match_id, YEAR(start_date) FROM matches")
+    return {mid: year or 0 for mid, year in cursor.fetchall()}
+
+
+def partition_names(cursor, table):
+    cursor.execute("""
+        SELECT PARTITION_NAME FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def ensure_partitions(conn=None, through_year=None):
+    """
+    Make sure every fact table has a yearly partition up to `through_year`
+    (default: next year). MySQL only; a no-op on the embedded backends.
+    Returns {table: [partitions added]}.
+    """
+    if storage.is_embedded():
+        return {}
+    through_year = through_year or datetime.now().year + 1
+
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+    added = {}
+    for table in FACT_TABLES:
+        names = partition_names(cur, table)
+        if "p_future" not in names:
+            print(f"⚠️ {table} is not partitioned (run migrations first)")
+            continue
+        years = [int(n[1:]) for n in names if n[1:].isdigit()]
+        start = max(years) + 1 if years else datetime.now().year
+        new = [f"p{y}" for y in range(start, through_year + 1)]
+        if not new:
+            continue
+        parts = ", ".join(f"PARTITION p{y} VALUES LESS THAN ({y + 1})" for y in range(start, through_year + 1))
+        cur.execute(f"""
+            ALTER TABLE {table} REORGANIZE PARTITION p_future INTO (
+                {parts}, PARTITION p_future VALUES LESS THAN MAXVALUE
+            )
+        """)
+        added[table] = new
+        print(f"✅ {table}: added partitions {', '.join(new)}")
+    cur.close()
+    if own:
+        conn.close()
+    return added
+
+
+def partition_rows(conn=None):
+    """[(table, partition, approximate rows)] from INFORMATION_SCHEMA (MySQL)."""
+    own = conn is None
+    conn = conn or storage.connect()
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT TABLE_NAME, PARTITION_NAME, TABLE_ROWS FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({",".join(["%s"] * len(FACT_TABLES))})
+          AND PARTITION_NAME IS NOT NULL
+        ORDER BY TABLE_NAME, PARTITION_ORDINAL_POSITION
+    """, FACT_TABLES)
+    rows = cur.fetchall()
+    cur.close()
+    if own:
+        conn.close()
+    return rows
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the yearly partitions of the match fact tables")
+    parser.add_argument("--ensure", action="store_true", help="Add missing yearly partitions")
+    parser.add_argument("--through", type=int, help="Last year to create a partition for (default: next year)")
+    parser.add_argument("--show", action="store_true", help="Show approximate rows per partition")
+    args = parser.parse_args()
+
+    if storage.is_embedded():
+        print(f"⚠️ {storage.DB_BACKEND} tables are not partitioned; match_year is filtered through its index / zone maps")
+    else:
+        if args.ensure:
+            ensure_partitions(through_year=args.through)
+        if args.show:
+            for table, name, rows in partition_rows():
+                print(f"{table:15} {name:10} {rows}")
+        if not (args.ensure or args.show):
+            print("⚠️ No arguments provided. Use --help for options.")
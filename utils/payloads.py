@@ -0,0 +1,323 @@
+from typing import List, Optional, Union
+
+import msgspec
+
+# ----------------------
+# Typed Cricbuzz payloads
+# ----------------------
+# Struct definitions for the cached API payloads the loaders and pages read,
+# decoded with msgspec straight from bytes. Only the fields listed here are
+# materialised; everything else in the JSON is skipped while decoding. A
+# payload whose fields have the wrong shape raises PayloadError naming the
+# file and the JSON path of the bad value.
+#
+# Attribute names are the API's camelCase keys in snake_case
+# (matchInfo -> match_info). Ids and numbers arrive as int or str depending
+# on the endpoint, so they are typed as Scalar and parsed by the consumer.
+
+Scalar = Union[bool, int, float, str, None]
+
+
+class PayloadError(ValueError):
+    """A cached payload could not be decoded into its struct."""
+
+
+class Payload(msgspec.Struct, rename="camel", kw_only=True, gc=False):
+    """Base for all payload structs (camelCase keys, no GC tracking)."""
+
+
+# ----------------------
+# Shared pieces
+# ----------------------
+class TeamRef(Payload):
+    team_id: Scalar = None
+    team_name: Optional[str] = None
+    team_s_name: Optional[str] = None
+    image_id: Scalar = None
+
+
+class VenueRef(Payload):
+    id: Scalar = None
+    ground: Optional[str] = None
+    city: Optional[str] = None
+
+
+class MatchInfo(Payload):
+    match_id: Scalar = None
+    series_id: Scalar = None
+    series_name: Optional[str] = None
+    series_start_dt: Scalar = None
+    series_end_dt: Scalar = None
+    series_type: Optional[str] = None
+    match_desc: Optional[str] = None
+    match_format: Optional[str] = None
+    start_date: Scalar = None
+    end_date: Scalar = None
+    state: Optional[str] = None
+    status: Optional[str] = None
+    team1: Optional[TeamRef] = None
+    team2: Optional[TeamRef] = None
+    venue_info: Optional[VenueRef] = None
+
+
+class MatchEntry(Payload):
+    match_info: Optional[MatchInfo] = None
+
+
+# ----------------------
+# teams/v1/international -> teams_list.json
+# ----------------------
+class TeamEntry(Payload):
+    id: Scalar = None
+    team_id: Scalar = None
+    team_name: Optional[str] = None
+    team_s_name: Optional[str] = None
+    country_name: Optional[str] = None
+    image_id: Scalar = None
+
+
+class TeamsList(Payload):
+    teams: List[TeamEntry] = msgspec.field(default_factory=list, name="list")
+
+
+# ----------------------
+# stats/v1/player/{id} -> player_{id}_info.json
+# ----------------------
+class TeamNameId(Payload):
+    team_id: Scalar = None
+    team_name: Optional[str] = None
+
+
+class PlayerInfo(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    nick_name: Optional[str] = None
+    role: Optional[str] = None
+    bat: Optional[str] = None
+    bowl: Optional[str] = None
+    dob_format: Optional[str] = msgspec.field(default=None, name="DoBFormat")
+    birth_place: Optional[str] = None
+    intl_team: Optional[str] = None
+    image: Optional[str] = None
+    team_name_ids: List[TeamNameId] = []
+
+
+# ----------------------
+# stats/v1/player/{id}/batting|bowling -> player_{id}_*.json
+# ----------------------
+class GridRow(Payload):
+    values: List[Scalar] = []
+
+
+class StatsGrid(Payload):
+    headers: List[str] = []
+    values: List[GridRow] = []
+
+
+# ----------------------
+# venues/v1/{id} -> venue_{id}_info.json
+# ----------------------
+class VenueInfo(Payload):
+    ground: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    timezone: Optional[str] = None
+    established: Scalar = None
+    capacity: Scalar = None
+    known_as: Optional[str] = None
+    ends: Optional[str] = None
+    home_team: Optional[str] = None
+    floodlights: Scalar = None
+    image_url: Optional[str] = None
+
+
+# ----------------------
+# series/v1/{id} -> series_{id}_matches.json
+# ----------------------
+class MatchDetailsMap(Payload):
+    match: List[MatchEntry] = []
+
+
+class MatchDetail(Payload):
+    # ad slots in the list carry an "adDetail" instead of a map
+    match_details_map: Optional[MatchDetailsMap] = None
+
+
+class SeriesMatches(Payload):
+    match_details: List[MatchDetail] = []
+
+
+# ----------------------
+# mcenter/v1/{id} -> match_{id}_info.json
+# ----------------------
+class MatchResult(Payload):
+    result_type: Optional[str] = None
+    winning_team: Optional[str] = None
+    winningteam_id: Scalar = None
+    winning_margin: Scalar = None
+    win_by_runs: Scalar = None
+    win_by_innings: Scalar = None
+
+
+class TossResults(Payload):
+    toss_winner_id: Scalar = None
+    toss_winner_name: Optional[str] = None
+    decision: Optional[str] = None
+
+
+class Official(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    country: Optional[str] = None
+
+
+class AwardPlayer(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    full_name: Optional[str] = None
+    team_name: Optional[str] = None
+
+
+class RosterPlayer(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    full_name: Optional[str] = None
+    nick_name: Optional[str] = None
+    role: Optional[str] = None
+    batting_style: Optional[str] = None
+    bowling_style: Optional[str] = None
+    team_name: Optional[str] = None
+    face_image_id: Scalar = None
+    captain: bool = False
+    keeper: bool = False
+    substitute: bool = False
+
+
+class MatchTeam(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    short_name: Optional[str] = None
+    player_details: List[RosterPlayer] = []
+
+
+class MatchCenterInfo(Payload):
+    match_id: Scalar = None
+    result: Optional[MatchResult] = None
+    toss_results: Optional[TossResults] = None
+    umpire1: Optional[Official] = None
+    umpire2: Optional[Official] = None
+    umpire3: Optional[Official] = None
+    referee: Optional[Official] = None
+    players_of_the_match: List[AwardPlayer] = []
+    players_of_the_series: List[AwardPlayer] = []
+    team1: Optional[MatchTeam] = None
+    team2: Optional[MatchTeam] = None
+
+
+class MatchCenter(Payload):
+    match_info: Optional[MatchCenterInfo] = None
+
+
+# ----------------------
+# mcenter/v1/{id}/scard -> match_{id}_scorecard.json
+# ----------------------
+class Batsman(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    runs: Scalar = None
+    balls: Scalar = None
+    fours: Scalar = None
+    sixes: Scalar = None
+    strkrate: Scalar = None
+    outdec: Optional[str] = None
+
+
+class Bowler(Payload):
+    id: Scalar = None
+    name: Optional[str] = None
+    overs: Scalar = None
+    maidens: Scalar = None
+    runs: Scalar = None
+    wickets: Scalar = None
+    economy: Scalar = None
+    balls: Scalar = None
+
+
+class Wicket(Payload):
+    batsmanid: Scalar = None
+    batsmanname: Scalar = None
+    runs: Scalar = None
+    overnbr: Scalar = None
+
+
+class FallOfWickets(Payload):
+    fow: List[Wicket] = []
+
+
+class Innings(Payload):
+    inningsid: Scalar = None
+    batsman: List[Batsman] = []
+    bowler: List[Bowler] = []
+    fow: Optional[FallOfWickets] = None
+
+
+class Scorecard(Payload):
+    match_id: Scalar = None
+    scorecard: List[Innings] = []
+
+
+# ----------------------
+# matches/v1/live|upcoming|recent -> matches_*.json
+# ----------------------
+class SeriesAdWrapper(Payload):
+    series_id: Scalar = None
+    series_name: Optional[str] = None
+    matches: List[MatchEntry] = []
+
+
+class SeriesMatchBlock(Payload):
+    series_ad_wrapper: Optional[SeriesAdWrapper] = None
+
+
+class TypeMatches(Payload):
+    match_type: Optional[str] = None
+    series_matches: List[SeriesMatchBlock] = []
+
+
+class MatchesFeed(Payload):
+    type_matches: List[TypeMatches] = []
+
+
+# ----------------------
+# Decoding
+# ----------------------
+_DECODERS = {}
+
+
+def decoder(payload_type):
+    """Cached msgspec JSON decoder for a payload struct."""
+    if payload_type not in _DECODERS:
+        _DECODERS[payload_type] = msgspec.json.Decoder(payload_type)
+    return _DECODERS[payload_type]
+
+
+def decode(data, payload_type, source=None):
+    """Decode JSON bytes/str into `payload_type`; raises PayloadError on bad input."""
+    try:
+        return decoder(payload_type).decode(data)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise PayloadError(f"{source or payload_type.__name__}: {e}") from e
+
+
+def convert(obj, payload_type, source=None):
+    """Validate an already-parsed dict (e.g. a fresh API response) into `payload_type`."""
+    try:
+        return msgspec.convert(obj, payload_type)
+    except msgspec.ValidationError as e:
+        raise PayloadError(f"{source or payload_type.__name__}: {e}") from e
+
+
+def load(path, payload_type):
+    """Read and decode a cached payload file."""
+    with open(path, "rb") as f:
+        return decode(f.read(), payload_type, source=path)
@@ -0,0 +1,205 @@
+import argparse
+import os
+import re
+import threading
+from datetime import date
+from typing import NamedTuple, Optional
+
+from utils import storage
+
+# ----------------------
+# Query catalog
+# ----------------------
+# queries.sql is parsed once per process (and again only when the file's
+# mtime or size changes) into Query records shared by the Queries page,
+# explain_check and the benchmarks. Nothing here touches the network.
+#
+# Each query starts with a header comment:
+#
+#   -- Que 7 - Highest score per format
+#
+# and may declare parameters right below it, referenced in the SQL as
+# %(name)s:
+#
+#   -- @param country text = "New Zealand"   Country
+#   -- @param format choice(TEST|ODI|T20) = ODI   Format
+#   -- @param season year = 2024   Season
+#
+# (name, type, optional default, optional label). Types: text, int, float,
+# date (YYYY-MM-DD), choice(a|b|...) and year. A year also binds
+# %(<name>_start)s / %(<name>_end)s, the half-open date range of that year,
+# so a season filter stays an index range on a DATE column instead of a
+# YEAR(column) = N predicate. A query can also set its
+# own execution time limit in seconds (utils/query_exec.py):
+#
+#   -- @timeout 60
+
+QUERIES_PATH = os.path.join(storage.ROOT_DIR, "queries.sql")
+
+_HEADER_RE = re.compile(r"^(?=--\s*Que\s+\d+)", re.M)
+_TITLE_RE = re.compile(r"--\s*Que\s+(\d+)\s*-?\s*(.*)")
+_PARAM_RE = re.compile(r'--\s*@param\s+(\w+)\s+(\w+)(?:\(([^)]*)\))?(?:\s*=\s*("[^"]*"|\S+))?\s*(.*)')
+_TIMEOUT_RE = re.compile(r"--\s*@timeout\s+(\d+(?:\.\d+)?)\s*$")
+_PLACEHOLDER_RE = re.compile(r"%\((\w+)\)s")
+
+
+PARAM_TYPES = ("text", "int", "float", "date", "choice", "year")
+
+
+class Param(NamedTuple):
+    name: str
+    type: str
+    default: Optional[str] = None
+    label: str = ""
+    options: tuple = ()           # choice values
+
+    def convert(self, value):
+        """A widget / CLI value as the type the query expects."""
+        if value is None or value == "":
+            value = self.default
+        if value is None:
+            raise ValueError(f"parameter {self.name} has no value")
+        if self.type in ("int", "year"):
+            return int(value)
+        if self.type == "float":
+            return float(value)
+        if self.type == "date":
+            return (value if isinstance(value, date) else date.fromisoformat(str(value))).isoformat()
+        if self.type == "choice" and str(value) not in self.options:
+            raise ValueError(f"parameter {self.name} must be one of {', '.join(self.options)}")
+        return str(value)
+
+    def placeholders(self):
+        """Names this parameter binds in the SQL."""
+        if self.type == "year":
+            return (self.name, f"{self.name}_start", f"{self.name}_end")
+        return (self.name,)
+
+
+class Query(NamedTuple):
+    id: str            # "Que 7"
+    number: int
+    title: str
+    sql: str           # without the trailing ';' or @param / @timeout lines
+    params: tuple = ()
+    timeout: Optional[float] = None   # seconds; None -> the default limit
+
+    @property
+    def label(self):
+        return f"{self.id} - {self.title}"
+
+
+def parse_queries(script):
+    """[Query] from the text of a queries.sql file."""
+    queries = []
+    for block in _HEADER_RE.split(script):
+        header, _, body = block.partition("\n")
+        m = _TITLE_RE.match(header.strip())
+        if not m:
+            continue
+        params, lines, timeout = [], [], None
+        for line in body.splitlines():
+            p = _PARAM_RE.match(line.strip())
+            t = _TIMEOUT_RE.match(line.strip())
+            if p:
+                ptype = p.group(2).lower()
+                if ptype not in PARAM_TYPES:
+                    raise ValueError(f"Que {m.group(1)}: unknown parameter type '{ptype}'")
+                options = tuple(o.strip() for o in (p.group(3) or "").split("|") if o.strip())
+                default = p.group(4).strip('"') if p.group(4) is not None else None
+                params.append(Param(p.group(1), ptype, default, p.group(5).strip(), options))
+            elif t:
+                timeout = float(t.group(1))
+            else:
+                lines.append(line)
+        sql = "\n".join(lines).strip().rstrip(";").strip()
+        if not sql:
+            continue
+        declared = {name for p in params for name in p.placeholders()}
+        undeclared = [name for name in dict.fromkeys(_PLACEHOLDER_RE.findall(sql)) if name not in declared]
+        if undeclared:
+            raise ValueError(f"Que {m.group(1)}: placeholder(s) without @param: {', '.join(undeclared)}")
+        queries.append(Query(f"Que {m.group(1)}", int(m.group(1)), m.group(2).strip(), sql, tuple(params), timeout))
+    return queries
+
+
+# ----------------------
+# Cached catalog
+# ----------------------
+_CACHE = {}        # path -> ((mtime_ns, size), [Query])
+_LOCK = threading.Lock()
+
+
+def load_catalog(path=QUERIES_PATH):
+    """[Query] for queries.sql; re-parsed only when the file changed."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    with _LOCK:
+        cached = _CACHE.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            queries = parse_queries(f.read())
+        _CACHE[path] = (key, queries)
+        return queries
+
+
+def get(query_id, path=QUERIES_PATH):
+    """The Query with this id ("Que 7" or 7)."""
+    if isinstance(query_id, int) or str(query_id).isdigit():
+        query_id = f"Que {int(query_id)}"
+    for query in load_catalog(path):
+        if query.id == query_id:
+            return query
+    raise KeyError(query_id)
+
+
+def bind(query, values=None):
+    """
+    Execution parameters of a query: `values` (by name) converted to their
+    types, defaults for the rest, year ranges expanded. None without params.
+    """
+    if not query.params:
+        return None
+    values = values or {}
+    bound = {}
+    for p in query.params:
+        value = p.convert(values.get(p.name))
+        bound[p.name] = value
+        if p.type == "year":
+            bound[f"{p.name}_start"] = f"{value:04d}-01-01"
+            bound[f"{p.name}_end"] = f"{value + 1:04d}-01-01"
+    return bound
+
+
+def labels(path=QUERIES_PATH):
+    """'Que N - Title' for every query, in file order."""
+    return [query.label for query in load_catalog(path)]
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the queries in queries.sql")
+    parser.add_argument("--queries", default=QUERIES_PATH, help="Path to queries.sql")
+    parser.add_argument("--show", help="Print the SQL of one query (e.g. 7 or 'Que 7')")
+    args = parser.parse_args()
+
+    if args.show:
+        query = get(args.show, args.queries)
+        print(f"-- {query.label}")
+        for p in query.params:
+            ptype = f"{p.type}({'|'.join(p.options)})" if p.options else p.type
+            print(f"-- @param {p.name} {ptype}" + (f" = {p.default}" if p.default is not None else ""))
+        if query.timeout is not None:
+            print(f"-- @timeout {query.timeout:g}")
+        print(query.sql + ";")
+    else:
+        for query in load_catalog(args.queries):
+            params = f"  ({', '.join(p.name for p in query.params)})" if query.params else ""
+            print(f"{query.label}{params}")
@@ -0,0 +1,354 @@
+import argparse
+import os
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from utils import storage
+
+# ----------------------
+# Query execution limits
+# ----------------------
+# Page queries run on a worker thread through a QueryHandle, so the page can
+# keep polling (and notice a rerun / Cancel click) while the database works:
+#
+#   handle = submit(pool, lambda conn: paging.fetch_page(conn, ...), timeout_s=30)
+#   while not handle.done(): ...          # update a spinner, honour reruns
+#   handle.cancel()                       # or handle.result()
+#
+# Limits:
+#   MySQL    SET SESSION MAX_EXECUTION_TIME (ms) for the borrowed connection,
+#            reset before it goes back to the pool; the server aborts the
+#            SELECT itself. MariaDB uses max_statement_time (s).
+#   all      a watchdog that cancels the query a little after the limit,
+#            for statements the server-side limit does not cover
+# Cancellation:
+#   MySQL    KILL QUERY <connection id> from a separate, short-lived
+#            connection (the pool may have no free one)
+#   DuckDB / SQLite   connection.interrupt()
+#
+# QUERY_TIMEOUT_S (default 30) is the limit for queries without their own
+# "-- @timeout N" line in queries.sql.
+#
+# fetch() runs page reads on MySQL as server-side prepared statements. A
+# borrowed connection keeps up to PREPARED_PER_CONNECTION of them (LRU), so
+# the count, page and download reads of one run share one parse / plan and
+# only send parameter values. Returning the connection to the pool resets
+# its session, which frees them (db_pool calls discard_prepared() first). SQLite keeps its own statement cache and
+# DuckDB plans cheaply, so the embedded engines execute directly.
+
+QUERY_TIMEOUT_S = float(os.getenv("QUERY_TIMEOUT_S", "30"))
+PREPARED_PER_CONNECTION = 32
+
+# Grace period before the watchdog steps in for a server-side limit
+WATCHDOG_GRACE_S = 2.0
+
+_ER_QUERY_INTERRUPTED = 1317      # KILL QUERY
+_ER_QUERY_TIMEOUT = 3024          # MAX_EXECUTION_TIME exceeded
+_ER_STATEMENT_TIMEOUT = 1969      # MariaDB max_statement_time exceeded
+
+
+class QueryTimeout(Exception):
+    """The query ran past its execution time limit and was aborted."""
+
+
+class QueryCancelled(Exception):
+    """The query was cancelled by the user."""
+
+
+def _is_mariadb(conn):
+    try:
+        return "mariadb" in conn.get_server_info().lower()
+    except Exception:
+        return False
+
+
+@contextmanager
+def execution_limit(conn, timeout_s):
+    """Server-side execution time limit for SELECTs on this connection (MySQL / MariaDB)."""
+    if storage.is_embedded() or not timeout_s:
+        yield
+        return
+    cur = conn.cursor()
+    if _is_mariadb(conn):
+        setting, value, reset = "max_statement_time", float(timeout_s), 0
+    else:
+        setting, value, reset = "MAX_EXECUTION_TIME", int(timeout_s * 1000), 0
+    cur.execute(f"SET SESSION {setting} = {value}")
+    try:
+        yield
+    finally:
+        try:
+            cur.execute(f"SET SESSION {setting} = {reset}")
+        finally:
+            cur.close()
+
+
+def kill_query(connection_id, **connect_kwargs):
+    """KILL QUERY on MySQL from a separate connection."""
+    conn = storage.connect(**connect_kwargs)
+    try:
+        cur = conn.cursor()
+        cur.execute(f"KILL QUERY {int(connection_id)}")
+        cur.close()
+    finally:
+        conn.close()
+
+
+# ----------------------
+# Prepared statements
+# ----------------------
+_PREPARED = weakref.WeakKeyDictionary()    # raw connection -> OrderedDict(sql -> (sql, cursor))
+_PREPARED_LOCK = threading.Lock()
+
+
+def _prepared_cursor(raw, sql):
+    """(sql, cursor) prepared on this connection; the same sql object must be passed back."""
+    with _PREPARED_LOCK:
+        statements = _PREPARED.setdefault(raw, OrderedDict())
+        entry = statements.get(sql)
+        if entry is not None:
+            statements.move_to_end(sql)
+            return entry
+        entry = (sql, raw.cursor(prepared=True))
+        statements[sql] = entry
+        evicted = statements.popitem(last=False)[1] if len(statements) > PREPARED_PER_CONNECTION else None
+    if evicted is not None:
+        try:
+            evicted[1].close()
+        except Exception:
+            pass
+    return entry
+
+
+def discard_prepared(raw):
+    """Close and forget the statements prepared on a raw connection (before its session is reset)."""
+    with _PREPARED_LOCK:
+        statements = _PREPARED.pop(raw, None)
+    for _, cur in (statements or {}).values():
+        try:
+            cur.close()
+        except Exception:
+            pass
+
+
+def prepared_count(conn):
+    """Statements currently prepared on a (pooled) connection."""
+    return len(_PREPARED.get(getattr(conn, "raw", conn), ()))
+
+
+def fetch(conn, sql, params=None):
+    """
+    (column names, rows) of a read query with %(name)s parameters; on MySQL
+    through a prepared statement reused by later calls on the connection.
+    """
+    if storage.is_embedded():
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params)
+            return [d[0] for d in cur.description], cur.fetchall()
+        finally:
+            cur.close()
+    positional, values = storage.bind_named(sql, params or {}, placeholder="?")
+    statement, cur = _prepared_cursor(getattr(conn, "raw", conn), positional)
+    cur.execute(statement, values)
+    return [d[0] for d in cur.description], cur.fetchall()
+
+
+# ----------------------
+# Query handles
+# ----------------------
+class QueryHandle:
+    """One query running on a worker thread with a time limit; cancel() aborts it."""
+
+    def __init__(self, pool, fn, timeout_s=QUERY_TIMEOUT_S):
+        self.pool = pool
+        self.fn = fn
+        self.timeout_s = timeout_s
+        self.started = None
+        self.finished = None
+        self.cancelled = False
+        self.timed_out = False
+        self._conn = None
+        self._connection_id = None
+        self._result = None
+        self._error = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        threading.Thread(target=self._run, daemon=True, name="query-exec").start()
+        if self.timeout_s:
+            grace = 0 if storage.is_embedded() else WATCHDOG_GRACE_S
+            self._watchdog = threading.Timer(self.timeout_s + grace, self._expire)
+            self._watchdog.daemon = True
+            self._watchdog.start()
+        return self
+
+    def _run(self):
+        try:
+            with self.pool.connection() as conn:
+                with self._lock:
+                    self._conn = conn
+                    if not storage.is_embedded():
+                        self._connection_id = conn.connection_id
+                try:
+                    if self.cancelled:
+                        raise QueryCancelled("query cancelled before it started")
+                    with execution_limit(conn, self.timeout_s):
+                        self._result = self.fn(conn)
+                finally:
+                    with self._lock:
+                        self._conn = None
+        except Exception as e:
+            self._error = self._classify(e)
+        finally:
+            self.finished = time.perf_counter()
+            if self._watchdog is not None:
+                self._watchdog.cancel()
+            self._done.set()
+
+    def _classify(self, error):
+        if isinstance(error, (QueryCancelled, QueryTimeout)):
+            return error
+        errno = getattr(error, "errno", None)
+        interrupted = errno in (_ER_QUERY_INTERRUPTED, _ER_QUERY_TIMEOUT, _ER_STATEMENT_TIMEOUT) or \
+            re.search(r"interrupt", str(error), re.I)
+        if self.timed_out or errno in (_ER_QUERY_TIMEOUT, _ER_STATEMENT_TIMEOUT):
+            return QueryTimeout(f"query exceeded its {self.timeout_s:g}s limit")
+        if self.cancelled and interrupted:
+            return QueryCancelled("query cancelled")
+        return error
+
+    def _abort(self):
+        with self._lock:
+            conn, connection_id = self._conn, self._connection_id
+        if conn is None:
+            return
+        if storage.is_embedded():
+            conn.interrupt()
+        elif connection_id is not None:
+            kill_query(connection_id, **self.pool.connect_kwargs)
+
+    def _expire(self):
+        if not self._done.is_set():
+            self.timed_out = True
+            self._abort()
+
+    def cancel(self):
+        """Abort the query if it is still running."""
+        if self._done.is_set():
+            return
+        self.cancelled = True
+        self._abort()
+
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def elapsed(self):
+        end = self.finished or time.perf_counter()
+        return end - self.started if self.started else 0.0
+
+    def result(self, timeout=None):
+        """fn's return value; raises QueryTimeout / QueryCancelled / the query's error."""
+        if not self._done.wait(timeout):
+            raise TimeoutError("query still running")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def submit(pool, fn, timeout_s=QUERY_TIMEOUT_S):
+    """Run fn(conn) on a pooled connection in the background; returns its QueryHandle."""
+    return QueryHandle(pool, fn, timeout_s).start()
+
+
+def run(pool, fn, timeout_s=QUERY_TIMEOUT_S):
+    """submit() and wait for the result."""
+    return submit(pool, fn, timeout_s).result()
+
+
+# ----------------------
+# EXPLAIN / profile
+# ----------------------
+_ANALYZE_RE = re.compile(r"actual time=[\d.]+\.\.([\d.]+) rows=([\d.]+)")
+
+
+def _handler_reads(cur):
+    cur.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(v) for _, v in cur.fetchall())
+
+
+def explain_analyze(conn, sql, params=None):
+    """
+    Run the query under the profiler: {"plan", "elapsed_ms", "rows", "rows_examined"}.
+    MySQL: EXPLAIN ANALYZE (8.0.18+) and rows examined from the session's
+    Handler_read_* counters. DuckDB: EXPLAIN ANALYZE. SQLite: EXPLAIN QUERY
+    PLAN plus a timed run (rows examined is not available).
+    """
+    cur = conn.cursor()
+    try:
+        if storage.DB_BACKEND == "mysql":
+            before = _handler_reads(cur)
+            start = time.perf_counter()
+            cur.execute(f"EXPLAIN ANALYZE {sql}", params)
+            plan = "\n".join(row[0] for row in cur.fetchall())
+            elapsed = (time.perf_counter() - start) * 1000
+            examined = _handler_reads(cur) - before
+            top = _ANALYZE_RE.search(plan)
+            return {"plan": plan, "elapsed_ms": round(float(top.group(1)) if top else elapsed, 2),
+                    "rows": int(float(top.group(2))) if top else None, "rows_examined": examined}
+
+        if storage.DB_BACKEND == "duckdb":
+            start = time.perf_counter()
+            cur.execute(f"EXPLAIN ANALYZE {sql}", params)
+            plan = "\n".join(row[-1] for row in cur.fetchall())
+            elapsed = (time.perf_counter() - start) * 1000
+        else:
+            cur.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = "\n".join(row[-1] for row in cur.fetchall())
+            elapsed = None
+
+        start = time.perf_counter()
+        cur.execute(sql, params)
+        rows = len(cur.fetchall())
+        elapsed = elapsed if elapsed is not None else (time.perf_counter() - start) * 1000
+        return {"plan": plan, "elapsed_ms": round(elapsed, 2), "rows": rows, "rows_examined": None}
+    finally:
+        cur.close()
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    from utils import db_pool, query_catalog
+
+    parser = argparse.ArgumentParser(description="Profile queries from queries.sql with a time limit")
+    parser.add_argument("queries", nargs="*", help="Query ids (default: every query)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds per query (default: @timeout or QUERY_TIMEOUT_S)")
+    parser.add_argument("--plan", action="store_true", help="Print each EXPLAIN ANALYZE plan")
+    args = parser.parse_args()
+
+    pool = db_pool.get_pool()
+    selected = [query_catalog.get(q) for q in args.queries] or query_catalog.load_catalog()
+    for query in selected:
+        limit = args.timeout or query.timeout or QUERY_TIMEOUT_S
+        try:
+            params = query_catalog.bind(query)
+            profile = run(pool, lambda conn: explain_analyze(conn, query.sql, params), limit)
+        except QueryTimeout as e:
+            print(f"⏱️ {query.id}: {e}")
+            continue
+        examined = profile["rows_examined"]
+        print(f"✅ {query.id}: {profile['elapsed_ms']} ms, {profile['rows']} rows"
+              + (f", {examined} rows examined" if examined is not None else ""))
+        if args.plan:
+            print(profile["plan"])
+    db_pool.close_all()
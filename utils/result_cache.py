@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# ----------------------
+# Query result cache
+# ----------------------
+# The data only changes when db_loader (or a streamed / scorecard refresh)
+# commits, so query results are cached under
+#
+#   (query id, parameters, data version)
+#
+# where the data version is the single row of the data_version table
+# (migration 006), bumped by bump_data_version() after every write path.
+# A new version never matches an old key, so entries are invalidated
+# exactly when new data lands; entries of other versions are dropped as
+# soon as a lookup sees the new one. Versions are millisecond timestamps,
+# so a blue-green swap (whose shadow carries its own row) still moves
+# forward, and a rollback lands back on the older version's entries.
+#
+# Entries live in a size-bounded in-process LRU (RESULT_CACHE_MB, default
+# 64). Set RESULT_CACHE_PATH to a SQLite file to share results across
+# Streamlit worker processes; the local LRU then sits in front of it.
+
+RESULT_CACHE_MB = float(os.getenv("RESULT_CACHE_MB", "64"))
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "")
+
+
+# ----------------------
+# Data version
+# ----------------------
+def data_version(conn):
+    """Current data version, or None when the data_version table is missing."""
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT version FROM data_version WHERE id = 1")
+        row = cur.fetchone()
+    except Exception:
+        return None
+    finally:
+        cur.close()
+    return row[0] if row else 0
+
+
+def bump_data_version(conn):
+    """Advance the data version (call after committing new data); returns it."""
+    current = data_version(conn) or 0
+    version = max(current + 1, int(time.time() * 1000))
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO data_version (id, version, updated_at) VALUES (1, %s, %s)
+        ON DUPLICATE KEY UPDATE version=VALUES(version), updated_at=VALUES(updated_at)
+    """, (version, datetime.now()))
+    conn.commit()
+    cur.close()
+    return version
+
+
+def make_key(query_id, params, version):
+    return f"{query_id}|{json.dumps(params or {}, sort_keys=True, default=str)}|{version}"
+
+
+def _size_of(value):
+    try:
+        return int(value.memory_usage(index=True, deep=True).sum())
+    except AttributeError:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# ----------------------
+# Shared tier
+# ----------------------
+class SharedStore:
+    """SQLite-backed result store shared by every process using the same file."""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                value BLOB NOT NULL
+            )
+        """)
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+        return pickle.loads(row[0])
+
+    def put(self, key, version, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO results (key, version, size, last_used, value) VALUES (?,?,?,?,?)",
+                     (key, version, len(blob), time.time(), blob))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total > self.max_bytes:
+            # evict least recently used rows until back under the limit
+            freed = 0
+            for old_key, size in conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+                if total - freed <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                freed += size
+        conn.commit()
+
+    def drop_other_versions(self, version):
+        conn = self._conn()
+        conn.execute("DELETE FROM results WHERE version != ?", (version,))
+        conn.commit()
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM results")
+        conn.commit()
+
+    def stats(self):
+        entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+# ----------------------
+# Result cache
+# ----------------------
+class ResultCache:
+    """Size-bounded LRU of query results keyed on (query id, params, data version)."""
+
+    def __init__(self, max_mb=RESULT_CACHE_MB, path=RESULT_CACHE_PATH or None):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.shared = SharedStore(path, self.max_bytes) if path else None
+        self._entries = OrderedDict()     # key -> (value, size)
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _see_version(self, version):
+        """Drop every entry of another data version once a new one shows up."""
+        if version == self._version:
+            return
+        with self._lock:
+            if self._version is not None:
+                self._metrics["invalidations"] += 1
+            self._version = version
+            self._entries.clear()
+            self._bytes = 0
+        if self.shared is not None:
+            self.shared.drop_other_versions(version)
+
+    def _remember(self, key, value):
+        size = _size_of(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._metrics["evictions"] += 1
+
+    def get(self, query_id, params, version):
+        """Cached result or None."""
+        self._see_version(version)
+        key = make_key(query_id, params, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._metrics["hits"] += 1
+                return entry[0]
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self._metrics["shared_hits"] += 1
+                return value
+        with self._lock:
+            self._metrics["misses"] += 1
+        return None
+
+    def put(self, query_id, params, version, value):
+        self._see_version(version)
+        key = make_key(query_id, params, version)
+        self._remember(key, value)
+        if self.shared is not None:
+            self.shared.put(key, version, value)
+
+    def get_or_run(self, query_id, params, version, run):
+        """
+        (result, hit): the cached result, or run() stored under the key.
+        With version None (no data_version table) nothing is cached.
+        """
+        if version is None:
+            return run(), False
+        value = self.get(query_id, params, version)
+        if value is not None:
+            return value, True
+        value = run()
+        self.put(query_id, params, version, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics, entries=len(self._entries), bytes=self._bytes,
+                         max_bytes=self.max_bytes, version=self._version)
+        lookups = stats["hits"] + stats["shared_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["shared_hits"]) / lookups, 2) if lookups else None
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache():
+    """The process-wide ResultCache (configured from RESULT_CACHE_MB / RESULT_CACHE_PATH)."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ResultCache()
+        return _CACHE
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the query result cache")
+    parser.add_argument("--version", action="store_true", help="Print the current data version")
+    parser.add_argument("--bump", action="store_true", help="Bump the data version (invalidates cached results)")
+    parser.add_argument("--clear", action="store_true", help="Empty the shared cache file (RESULT_CACHE_PATH)")
+    args = parser.parse_args()
+
+    if args.version or args.bump:
+        from utils import db_loader
+
+        with db_loader.get_pool().connection() as conn:
+            if args.bump:
+                print(f"✅ Data version bumped to {bump_data_version(conn)}")
+            else:
+                print(f"Data version: {data_version(conn)}")
+    if args.clear:
+        if not RESULT_CACHE_PATH:
+            print("⚠️ RESULT_CACHE_PATH is not set; the in-process cache lives only in the page server")
+        else:
+            get_cache().clear()
+            print(f"✅ Cleared {RESULT_CACHE_PATH}")
+    if not (args.version or args.bump or args.clear):
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,221 @@
+import argparse
+from decimal import Decimal
+
+from utils import cache_warmer, db_loader, payloads
+from utils.aggregates import refresh_aggregates
+from utils.partitions import ensure_partitions
+from utils.db_loader import safe_float, safe_int
+from utils.result_cache import bump_data_version
+
+# ----------------------
+# Scorecard delta apply
+# ----------------------
+# A scorecard payload (mcenter/v1/{id}/scard) is turned into the rows it
+# implies for match_batting / match_bowling / match_fow, compared with what
+# is stored for that match, and only new or changed rows are written, with
+# every column. Rows that disappeared from an innings present in the payload
+# are deleted. Refreshing a live match therefore costs three SELECTs plus a
+# handful of upserts, and a finished match costs nothing.
+
+TABLES = {
+    "match_batting": {
+        "key": ("innings_id", "batsman_id"),
+        "player": "batsman_id",     # summary tables are keyed on it
+        "columns": ("player_name", "runs", "balls", "fours", "sixes", "strike_rate", "dismissal"),
+    },
+    "match_bowling": {
+        "key": ("innings_id", "bowler_id"),
+        "player": "bowler_id",
+        "columns": ("player_name", "overs", "maidens", "runs", "wickets", "economy", "balls"),
+    },
+    "match_fow": {
+        "key": ("innings_id", "fow_order"),
+        "columns": ("batsman_id", "player_name", "score", "overs", "score_runs", "over_num"),
+    },
+}
+
+
+def parse_scorecard(sc):
+    """{table: {(innings_id, id): {column: value}}} for one payloads.Scorecard."""
+    rows = {table: {} for table in TABLES}
+    for inng in sc.scorecard:
+        iid = safe_int(inng.inningsid)
+
+        for b in inng.batsman:
+            pid = safe_int(b.id)
+            if not pid:
+                continue
+            rows["match_batting"][(iid, pid)] = {
+                "player_name": b.name,
+                "runs": safe_int(b.runs),
+                "balls": safe_int(b.balls),
+                "fours": safe_int(b.fours),
+                "sixes": safe_int(b.sixes),
+                "strike_rate": safe_float(b.strkrate),
+                "dismissal": b.outdec,
+            }
+
+        for bow in inng.bowler:
+            pid = safe_int(bow.id)
+            if not pid:
+                continue
+            rows["match_bowling"][(iid, pid)] = {
+                "player_name": bow.name,
+                "overs": safe_float(bow.overs),
+                "maidens": safe_int(bow.maidens),
+                "runs": safe_int(bow.runs),
+                "wickets": safe_int(bow.wickets),
+                "economy": safe_float(bow.economy),
+                "balls": safe_int(bow.balls),
+            }
+
+        for idx, fow in enumerate(inng.fow.fow if inng.fow else [], start=1):
+            pid = safe_int(fow.batsmanid)
+            if not pid:
+                continue
+            rows["match_fow"][(iid, idx)] = {
+                "batsman_id": pid,
+                "player_name": str(fow.batsmanname),
+                "score": str(fow.runs),
+                "overs": str(fow.overnbr),
+                "score_runs": safe_int(fow.runs),
+                "over_num": safe_float(fow.overnbr),
+            }
+    return rows
+
+
+def stored_rows(cursor, match_id):
+    """Same shape as parse_scorecard(), read from the database (each row also carries its match_year)."""
+    rows = {}
+    for table, spec in TABLES.items():
+        cols = spec["key"] + spec["columns"] + ("match_year",)
+        cursor.execute(f"SELECT {', '.join(cols)} FROM {table} WHERE match_id = %s", (match_id,))
+        n = len(spec["key"])
+        rows[table] = {tuple(r[:n]): dict(zip(cols[n:], r[n:])) for r in cursor.fetchall()}
+    return rows
+
+
+def _norm(value):
+    # FLOAT / DECIMAL columns come back with storage noise (133.33 -> 133.330002)
+    if isinstance(value, (float, Decimal)):
+        return round(float(value), 2)
+    return value
+
+
+def _changed(new, old):
+    return old is None or any(_norm(v) != _norm(old.get(k)) for k, v in new.items())
+
+
+def diff_scorecard(new, old):
+    """{table: (rows to upsert, keys to delete)}."""
+    delta = {}
+    for table in TABLES:
+        upserts = {k: row for k, row in new[table].items() if _changed(row, old[table].get(k))}
+        innings = {k[0] for k in new[table]}
+        deletes = [k for k in old[table] if k not in new[table] and k[0] in innings]
+        delta[table] = (upserts, deletes)
+    return delta
+
+
+def apply_scorecard(cursor, sc, match_id, match_year=0, removed=None):
+    """
+    Write the difference between a scorecard payload and the stored rows.
+    Returns {table: (rows upserted, rows deleted)}; all zeros when nothing changed.
+    Player ids of deleted rows are added to `removed` ({table: ids}) for
+    refresh_aggregates().
+    """
+    new, old = parse_scorecard(sc), stored_rows(cursor, match_id)
+    # Rows filed under another year (the 0 placeholder before the start date
+    # was known, or a rescheduled match) are deleted and written again:
+    # match_year is part of the MySQL primary key, so an upsert would leave
+    # the old copy behind.
+    moved = {}
+    for table in TABLES:
+        stale = [k for k, row in old[table].items() if row["match_year"] != match_year]
+        if stale:
+            cursor.execute(f"DELETE FROM {table} WHERE match_id = %s AND match_year <> %s", (match_id, match_year))
+            for k in stale:
+                del old[table][k]
+            moved[table] = stale
+
+    delta = diff_scorecard(new, old)
+    counts = {}
+    for table, (upserts, deletes) in delta.items():
+        spec = TABLES[table]
+        if upserts:
+            cols = ("match_id",) + spec["key"] + spec["columns"] + ("match_year",)
+            updates = ", ".join(f"{c}=VALUES({c})" for c in spec["columns"] + ("match_year",))
+            cursor.executemany(f"""
+                INSERT INTO {table} ({', '.join(cols)})
+                VALUES ({', '.join(['%s'] * len(cols))})
+                ON DUPLICATE KEY UPDATE {updates}
+            """, [
+                (match_id,) + key + tuple(row[c] for c in spec["columns"]) + (match_year,)
+                for key, row in upserts.items()
+            ])
+        for key in deletes:
+            where = " AND ".join(f"{c} = %s" for c in spec["key"])
+            cursor.execute(f"DELETE FROM {table} WHERE match_id = %s AND {where}", (match_id,) + key)
+        # moved rows the payload no longer has are deleted too
+        deletes = deletes + [k for k in moved.get(table, ()) if k not in new[table]]
+        if deletes and removed is not None and "player" in spec:
+            pos = spec["key"].index(spec["player"])
+            removed.setdefault(table, set()).update(key[pos] for key in deletes)
+        counts[table] = (len(upserts), len(deletes))
+    return counts
+
+
+def refresh_match(match_id, sc=None):
+    """
+    Re-fetch one match's scorecard (bypassing the cache) and apply the delta.
+    Summary tables are refreshed and the caches re-warmed when anything changed.
+    """
+    if sc is None:
+        from utils.fetch_api import fetch_scorecard
+        sc = fetch_scorecard(match_id, refresh=True)
+    if not sc:
+        print(f"⚠️ No scorecard for match {match_id}")
+        return {}
+    if isinstance(sc, dict):
+        sc = payloads.convert(sc, payloads.Scorecard, source=f"scorecard {match_id}")
+
+    with db_loader.get_pool().connection() as conn:
+        ensure_partitions(conn)
+        cursor = conn.cursor()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        cursor.execute("SELECT YEAR(start_date) FROM matches WHERE match_id = %s", (match_id,))
+        row = cursor.fetchone()
+        removed = {}
+        counts = apply_scorecard(cursor, sc, match_id, (row[0] if row else None) or 0, removed)
+        conn.commit()
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        cursor.close()
+
+        changed = any(up or dele for up, dele in counts.values())
+        if changed:
+            refresh_aggregates({match_id}, conn, removed)
+            bump_data_version(conn)
+
+    if changed:
+        # once the connection is back in the pool the warm-up borrows from
+        cache_warmer.after_bump(db_loader.get_pool())
+
+    summary = ", ".join(f"{t} +{up}/-{dele}" for t, (up, dele) in counts.items())
+    print(f"✅ Match {match_id}: {summary}")
+    return counts
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply scorecard changes for live matches")
+    parser.add_argument("--match", type=int, nargs="+", required=True, help="Match id(s) to refresh from the API")
+    parser.add_argument("--file", help="Apply this scorecard JSON instead of fetching (single match)")
+    args = parser.parse_args()
+
+    if args.file:
+        refresh_match(args.match[0], payloads.load(args.file, payloads.Scorecard))
+    else:
+        for mid in args.match:
+            refresh_match(mid)
@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from utils import storage
+
+# ----------------------
+# Parquet snapshots
+# ----------------------
+# Versioned, hive-partitioned Parquet copies of the analytics tables,
+# written after db_loader so large scans can skip the database:
+#
+#   snapshots/
+#     LATEST                       -> "v20250914T101500"
+#     v20250914T101500/
+#       _manifest.json
+#       match_batting/format=ODI/year=2024/part-0.parquet
+#       ...
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(storage.ROOT_DIR, "snapshots"))
+CHUNK_ROWS = 50_000
+
+# Exported tables: the query feeding them, their Arrow schema and the
+# partition columns (which must be the last columns of the schema).
+EXPORTS = {
+    "matches": {
+        "sql": """
+            SELECT m.match_id, m.series_id, m.name, m.start_date, m.end_date,
+                   m.state, m.status, m.venue_id, m.format, YEAR(m.start_date) AS year
+            FROM v_matches m
+        """,
+        "schema": pa.schema([
+            ("match_id", pa.int64()), ("series_id", pa.int64()), ("name", pa.string()),
+            ("start_date", pa.timestamp("s")), ("end_date", pa.timestamp("s")),
+            ("state", pa.string()), ("status", pa.string()), ("venue_id", pa.int64()),
+            ("format", pa.string()), ("year", pa.int32()),
+        ]),
+        "partition": ["format", "year"],
+    },
+    "match_batting": {
+        "sql": """
+            SELECT mb.match_id, mb.innings_id, mb.batsman_id, mb.player_name, mb.runs, mb.balls,
+                   mb.fours, mb.sixes, mb.strike_rate, mb.dismissal,
+                   m.format, YEAR(m.start_date) AS year
+            FROM match_batting mb
+            LEFT JOIN v_matches m ON m.match_id = mb.match_id
+        """,
+        "schema": pa.schema([
+            ("match_id", pa.int64()), ("innings_id", pa.int32()), ("batsman_id", pa.int64()),
+            ("player_name", pa.string()), ("runs", pa.int32()), ("balls", pa.int32()),
+            ("fours", pa.int32()), ("sixes", pa.int32()), ("strike_rate", pa.float64()),
+            ("dismissal", pa.string()),
+            ("format", pa.string()), ("year", pa.int32()),
+        ]),
+        "partition": ["format", "year"],
+    },
+    "match_bowling": {
+        "sql": """
+            SELECT mbw.match_id, mbw.innings_id, mbw.bowler_id, mbw.player_name, mbw.overs,
+                   mbw.maidens, mbw.runs, mbw.wickets, mbw.economy, mbw.balls,
+                   m.format, YEAR(m.start_date) AS year
+            FROM match_bowling mbw
+            LEFT JOIN v_matches m ON m.match_id = mbw.match_id
+        """,
+        "schema": pa.schema([
+            ("match_id", pa.int64()), ("innings_id", pa.int32()), ("bowler_id", pa.int64()),
+            ("player_name", pa.string()), ("overs", pa.float64()), ("maidens", pa.int32()),
+            ("runs", pa.int32()), ("wickets", pa.int32()), ("economy", pa.float64()),
+            ("balls", pa.int32()),
+            ("format", pa.string()), ("year", pa.int32()),
+        ]),
+        "partition": ["format", "year"],
+    },
+    "player_stats": {
+        "sql": """
+            SELECT player_id, matches, innings, runs, balls, highest, average, strike_rate,
+                   not_outs, fours, sixes, ducks, fifties, hundreds, double_hundreds,
+                   triple_hundreds, quadruple_hundreds, highest_runs, highest_not_out, format
+            FROM v_player_stats
+        """,
+        "schema": pa.schema([
+            ("player_id", pa.int64()), ("matches", pa.int32()), ("innings", pa.int32()),
+            ("runs", pa.int32()), ("balls", pa.int32()), ("highest", pa.string()),
+            ("average", pa.float64()), ("strike_rate", pa.float64()), ("not_outs", pa.int32()),
+            ("fours", pa.int32()), ("sixes", pa.int32()), ("ducks", pa.int32()),
+            ("fifties", pa.int32()), ("hundreds", pa.int32()), ("double_hundreds", pa.int32()),
+            ("triple_hundreds", pa.int32()), ("quadruple_hundreds", pa.int32()),
+            ("highest_runs", pa.int32()), ("highest_not_out", pa.bool_()),
+            ("format", pa.string()),
+        ]),
+        "partition": ["format"],
+    },
+}
+
+
+# ----------------------
+# Export
+# ----------------------
+def _to_array(values, typ):
+    if pa.types.is_timestamp(typ):
+        # SQLite hands DATETIME columns back as ISO strings
+        values = [datetime.fromisoformat(v) if isinstance(v, str) else v for v in values]
+    elif pa.types.is_boolean(typ):
+        # MySQL BOOLEAN is TINYINT(1)
+        values = [None if v is None else bool(v) for v in values]
+    return pa.array(values, type=typ)
+
+
+def _batches(cursor, schema):
+    while True:
+        rows = cursor.fetchmany(CHUNK_ROWS)
+        if not rows:
+            break
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [_to_array(col, field.type) for col, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def export_table(conn, table, version_dir):
+    """Stream one table into a hive-partitioned Parquet dataset; returns the row count."""
+    spec = EXPORTS[table]
+    schema = spec["schema"]
+    partitioning = ds.partitioning(
+        pa.schema([schema.field(c) for c in spec["partition"]]), flavor="hive"
+    )
+
+    rows = 0
+
+    def counted(batches):
+        nonlocal rows
+        for batch in batches:
+            rows += batch.num_rows
+            yield batch
+
+    cur = conn.cursor()
+    cur.execute(spec["sql"])
+    ds.write_dataset(
+        counted(_batches(cur, schema)),
+        os.path.join(version_dir, table),
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning,
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="error",
+    )
+    cur.close()
+    return rows
+
+
+def export_snapshot(conn=None, root=SNAPSHOT_DIR, tables=None, keep=3):
+    """
+    Write a new snapshot version of the analytics tables and point LATEST at it.
+
+    The version is built in a temporary directory and renamed into place,
+    so readers never see a half-written snapshot.
+    """
+    own = conn is None
+    conn = conn or storage.connect()
+    tables = tables or list(EXPORTS)
+
+    version = datetime.now().strftime("v%Y%m%dT%H%M%S")
+    tmp_dir = os.path.join(root, f".{version}.tmp")
+    os.makedirs(tmp_dir, exist_ok=False)
+
+    try:
+        counts = {}
+        for table in tables:
+            counts[table] = export_table(conn, table, tmp_dir)
+            print(f"✅ Snapshot {table}: {counts[table]} rows")
+
+        with open(os.path.join(tmp_dir, "_manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "version": version,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "backend": storage.DB_BACKEND,
+                "tables": {t: {"rows": counts[t], "partition": EXPORTS[t]["partition"]} for t in tables},
+            }, f, indent=2)
+
+        os.rename(tmp_dir, os.path.join(root, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    finally:
+        if own:
+            conn.close()
+
+    latest_tmp = os.path.join(root, "LATEST.tmp")
+    with open(latest_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(root, "LATEST"))
+
+    prune_snapshots(root, keep=keep)
+    print(f"🎉 Snapshot {version} written to {root}")
+    return version
+
+
+def prune_snapshots(root=SNAPSHOT_DIR, keep=3):
+    """Delete all but the newest `keep` snapshot versions."""
+    for version in list_versions(root)[:-keep] if keep else []:
+        shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+# ----------------------
+# Reader API
+# ----------------------
+def list_versions(root=SNAPSHOT_DIR):
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root) if d.startswith("v") and os.path.isdir(os.path.join(root, d)))
+
+
+def latest_version(root=SNAPSHOT_DIR):
+    path = os.path.join(root, "LATEST")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    versions = list_versions(root)
+    return versions[-1] if versions else None
+
+
+def open_dataset(table, version=None, root=SNAPSHOT_DIR):
+    """Memory-mapped pyarrow Dataset over one table of a snapshot (latest by default)."""
+    version = version or latest_version(root)
+    if not version:
+        raise FileNotFoundError(f"No snapshots found in {root}")
+    spec = EXPORTS[table]
+    partitioning = ds.partitioning(
+        pa.schema([spec["schema"].field(c) for c in spec["partition"]]), flavor="hive"
+    )
+    return ds.dataset(
+        os.path.join(root, version, table),
+        format="parquet",
+        partitioning=partitioning,
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def _filter_expression(filters):
+    """{"format": "ODI", "year": [2023, 2024]} -> pyarrow expression (partitions are pruned)."""
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    expr = None
+    for col, value in filters.items():
+        term = ds.field(col).isin(value) if isinstance(value, (list, tuple, set)) else ds.field(col) == value
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def read_table(table, columns=None, filters=None, version=None, root=SNAPSHOT_DIR):
+    """Read a snapshot table as an Arrow Table."""
+    return open_dataset(table, version, root).to_table(columns=columns, filter=_filter_expression(filters))
+
+
+def read_frame(table, columns=None, filters=None, version=None, root=SNAPSHOT_DIR):
+    """Read a snapshot table as a pandas DataFrame."""
+    return read_table(table, columns, filters, version, root).to_pandas()
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parquet snapshot export")
+    parser.add_argument("--export", action="store_true", help="Write a new snapshot version")
+    parser.add_argument("--tables", nargs="+", choices=list(EXPORTS), help="Tables to export (default: all)")
+    parser.add_argument("--keep", type=int, default=3, help="Number of snapshot versions to keep")
+    parser.add_argument("--list", action="store_true", help="List snapshot versions")
+    args = parser.parse_args()
+
+    if args.export:
+        export_snapshot(tables=args.tables, keep=args.keep)
+
+    if args.list:
+        latest = latest_version()
+        for v in list_versions():
+            print(f"{v}{'  (latest)' if v == latest else ''}")
+
+    if not (args.export or args.list):
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,56 @@
+# ----------------------
+# Stats grid decoder
+# ----------------------
+# Cricbuzz stats endpoints (player batting / bowling, career, rankings)
+# return a grid: a header row of columns and one row per metric.
+#
+#   {"headers": ["ROWHEADER", "Test", "ODI", "T20"],
+#    "values": [{"values": ["Matches", "105", "230", "98"]},
+#               {"values": ["Runs", "8848", "12898", "3612"]}, ...]}
+#
+# decode_grid() transposes it into one record per column:
+# {"Test": {"Matches": "105", "Runs": "8848"}, "ODI": {...}}.
+# Values are left as the API sent them; the loaders parse them.
+#
+# The payload may be the raw dict or a payloads.StatsGrid struct.
+
+
+def _rows(payload):
+    """(headers, [row values]) from a dict or StatsGrid payload."""
+    if payload is None:
+        return (), []
+    if isinstance(payload, dict):
+        return payload.get("headers") or (), [row.get("values") or () for row in payload.get("values") or ()]
+    return payload.headers, [row.values for row in payload.values]
+
+
+def decode_grid(payload, skip_first=True):
+    """
+    {column: {metric: value}} from a headers/values grid, in header order.
+
+    Column names are stripped; short rows leave the missing metrics out and
+    empty rows are skipped. skip_first drops the leading row-label header
+    ("ROWHEADER").
+    """
+    headers, grid = _rows(payload)
+    columns = [str(h).strip() for h in (headers[1:] if skip_first else headers)]
+    try:
+        # one dict per column straight from the rows (the normal, rectangular case)
+        return {col: {values[0]: values[i] for values in grid} for i, col in enumerate(columns, 1)}
+    except IndexError:
+        pass
+
+    # ragged grid: a short row only fills the columns it has
+    records = {col: {} for col in columns}
+    targets = [records[col] for col in columns]
+    for values in grid:
+        if values:
+            metric = values[0]
+            for record, value in zip(targets, values[1:]):
+                record[metric] = value
+    return records
+
+
+def grid_cells(payload):
+    """Number of value cells in a grid (for throughput reporting)."""
+    return sum(max(len(values) - 1, 0) for values in _rows(payload)[1])
@@ -0,0 +1,513 @@
+import argparse
+import math
+import os
+import re
+import sqlite3
+
+from dotenv import load_dotenv
+
+# ----------------------
+# Storage backends
+# ----------------------
+# The loaders and pages are written against MySQL. DB_BACKEND selects where
+# they actually run:
+#   mysql  - the MySQL/MariaDB server from DB_HOST/DB_USER/... (default)
+#   duckdb - an embedded, columnar DuckDB file at DB_PATH
+#   sqlite - an embedded SQLite file at DB_PATH
+# For the embedded engines, MySQL-only syntax in schema.sql, queries.sql and
+# the loaders is rewritten on the fly by translate(), once per statement text
+# and connection.
+#
+# DuckDB runs a single-row statement in ~5 ms however small it is, so on
+# DuckDB the loaders' one-row INSERTs are buffered per statement and sent as
+# multi-row INSERT ... VALUES batches. The buffer is flushed before any other
+# statement (reads see every write), before a second write of the same key,
+# and on commit; a constraint error is raised by the statement that flushes it.
+load_dotenv()
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_PATH = os.path.join(ROOT_DIR, "schema.sql")
+
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+DB_PATH = os.getenv("DB_PATH", os.path.join(ROOT_DIR, f"cricbuzz.{DB_BACKEND}"))
+
+BACKENDS = ("mysql", "duckdb", "sqlite")
+
+
+class IntegrityError(Exception):
+    """Constraint violation raised by an embedded backend."""
+
+
+def is_embedded(backend=None):
+    return (backend or DB_BACKEND) in ("duckdb", "sqlite")
+
+
+# ----------------------
+# Dialect translation
+# ----------------------
+# Literals and comments are swapped out for sentinels before rewriting so
+# that '%not out%' or an apostrophe in a comment is never touched.
+_TOKEN_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.S)
+_SENTINEL_RE = re.compile(r"\x00(\d+)\x00")
+
+_UPSERT_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$", re.I | re.S)
+_INSERT_TABLE_RE = re.compile(r"^\s*INSERT\s+(?:IGNORE\s+)?INTO\s+([\w.]+)", re.I)
+_VALUES_FN_RE = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.I)
+_SKIPPED_RE = re.compile(r"^\s*(SET\s+FOREIGN_KEY_CHECKS|CREATE\s+DATABASE|USE\s)", re.I)
+_DDL_RE = re.compile(r"^\s*(CREATE|ALTER|DROP)\b", re.I)
+_WRITE_RE = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|ALTER|DROP)\b", re.I)
+_FK_RE = re.compile(r",\s*FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+\w+\s*\([^)]*\)", re.I)
+_AUTO_INC_RE = re.compile(r"\b(\w+)\s+INT(?:EGER)?\s+AUTO_INCREMENT\s+PRIMARY\s+KEY", re.I)
+_CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.I)
+_ROW_INSERT_RE = re.compile(
+    r"^\s*INSERT\s+(?:OR\s+IGNORE\s+)?INTO\s+(\w+)\s*\(([^()]*)\)\s*VALUES\s*(\([^()]*\))\s*(ON\s+CONFLICT\b.*)?$",
+    re.I | re.S)
+
+TRANSLATE_CACHE_SIZE = 1024     # statement texts kept per connection
+BATCH_ROWS = 500                # rows per multi-row INSERT on DuckDB
+
+
+def _mask(sql):
+    """Replace literals with sentinels and drop comments."""
+    literals = []
+
+    def repl(m):
+        text = m.group(0)
+        if text.startswith("--") or text.startswith("/*"):
+            return " "
+        literals.append(text)
+        return f"\x00{len(literals) - 1}\x00"
+
+    return _TOKEN_RE.sub(repl, sql), literals
+
+
+def _unmask(sql, literals):
+    return _SENTINEL_RE.sub(lambda m: literals[int(m.group(1))], sql)
+
+
+_NAMED_PARAM_RE = re.compile(r"%\((\w+)\)s")
+
+
+def bind_named(sql, params, placeholder="%s"):
+    """
+    Turn %(name)s placeholders into positional ones; returns (sql, values).
+    Placeholders inside literals and comments are left alone.
+    """
+    masked, literals = _mask(sql)
+    names = _NAMED_PARAM_RE.findall(masked)
+    missing = [n for n in names if n not in params]
+    if missing:
+        raise KeyError(f"missing query parameter(s): {', '.join(dict.fromkeys(missing))}")
+    return _unmask(_NAMED_PARAM_RE.sub(placeholder, masked), literals), tuple(params[n] for n in names)
+
+
+def split_statements(script):
+    """Split a SQL script on semicolons that are outside literals and comments."""
+    masked, literals = _mask(script)
+    return [_unmask(s, literals).strip() for s in masked.split(";") if s.strip()]
+
+
+def translate(sql, backend=None, primary_key=None):
+    """
+    Rewrite a MySQL statement for the given backend.
+
+    primary_key is a callable table -> [columns], needed to turn
+    ON DUPLICATE KEY UPDATE into ON CONFLICT (...) DO UPDATE.
+    Returns None when the statement has no equivalent and should be skipped.
+    """
+    backend = backend or DB_BACKEND
+    if not is_embedded(backend):
+        return sql
+
+    masked, literals = _mask(sql)
+    if _SKIPPED_RE.match(masked):
+        return None
+
+    # Placeholders: %s -> ?
+    masked = masked.replace("%s", "?")
+
+    # Upserts
+    upsert = _UPSERT_RE.search(masked)
+    if upsert:
+        table = _INSERT_TABLE_RE.match(masked).group(1)
+        assignments = _VALUES_FN_RE.sub(r"excluded.\1", upsert.group(1))
+        keys = ", ".join(primary_key(table)) if primary_key else ""
+        masked = masked[:upsert.start()] + f"ON CONFLICT ({keys}) DO UPDATE SET{assignments}"
+        masked = re.sub(r"^\s*INSERT\s+IGNORE\s+INTO", "INSERT INTO", masked, flags=re.I)
+    else:
+        masked = re.sub(r"^\s*INSERT\s+IGNORE\s+INTO", "INSERT OR IGNORE INTO", masked, flags=re.I)
+
+    # DDL: foreign keys are not enforced by the loaders (FOREIGN_KEY_CHECKS = 0),
+    # and DuckDB cannot switch them off, so they are dropped.
+    table = _CREATE_TABLE_RE.match(masked)
+    if table:
+        masked = _FK_RE.sub("", masked)
+        if backend == "duckdb":
+            seq = f"{table.group(1)}_seq"
+            if _AUTO_INC_RE.search(masked):
+                masked = _AUTO_INC_RE.sub(rf"\1 INTEGER PRIMARY KEY DEFAULT nextval('{seq}')", masked)
+                masked = f"CREATE SEQUENCE IF NOT EXISTS {seq};\n{masked}"
+        else:
+            masked = _AUTO_INC_RE.sub(r"\1 INTEGER PRIMARY KEY", masked)
+
+    # Expressions
+    masked = re.sub(r"\bAS\s+UNSIGNED\b", "AS BIGINT", masked, flags=re.I)
+    if backend == "duckdb":
+        # MySQL's LIKE is case-insensitive under the schema's _ci collation, as
+        # SQLite's is for ASCII; DuckDB's is not
+        masked = re.sub(r"\bLIKE\b", "ILIKE", masked, flags=re.I)
+    if backend == "sqlite":
+        # MySQL '/' is always decimal division; SQLite truncates integers
+        masked = re.sub(r"(?<![*/])/(?![*/])", "* 1.0 /", masked)
+
+    return _unmask(masked, literals)
+
+
+class _RowInsert:
+    """A translated single-row INSERT ... VALUES (...) that can be sent as a multi-row batch."""
+
+    def __init__(self, table, head, row, tail, key_positions):
+        self.table = table
+        self.head = head                    # INSERT ... INTO t (cols) VALUES
+        self.row = row                      # (?, ?, ...)
+        self.tail = tail                    # ON CONFLICT ... / ""
+        self.key_positions = key_positions  # parameter positions of the primary key
+
+    def key(self, params):
+        return tuple(params[i] for i in self.key_positions)
+
+    def sql(self, n):
+        return f"{self.head} {', '.join([self.row] * n)} {self.tail}"
+
+
+def row_insert(sql, primary_key):
+    """_RowInsert for a translated statement, or None when it cannot be batched."""
+    masked, literals = _mask(sql)
+    m = _ROW_INSERT_RE.match(masked)
+    if not m:
+        return None
+    table, cols, row, tail = m.group(1), m.group(2), m.group(3), m.group(4) or ""
+    cols = [c.strip().lower() for c in cols.split(",")]
+    items = [v.strip() for v in row[1:-1].split(",")]
+    if len(cols) != len(items):
+        return None
+    position, params = {}, 0
+    for col, item in zip(cols, items):
+        if item == "?":
+            position[col] = params
+            params += 1
+    keys = [k.lower() for k in primary_key(table)]
+    if not keys or any(k not in position for k in keys):
+        return None
+    head = _unmask(masked[:m.start(3)], literals).strip()
+    return _RowInsert(table.lower(), head, _unmask(row, literals), _unmask(tail, literals).strip(),
+                      [position[k] for k in keys])
+
+
+# ----------------------
+# Embedded connections
+# ----------------------
+class _StddevPop:
+    """STDDEV_POP aggregate for SQLite."""
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        self.total += value
+        self.total_sq += value * value
+
+    def finalize(self):
+        if not self.n:
+            return None
+        mean = self.total / self.n
+        return math.sqrt(max(self.total_sq / self.n - mean * mean, 0.0))
+
+
+def _sqlite_year(value):
+    try:
+        return int(str(value)[:4])
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddedCursor:
+    """DB-API cursor that translates MySQL statements before running them."""
+
+    def __init__(self, conn):
+        self.connection = conn
+        self._cur = conn._raw if conn.backend == "duckdb" else conn._raw.cursor()
+        self.rowcount = -1
+        self.description = None
+
+    def execute(self, operation, params=None):
+        if isinstance(params, dict):
+            operation, params = bind_named(operation, params)
+        conn = self.connection
+        sql, statements, writes, batch = conn.translated(operation)
+        if sql is None:
+            self.rowcount = 0
+            self.description = None
+            return
+        params = tuple(params) if params else ()
+        if batch is not None:
+            conn._buffer(batch, params)
+            self.description = None
+            self.rowcount = -1
+            return
+        conn._flush()
+        if writes:
+            conn._begin()
+        try:
+            for stmt in statements:
+                self._cur.execute(stmt, params)
+        except conn._integrity_errors as e:
+            raise IntegrityError(str(e)) from e
+        self.description = self._cur.description
+        if writes and conn.backend == "duckdb":
+            row = self._cur.fetchone() if self._cur.description else None
+            self.rowcount = row[0] if row else -1
+            self.description = None
+        else:
+            self.rowcount = getattr(self._cur, "rowcount", -1)
+
+    def executemany(self, operation, seq_of_params):
+        conn = self.connection
+        sql, _, _, batch = conn.translated(operation)
+        if sql is None:
+            return
+        rows = [tuple(p) for p in seq_of_params]
+        conn._flush()
+        conn._begin()
+        if batch is not None:
+            conn._insert_rows(batch, rows)
+            self.rowcount = -1
+            return
+        try:
+            self._cur.executemany(sql, rows)
+        except conn._integrity_errors as e:
+            raise IntegrityError(str(e)) from e
+        self.rowcount = getattr(self._cur, "rowcount", -1)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        if self.connection.backend == "sqlite":
+            self._cur.close()
+
+
+class EmbeddedConnection:
+    """Minimal mysql.connector-compatible wrapper around DuckDB / SQLite."""
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        self._pk_cache = {}
+        self._translated = {}            # operation -> (sql, statements, writes, _RowInsert or None)
+        self._pending = {}               # _RowInsert -> {key: params}, DuckDB only
+        self._in_tx = False
+        if backend == "duckdb":
+            import duckdb  # optional dependency, only needed for DB_BACKEND=duckdb
+            self._raw = duckdb.connect(path)
+            self._integrity_errors = (duckdb.ConstraintException,)
+        else:
+            self._raw = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._raw.create_function("YEAR", 1, _sqlite_year, deterministic=True)
+            self._raw.create_aggregate("STDDEV_POP", 1, _StddevPop)
+            self._integrity_errors = (sqlite3.IntegrityError,)
+
+    def _begin(self):
+        # Embedded engines autocommit; loaders expect MySQL's explicit commit()
+        if not self._in_tx:
+            self._raw.execute("BEGIN TRANSACTION")
+            self._in_tx = True
+
+    def translated(self, operation):
+        """(sql, statements, writes, _RowInsert or None) for a MySQL statement, cached per text."""
+        entry = self._translated.get(operation)
+        if entry is None:
+            sql = translate(operation, self.backend, self.primary_key)
+            if sql is None:
+                entry = (None, (), False, None)
+            else:
+                statements = split_statements(sql)
+                writes = bool(_WRITE_RE.match(sql))
+                batch = (row_insert(sql, self.primary_key)
+                         if self.backend == "duckdb" and writes and len(statements) == 1 else None)
+                entry = (sql, statements, writes, batch)
+            if _DDL_RE.match(operation):
+                # a schema change can move primary keys: forget what was derived from them
+                self._pk_cache.clear()
+                self._translated.clear()
+                return entry
+            if len(self._translated) >= TRANSLATE_CACHE_SIZE:
+                self._translated.clear()
+            self._translated[operation] = entry
+        return entry
+
+    def _buffer(self, batch, params):
+        """Queue one row of a batchable INSERT (DuckDB), flushing first when order would change."""
+        key = batch.key(params)
+        rows = self._pending.get(batch)
+        if (rows is not None and len(rows) >= BATCH_ROWS) or any(
+                other.table == batch.table and key in queued for other, queued in self._pending.items()):
+            self._flush()
+            rows = None
+        if rows is None:
+            rows = self._pending.setdefault(batch, {})
+        rows[key] = params
+
+    def _flush(self):
+        """Send every queued row as multi-row INSERTs."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._begin()
+        for batch, rows in pending.items():
+            self._insert_rows(batch, list(rows.values()))
+
+    def _insert_rows(self, batch, rows):
+        """INSERT rows in multi-row statements; a key repeated within a statement starts the next one."""
+        chunk, keys = [], set()
+        chunks = []
+        for params in rows:
+            key = batch.key(params)
+            if key in keys or len(chunk) >= BATCH_ROWS:
+                chunks.append(chunk)
+                chunk, keys = [], set()
+            chunk.append(params)
+            keys.add(key)
+        if chunk:
+            chunks.append(chunk)
+        try:
+            for chunk in chunks:
+                self._raw.execute(batch.sql(len(chunk)), [v for params in chunk for v in params])
+        except self._integrity_errors as e:
+            raise IntegrityError(str(e)) from e
+
+    def primary_key(self, table):
+        if table not in self._pk_cache:
+            if self.backend == "duckdb":
+                row = self._raw.execute(
+                    "SELECT constraint_column_names FROM duckdb_constraints() "
+                    "WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'", (table,)
+                ).fetchone()
+                self._pk_cache[table] = list(row[0]) if row else []
+            else:
+                cols = self._raw.execute(f"PRAGMA table_info({table})").fetchall()
+                self._pk_cache[table] = [c[1] for c in sorted(cols, key=lambda c: c[5]) if c[5]]
+        return self._pk_cache[table]
+
+    def cursor(self, *args, **kwargs):
+        return EmbeddedCursor(self)
+
+    def commit(self):
+        self._flush()
+        if self._in_tx:
+            self._raw.execute("COMMIT")
+            self._in_tx = False
+
+    def rollback(self):
+        self._pending = {}
+        if self._in_tx:
+            self._raw.execute("ROLLBACK")
+            self._in_tx = False
+
+    def interrupt(self):
+        """Abort the statement running on this connection (from another thread)."""
+        if self._raw is not None:
+            self._raw.interrupt()
+
+    def is_connected(self):
+        return self._raw is not None
+
+    def close(self):
+        if self._raw is not None:
+            self.rollback()
+            self._raw.close()
+            self._raw = None
+
+
+# ----------------------
+# Public API
+# ----------------------
+def connect(backend=None, path=None, **mysql_kwargs):
+    """
+    Open a connection on the configured backend.
+
+    mysql_kwargs (host, user, port, password, database) are only used for
+    MySQL; missing ones fall back to the DB_* environment variables.
+    """
+    backend = backend or DB_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown DB_BACKEND '{backend}' (expected one of {', '.join(BACKENDS)})")
+    if is_embedded(backend):
+        return EmbeddedConnection(backend, path or DB_PATH)
+
+    params = {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", ""),
+        "database": os.getenv("DB_NAME", "cricbuzz_db"),
+    }
+    if os.getenv("DB_PORT"):
+        params["port"] = os.getenv("DB_PORT")
+    params.update({k: v for k, v in mysql_kwargs.items() if v not in (None, "")})
+    import mysql.connector  # imported on first use; embedded backends never need it
+
+    return mysql.connector.connect(**params)
+
+
+def init_schema(conn=None, schema_path=SCHEMA_PATH):
+    """Create the tables from schema.sql on an embedded backend."""
+    own = conn is None
+    conn = conn or connect()
+    cur = conn.cursor()
+    with open(schema_path, "r", encoding="utf-8") as f:
+        for stmt in split_statements(f.read()):
+            cur.execute(stmt)
+    conn.commit()
+    cur.close()
+    if own:
+        conn.close()
+    print(f"✅ Schema initialised on {DB_BACKEND} ({DB_PATH})")
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storage backend helper")
+    parser.add_argument("--init", action="store_true", help="Create schema.sql tables on the embedded backend")
+    parser.add_argument("--translate", metavar="SQL_FILE", help="Print a SQL file translated for DB_BACKEND")
+    args = parser.parse_args()
+
+    if args.init:
+        if not is_embedded():
+            parser.error("--init is for DB_BACKEND=duckdb/sqlite; use schema.sql directly on MySQL")
+        init_schema()
+
+    if args.translate:
+        with open(args.translate, "r", encoding="utf-8") as f:
+            for stmt in split_statements(f.read()):
+                sql = translate(stmt)
+                if sql is not None:
+                    print(sql + ";\n")
+
+    if not any(vars(args).values()):
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,207 @@
+import argparse
+import time
+from collections import Counter
+
+from utils import cache_warmer, db_loader, payloads
+from utils.aggregates import refresh_aggregates
+from utils.dimensions import DimensionCache
+from utils.fetch_api_base import CacheWriter, fetch_payload
+from utils.partitions import ensure_partitions
+from utils.result_cache import bump_data_version
+from utils.scorecard_delta import apply_scorecard
+
+# ----------------------
+# Streaming ingest
+# ----------------------
+# The batch path is API -> cache file -> db_loader, which re-reads and
+# re-parses every file. For live and delta refreshes this ingest skips the
+# round trip: each response is decoded once into its utils.payloads struct
+# and handed straight to db_loader's row builders. The raw bytes are queued
+# to a CacheWriter thread, so the cache stays complete for the next batch
+# load without the disk write sitting on the hot path.
+#
+# Writes share one connection and are committed every `batch_size`
+# payloads; summary tables are refreshed once, for the matches touched.
+
+
+class StreamIngest:
+    """One fetch-to-database session (use as a context manager)."""
+
+    def __init__(self, batch_size=50, write_cache=True):
+        self.batch_size = batch_size
+        self.conn = db_loader.get_connection()
+        ensure_partitions(self.conn)
+        self.cursor = self.conn.cursor()
+        self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        self.dims = DimensionCache(self.cursor)
+        self.writer = CacheWriter() if write_cache else None
+        self.touched = set()
+        self.counts = Counter()
+        self.pending = 0
+        self.started = time.perf_counter()
+
+    def _fetch(self, endpoint, filename, payload_type):
+        return fetch_payload(endpoint, filename, payload_type, self.writer)
+
+    def _wrote(self, kind):
+        self.counts[kind] += 1
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.conn.commit()
+            self.pending = 0
+
+    # ----------------------
+    # Payload kinds
+    # ----------------------
+    def feed(self, kind="live"):
+        """Upsert the matches of a live / upcoming / recent feed; returns their ids."""
+        feed = self._fetch(f"matches/v1/{kind}", f"matches_{kind}.json", payloads.MatchesFeed)
+        mids = []
+        for block in feed.type_matches if feed else ():
+            for series in block.series_matches:
+                wrapper = series.series_ad_wrapper
+                for m in wrapper.matches if wrapper else ():
+                    mid = db_loader.write_match_info(self.cursor, self.dims, m.match_info) if m.match_info else None
+                    if mid:
+                        mids.append(mid)
+                        self.touched.add(mid)
+        self._wrote("feed")
+        return mids
+
+    def series(self, sid):
+        """Upsert the series and matches of one series; returns the match ids."""
+        data = self._fetch(f"series/v1/{sid}", f"series_{sid}_matches.json", payloads.SeriesMatches)
+        mids = []
+        for detail in data.match_details if data else ():
+            for m in detail.match_details_map.match if detail.match_details_map else ():
+                mid = db_loader.write_match_info(self.cursor, self.dims, m.match_info) if m.match_info else None
+                if mid:
+                    mids.append(mid)
+                    self.touched.add(mid)
+        self._wrote("series")
+        return mids
+
+    def match(self, mid, scorecard=True):
+        """Match centre details and (optionally) the scorecard delta of one match."""
+        data = self._fetch(f"mcenter/v1/{mid}", f"match_{mid}_info.json", payloads.MatchCenter)
+        if data and db_loader.write_match_details(self.cursor, self.dims, data.match_info):
+            self.touched.add(int(mid))
+            self._wrote("match_info")
+
+        if scorecard:
+            sc = self._fetch(f"mcenter/v1/{mid}/scard", f"match_{mid}_scorecard.json", payloads.Scorecard)
+            if sc:
+                self.cursor.execute("SELECT YEAR(start_date) FROM matches WHERE match_id = %s", (mid,))
+                row = self.cursor.fetchone()
+                changes = apply_scorecard(self.cursor, sc, int(mid), (row[0] if row else None) or 0)
+                if any(up or dele for up, dele in changes.values()):
+                    self.touched.add(int(mid))
+                self._wrote("scorecard")
+
+    def player(self, pid):
+        """Player info plus batting and bowling stats grids."""
+        info = self._fetch(f"stats/v1/player/{pid}", f"player_{pid}_info.json", payloads.PlayerInfo)
+        if info:
+            db_loader.write_player(self.cursor, self.dims, info)
+            self._wrote("player")
+        batting = self._fetch(f"stats/v1/player/{pid}/batting", f"player_{pid}_batting.json", payloads.StatsGrid)
+        if batting:
+            db_loader.write_batting_stats(self.cursor, self.dims, int(pid), batting)
+            self._wrote("batting")
+        bowling = self._fetch(f"stats/v1/player/{pid}/bowling", f"player_{pid}_bowling.json", payloads.StatsGrid)
+        if bowling:
+            db_loader.write_bowling_stats(self.cursor, self.dims, int(pid), bowling)
+            self._wrote("bowling")
+
+    def venue(self, vid):
+        info = self._fetch(f"venues/v1/{vid}", f"venue_{vid}_info.json", payloads.VenueInfo)
+        if info:
+            db_loader.write_venue(self.cursor, int(vid), info)
+            self._wrote("venue")
+
+    # ----------------------
+    # Session
+    # ----------------------
+    def close(self):
+        """Commit, refresh the summary tables for touched matches and flush the cache writer."""
+        self.conn.commit()
+        self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        self.cursor.close()
+        if self.touched:
+            refresh_aggregates(self.touched, self.conn)
+            bump_data_version(self.conn)
+        self.conn.close()
+        if self.touched:
+            cache_warmer.after_bump(db_loader.get_pool())
+        if self.writer is not None:
+            self.writer.close()
+
+        elapsed = time.perf_counter() - self.started
+        summary = ", ".join(f"{k} {n}" for k, n in sorted(self.counts.items())) or "nothing"
+        cached = f", {self.writer.written} files cached" if self.writer is not None else ""
+        print(f"✅ Streamed {summary} in {elapsed:.2f}s ({len(self.touched)} matches touched{cached})")
+
+    def abort(self):
+        """Roll back the open batch and release the connection and cache writer (no refresh, no version bump)."""
+        try:
+            self.conn.rollback()
+            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            self.cursor.close()
+        finally:
+            self.conn.close()
+            if self.writer is not None:
+                self.writer.close()
+        committed = sum(self.counts.values()) - self.pending
+        print(f"⚠️ Stream aborted: open batch rolled back, {committed} earlier payloads stay committed; "
+              f"summary tables not refreshed (python -m utils.aggregates --matches ...)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def ingest_feeds(kinds=("live",), scorecards=True, write_cache=True):
+    """Stream the given feeds and every match in them (details + scorecard)."""
+    with StreamIngest(write_cache=write_cache) as ingest:
+        for kind in kinds:
+            for mid in ingest.feed(kind):
+                ingest.match(mid, scorecard=scorecards)
+        return set(ingest.touched)
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch from the API straight into the database")
+    parser.add_argument("--feeds", nargs="+", choices=["live", "upcoming", "recent"],
+                        help="Ingest these match feeds and every match in them")
+    parser.add_argument("--match", type=int, nargs="+", default=[], help="Match id(s): details + scorecard")
+    parser.add_argument("--series", type=int, nargs="+", default=[], help="Series id(s): series + matches")
+    parser.add_argument("--player", type=int, nargs="+", default=[], help="Player id(s): info + stats")
+    parser.add_argument("--venue", type=int, nargs="+", default=[], help="Venue id(s)")
+    parser.add_argument("--no-scorecards", action="store_true", help="Skip scorecards for feed / series matches")
+    parser.add_argument("--no-cache", action="store_true", help="Do not write fetched payloads to the cache")
+    args = parser.parse_args()
+
+    if not (args.feeds or args.match or args.series or args.player or args.venue):
+        print("⚠️ No arguments provided. Use --help for options.")
+    else:
+        with StreamIngest(write_cache=not args.no_cache) as ingest:
+            for kind in args.feeds or ():
+                for mid in ingest.feed(kind):
+                    ingest.match(mid, scorecard=not args.no_scorecards)
+            for sid in args.series:
+                for mid in ingest.series(sid):
+                    ingest.match(mid, scorecard=not args.no_scorecards)
+            for mid in args.match:
+                ingest.match(mid)
+            for pid in args.player:
+                ingest.player(pid)
+            for vid in args.venue:
+                ingest.venue(vid)
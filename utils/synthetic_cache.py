@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+# ----------------------
+# Synthetic cache generator
+# ----------------------
+# Writes a utils/cache style tree with the same file names and payload
+# shapes the Cricbuzz API returns, so db_loader can be benchmarked
+# without spending API quota.
+
+# Entity counts at scale 1x (roughly one season of cached data)
+BASE_COUNTS = {
+    "teams": 20,
+    "players": 600,
+    "venues": 60,
+    "series": 25,
+    "matches_per_series": 8,
+}
+
+# matchFormat as the matches endpoints spell it; the stats grids head
+# their columns Test / ODI / T20 / IPL instead
+FORMATS = ["TEST", "ODI", "T20"]
+GRID_FORMATS = ["Test", "ODI", "T20", "IPL"]
+ROLES = ["Batsman", "Bowler", "Batting Allrounder", "Bowling Allrounder", "WK-Batsman"]
+BAT_STYLES = ["Right-hand bat", "Left-hand bat"]
+BOWL_STYLES = [
+    "Right-arm fast", "Right-arm medium", "Right-arm offbreak",
+    "Left-arm orthodox", "Left-arm fast-medium", "Legbreak googly",
+]
+COUNTRIES = [
+    "India", "Australia", "England", "South Africa", "New Zealand",
+    "Pakistan", "Sri Lanka", "West Indies", "Bangladesh", "Afghanistan",
+    "Zimbabwe", "Ireland", "Netherlands", "Scotland", "Nepal",
+    "Oman", "Namibia", "United Arab Emirates", "Canada", "United States",
+]
+DISMISSALS = [
+    "c {f} b {b}", "b {b}", "lbw b {b}", "c & b {b}", "run out ({f})", "st {f} b {b}",
+]
+
+BATTING_METRICS = [
+    "Matches", "Innings", "Runs", "Balls", "Highest", "Average", "SR", "Not Out",
+    "Fours", "Sixes", "Ducks", "50s", "100s", "200s", "300s", "400s",
+]
+BOWLING_METRICS = [
+    "Matches", "Innings", "Balls", "Runs", "Maidens", "Wickets", "Avg", "Eco",
+    "SR", "BBI", "BBM", "4w", "5w", "10w",
+]
+
+
+def _epoch_ms(dt):
+    return str(int(dt.timestamp() * 1000))
+
+
+def _write(cache_dir, filename, payload):
+    with open(os.path.join(cache_dir, filename), "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+# ----------------------
+# Payload builders
+# ----------------------
+def build_teams(rng, n_teams):
+    teams = []
+    for i in range(n_teams):
+        country = COUNTRIES[i % len(COUNTRIES)]
+        teams.append({
+            "teamId": i + 2,
+            "teamName": country if i < len(COUNTRIES) else f"{country} {i // len(COUNTRIES)}",
+            "teamSName": country[:3].upper(),
+            "countryName": country,
+            "imageId": rng.randint(100000, 999999),
+        })
+    return teams
+
+
+def build_player_info(rng, pid, team):
+    name = f"Player {pid}"
+    return {
+        "id": str(pid),
+        "name": name,
+        "nickName": name.split()[-1],
+        "role": rng.choice(ROLES),
+        "bat": rng.choice(BAT_STYLES),
+        "bowl": rng.choice(BOWL_STYLES),
+        "DoBFormat": f"{rng.choice(['January', 'March', 'July', 'October'])} {rng.randint(1, 28)}, {rng.randint(1985, 2004)}",
+        "birthPlace": f"{team['countryName']} City",
+        "intlTeam": team["countryName"],
+        "image": f"http://i.cricketcb.com/stats/img/faceImages/{pid}.jpg",
+        "teamNameIds": [{"teamId": str(team["teamId"]), "teamName": team["teamName"]}],
+    }
+
+
+def _grid(headers, metrics, make_value):
+    return {
+        "headers": ["ROWHEADER"] + headers,
+        "values": [{"values": [m] + [make_value(m) for _ in headers]} for m in metrics],
+    }
+
+
+def build_batting_grid(rng):
+    def value(metric):
+        if metric == "Highest":
+            return f"{rng.randint(0, 250)}{'*' if rng.random() < 0.2 else ''}"
+        if metric in ("Average", "SR"):
+            return f"{rng.uniform(5, 150):.2f}"
+        return str(rng.randint(0, 400))
+    return _grid(GRID_FORMATS, BATTING_METRICS, value)
+
+
+def build_bowling_grid(rng):
+    def value(metric):
+        if metric in ("BBI", "BBM"):
+            return f"{rng.randint(0, 8)}/{rng.randint(5, 120)}"
+        if metric in ("Avg", "Eco", "SR"):
+            return f"{rng.uniform(2, 60):.2f}"
+        return str(rng.randint(0, 400))
+    return _grid(GRID_FORMATS, BOWLING_METRICS, value)
+
+
+def build_venue_info(rng, vid, country):
+    return {
+        "ground": f"Ground {vid}",
+        "city": f"City {vid}",
+        "country": country,
+        "timezone": "+05:30",
+        "established": rng.randint(1860, 2015),
+        "capacity": f"{rng.randint(5, 130) * 1000:,}",
+        "knownAs": f"Stadium {vid}",
+        "ends": "Pavilion End, City End",
+        "homeTeam": country,
+        "floodlights": rng.random() < 0.8,
+        "imageUrl": f"http://i.cricketcb.com/stats/img/venues/{vid}.jpg",
+    }
+
+
+def build_match_info(rng, mid, sid, series_name, fmt, start, team1, team2, vid):
+    return {
+        "matchId": mid,
+        "seriesId": sid,
+        "seriesName": series_name,
+        "matchDesc": f"{mid % 10 + 1}th Match",
+        "matchFormat": fmt,
+        "startDate": _epoch_ms(start),
+        "endDate": _epoch_ms(start + timedelta(days=5 if fmt == "TEST" else 1)),
+        "state": "Complete",
+        "status": f"{team1['teamName']} won",
+        "team1": {"teamId": team1["teamId"], "teamName": team1["teamName"], "teamSName": team1["teamSName"]},
+        "team2": {"teamId": team2["teamId"], "teamName": team2["teamName"], "teamSName": team2["teamSName"]},
+        "venueInfo": {"id": vid, "ground": f"Ground {vid}", "city": f"City {vid}", "timezone": "+05:30"},
+        "seriesStartDt": _epoch_ms(start - timedelta(days=3)),
+        "seriesEndDt": _epoch_ms(start + timedelta(days=60)),
+        "seriesType": "International",
+    }
+
+
+def _roster(rng, team, squad):
+    details = []
+    for i, p in enumerate(squad):
+        details.append({
+            "id": int(p["id"]),
+            "name": p["name"],
+            "fullName": p["name"],
+            "nickName": p["nickName"],
+            "role": p["role"],
+            "battingStyle": p["bat"],
+            "bowlingStyle": p["bowl"],
+            "teamName": team["teamName"],
+            "faceImageId": rng.randint(100000, 999999),
+            "captain": i == 0,
+            "keeper": i == 1,
+            "substitute": i >= 11,
+        })
+    return {"id": team["teamId"], "name": team["teamName"], "shortName": team["teamSName"], "playerDetails": details}
+
+
+def _official(rng, oid):
+    return {"id": oid, "name": f"Official {oid}", "country": rng.choice(COUNTRIES)}
+
+
+def build_match_detail(rng, base_info, team1, team2, squad1, squad2):
+    winner = rng.choice([team1, team2])
+    toss = rng.choice([team1, team2])
+    potm = rng.choice(squad1[:11] + squad2[:11])
+    mi = dict(base_info)
+    mi.update({
+        "result": {
+            "resultType": "win",
+            "winningTeam": winner["teamName"],
+            "winningteamId": winner["teamId"],
+            "winningMargin": rng.randint(1, 200),
+            "winByRuns": rng.random() < 0.5,
+            "winByInnings": False,
+        },
+        "tossResults": {
+            "tossWinnerId": toss["teamId"],
+            "tossWinnerName": toss["teamName"],
+            "decision": rng.choice(["Batting", "Bowling"]),
+        },
+        "umpire1": _official(rng, rng.randint(1, 200)),
+        "umpire2": _official(rng, rng.randint(1, 200)),
+        "umpire3": _official(rng, rng.randint(1, 200)),
+        "referee": _official(rng, rng.randint(1, 200)),
+        "playersOfTheMatch": [{"id": int(potm["id"]), "name": potm["name"], "fullName": potm["name"], "teamName": potm["intlTeam"]}],
+        "playersOfTheSeries": [],
+        "team1": _roster(rng, team1, squad1),
+        "team2": _roster(rng, team2, squad2),
+    })
+    return {"matchInfo": mi}
+
+
+def _innings(rng, iid, batting_squad, bowling_squad, fmt):
+    max_overs = {"TEST": 120, "ODI": 50, "T20": 20}[fmt]
+    batsmen, bowlers, fow = [], [], []
+    total = 0
+    for order, p in enumerate(batting_squad[:11], start=1):
+        runs = int(rng.expovariate(1 / 25))
+        balls = max(1, int(runs * rng.uniform(0.6, 1.6)))
+        out = order < 11 and rng.random() < 0.85
+        fielder = rng.choice(bowling_squad[:11])["name"]
+        bowler = rng.choice(bowling_squad[:6])["name"]
+        batsmen.append({
+            "id": int(p["id"]),
+            "name": p["name"],
+            "runs": runs,
+            "balls": balls,
+            "fours": runs // 8,
+            "sixes": runs // 30,
+            "strkrate": f"{100 * runs / balls:.2f}",
+            "outdec": rng.choice(DISMISSALS).format(f=fielder, b=bowler) if out else "not out",
+        })
+        total += runs
+        if out:
+            fow.append({
+                "batsmanid": int(p["id"]),
+                "batsmanname": p["name"],
+                "runs": total,
+                "overnbr": round(min(max_overs, order * max_overs / 11) + rng.randint(0, 5) / 10, 1),
+            })
+    for p in bowling_squad[:6]:
+        overs = rng.randint(1, max_overs // 5)
+        runs = int(overs * rng.uniform(3, 9))
+        bowlers.append({
+            "id": int(p["id"]),
+            "name": p["name"],
+            "overs": str(overs),
+            "maidens": rng.randint(0, overs // 4),
+            "runs": runs,
+            "wickets": rng.randint(0, 5),
+            "economy": f"{runs / overs:.2f}",
+            "balls": overs * 6,
+        })
+    return {"inningsid": iid, "batsman": batsmen, "bowler": bowlers, "fow": {"fow": fow}}
+
+
+def build_scorecard(rng, mid, fmt, squad1, squad2):
+    n_innings = 4 if fmt == "TEST" else 2
+    sides = [(squad1, squad2), (squad2, squad1)]
+    return {
+        "matchId": mid,
+        "scorecard": [_innings(rng, i + 1, *sides[i % 2], fmt) for i in range(n_innings)],
+    }
+
+
+# ----------------------
+# Tree writer
+# ----------------------
+def generate_cache(cache_dir, scale=1, seed=42):
+    """Write a synthetic cache tree into cache_dir and return entity counts."""
+    rng = random.Random(seed)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    n_teams = BASE_COUNTS["teams"]
+    n_players = BASE_COUNTS["players"] * scale
+    n_venues = BASE_COUNTS["venues"] * scale
+    n_series = BASE_COUNTS["series"] * scale
+
+    teams = build_teams(rng, n_teams)
+    _write(cache_dir, "teams_list.json", {"list": teams})
+
+    players_by_team = {t["teamId"]: [] for t in teams}
+    for pid in range(1000, 1000 + n_players):
+        team = teams[pid % n_teams]
+        info = build_player_info(rng, pid, team)
+        players_by_team[team["teamId"]].append(info)
+        _write(cache_dir, f"player_{pid}_info.json", info)
+        _write(cache_dir, f"player_{pid}_batting.json", build_batting_grid(rng))
+        _write(cache_dir, f"player_{pid}_bowling.json", build_bowling_grid(rng))
+
+    venue_ids = list(range(1, n_venues + 1))
+    for vid in venue_ids:
+        _write(cache_dir, f"venue_{vid}_info.json", build_venue_info(rng, vid, rng.choice(COUNTRIES)))
+
+    mid = 100000
+    n_matches = 0
+    start_base = datetime(2019, 1, 1)
+    for sid in range(5000, 5000 + n_series):
+        series_name = f"Synthetic Series {sid}"
+        fmt = rng.choice(FORMATS)
+        series_start = start_base + timedelta(days=rng.randint(0, 6 * 365))
+        match_maps = []
+        for k in range(BASE_COUNTS["matches_per_series"]):
+            mid += 1
+            team1, team2 = rng.sample(teams, 2)
+            squad1 = rng.sample(players_by_team[team1["teamId"]], min(15, len(players_by_team[team1["teamId"]])))
+            squad2 = rng.sample(players_by_team[team2["teamId"]], min(15, len(players_by_team[team2["teamId"]])))
+            start = series_start + timedelta(days=3 + 4 * k)
+            info = build_match_info(rng, mid, sid, series_name, fmt, start, team1, team2, rng.choice(venue_ids))
+            match_maps.append({"matchInfo": info})
+            _write(cache_dir, f"match_{mid}_info.json", build_match_detail(rng, info, team1, team2, squad1, squad2))
+            _write(cache_dir, f"match_{mid}_scorecard.json", build_scorecard(rng, mid, fmt, squad1, squad2))
+            n_matches += 1
+        _write(cache_dir, f"series_{sid}_matches.json", {
+            "matchDetails": [{"matchDetailsMap": {"key": series_start.strftime("%a, %d %b %Y"), "match": match_maps, "seriesId": sid}}],
+        })
+
+    counts = {
+        "teams": n_teams,
+        "players": n_players,
+        "venues": n_venues,
+        "series": n_series,
+        "matches": n_matches,
+    }
+    print(f"✅ Synthetic cache ({scale}x) written to {cache_dir}: {counts}")
+    return counts
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic Cricbuzz cache generator")
+    parser.add_argument("--out", required=True, help="Directory to write the cache tree into")
+    parser.add_argument("--scale", type=int, default=1, choices=[1, 10, 100], help="Scale factor (1x/10x/100x)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible trees")
+    args = parser.parse_args()
+
+    generate_cache(args.out, scale=args.scale, seed=args.seed)
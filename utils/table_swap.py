@@ -0,0 +1,330 @@
+import argparse
+import os
+import re
+import shutil
+
+from utils import cache_warmer, db_pool, storage
+
+# ----------------------
+# Blue-green loads
+# ----------------------
+# A blue-green load never writes to the tables the pages are reading:
+#
+#   1. the live tables are copied into a shadow (a <db>_shadow schema on
+#      MySQL, a <file>.shadow copy on the embedded engines),
+#   2. db_loader runs against the shadow,
+#   3. the shadow is validated against live (no upsert-only table lost
+#      rows, no new orphaned foreign keys, core tables not empty),
+#   4. and swapped in: one multi-table RENAME TABLE on MySQL, which is
+#      atomic, or an atomic file replace on DuckDB / SQLite.
+#
+# The previous tables stay in <db>_old (or <file>.old) until the next
+# blue-green load, so a bad load can be undone with --rollback.
+
+SHADOW_SUFFIX = "_shadow"
+OLD_SUFFIX = "_old"
+
+# Tables that must never be empty after a load
+CORE_TABLES = ("teams", "players", "matches")
+
+# Tables the loaders only ever insert into or update. Everything else may
+# legitimately shrink: scorecard deltas delete fact rows, a match whose year
+# changed moves its rows, and aggregate groups merge or move between years.
+UPSERT_ONLY_TABLES = ("teams", "players", "venues", "series", "matches")
+
+_FK_RE = re.compile(r"FOREIGN\s+KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)", re.I)
+
+
+class ValidationError(Exception):
+    """The shadow tables failed validation and were not swapped in."""
+
+
+def foreign_keys(schema_path=storage.SCHEMA_PATH):
+    """[(table, column, parent_table, parent_column)] declared in schema.sql."""
+    with open(schema_path, "r", encoding="utf-8") as f:
+        statements = storage.split_statements(f.read())
+    fks = []
+    for stmt in statements:
+        m = re.match(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", stmt, re.I)
+        if m:
+            fks += [(m.group(1), col, parent, pcol) for col, parent, pcol in _FK_RE.findall(stmt)]
+    return fks
+
+
+def _q(table, schema=None):
+    return f"`{schema}`.`{table}`" if schema else table
+
+
+def base_tables(conn, schema=None):
+    """Base tables (no views) of `schema` on MySQL, or of the embedded database."""
+    cur = conn.cursor()
+    if storage.is_embedded():
+        if storage.DB_BACKEND == "sqlite":
+            cur.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+        else:
+            cur.execute("SELECT table_name FROM information_schema.tables WHERE table_type = 'BASE TABLE'")
+    else:
+        cur.execute("""
+            SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        """, (schema,))
+    tables = sorted(row[0] for row in cur.fetchall())
+    cur.close()
+    return tables
+
+
+def table_stats(conn, schema=None, fks=None):
+    """({table: rows}, {(table, column): orphaned rows}) for one side of the swap."""
+    fks = foreign_keys() if fks is None else fks
+    tables = base_tables(conn, schema)
+    cur = conn.cursor()
+    counts = {}
+    for table in tables:
+        cur.execute(f"SELECT COUNT(*) FROM {_q(table, schema)}")
+        counts[table] = cur.fetchone()[0]
+    orphans = {}
+    for table, col, parent, pcol in fks:
+        if table not in counts or parent not in counts:
+            continue
+        cur.execute(f"""
+            SELECT COUNT(*) FROM {_q(table, schema)} c
+            LEFT JOIN {_q(parent, schema)} p ON p.{pcol} = c.{col}
+            WHERE c.{col} IS NOT NULL AND p.{pcol} IS NULL
+        """)
+        orphans[(table, col)] = cur.fetchone()[0]
+    cur.close()
+    return counts, orphans
+
+
+def validate(live_stats, shadow_stats):
+    """List of problems that should stop the swap (empty when the shadow is good)."""
+    live_counts, live_orphans = live_stats
+    shadow_counts, shadow_orphans = shadow_stats
+    problems = []
+    for table, rows in live_counts.items():
+        if table not in shadow_counts:
+            problems.append(f"{table}: missing from shadow")
+        elif table in UPSERT_ONLY_TABLES and shadow_counts[table] < rows:
+            # nothing deletes from these, so a table that shrank means a broken copy or load
+            problems.append(f"{table}: {shadow_counts[table]} rows in shadow < {rows} live")
+    for table in CORE_TABLES:
+        if not shadow_counts.get(table):
+            problems.append(f"{table}: empty in shadow")
+    for key, n in shadow_orphans.items():
+        if n > live_orphans.get(key, 0):
+            problems.append(f"{key[0]}.{key[1]}: {n} orphaned rows (live has {live_orphans.get(key, 0)})")
+    return problems
+
+
+# ----------------------
+# MySQL: shadow schema + RENAME TABLE
+# ----------------------
+def live_foreign_keys(conn, schema):
+    """[(table, constraint, [columns], parent, [parent columns], on update, on delete)] declared in `schema`."""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME,
+               k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+        JOIN INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS r
+          ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+        WHERE k.TABLE_SCHEMA = %s AND k.REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+    """, (schema,))
+    fks = {}
+    for table, name, col, parent, pcol, on_update, on_delete in cur.fetchall():
+        fk = fks.setdefault((table, name), (table, name, [], parent, [], on_update, on_delete))
+        fk[2].append(col)
+        fk[4].append(pcol)
+    cur.close()
+    return list(fks.values())
+
+
+def prepare_shadow_schema(conn, live, shadow):
+    """(Re)create `shadow` as a copy of every base table in `live`, foreign keys included."""
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{shadow}`")
+    cur.execute(f"CREATE DATABASE `{shadow}`")
+    for table in base_tables(conn, live):
+        # LIKE keeps indexes and partitioning, not foreign keys
+        cur.execute(f"CREATE TABLE {_q(table, shadow)} LIKE {_q(table, live)}")
+        cur.execute(f"INSERT INTO {_q(table, shadow)} SELECT * FROM {_q(table, live)}")
+        conn.commit()
+    # the shadow tables become the live ones, so they need live's foreign keys
+    # (the copied rows are as consistent as live's; they are not re-checked)
+    cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table, name, cols, parent, pcols, on_update, on_delete in live_foreign_keys(conn, live):
+        cur.execute(f"ALTER TABLE {_q(table, shadow)} ADD CONSTRAINT `{name}` "
+                    f"FOREIGN KEY ({', '.join(cols)}) REFERENCES {_q(parent, shadow)} ({', '.join(pcols)}) "
+                    f"ON UPDATE {on_update} ON DELETE {on_delete}")
+    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cur.close()
+
+
+def swap_schemas(conn, live, shadow, old):
+    """Atomically move live tables to `old` and shadow tables to `live`."""
+    tables = base_tables(conn, shadow)
+    cur = conn.cursor()
+    cur.execute(f"DROP DATABASE IF EXISTS `{old}`")
+    cur.execute(f"CREATE DATABASE `{old}`")
+    renames = []
+    for table in tables:
+        renames.append(f"{_q(table, live)} TO {_q(table, old)}")
+        renames.append(f"{_q(table, shadow)} TO {_q(table, live)}")
+    # a single RENAME TABLE is atomic: readers see either the old or the new set
+    cur.execute("RENAME TABLE " + ", ".join(renames))
+    cur.execute(f"DROP DATABASE IF EXISTS `{shadow}`")
+    cur.close()
+
+
+def rollback_schemas(conn, live, old):
+    """Swap the tables kept in `old` back into `live`."""
+    tables = base_tables(conn, old)
+    if not tables:
+        raise ValidationError(f"Nothing to roll back: `{old}` has no tables")
+    tmp = live + "_rollback"
+    cur = conn.cursor()
+    cur.execute(f"CREATE DATABASE IF NOT EXISTS `{tmp}`")
+    renames = []
+    for table in tables:
+        renames.append(f"{_q(table, live)} TO {_q(table, tmp)}")
+        renames.append(f"{_q(table, old)} TO {_q(table, live)}")
+        renames.append(f"{_q(table, tmp)} TO {_q(table, old)}")
+    cur.execute("RENAME TABLE " + ", ".join(renames))
+    cur.execute(f"DROP DATABASE IF EXISTS `{tmp}`")
+    cur.close()
+
+
+# ----------------------
+# DuckDB / SQLite: shadow file + atomic replace
+# ----------------------
+def swap_files(live_path, shadow_path, old_path):
+    """Replace the live database file with the shadow, keeping the old one."""
+    if os.path.exists(old_path):
+        os.remove(old_path)
+    # hard link first so the live path is never missing, then replace atomically
+    os.link(live_path, old_path)
+    os.replace(shadow_path, live_path)
+
+
+# ----------------------
+# Blue-green load
+# ----------------------
+def blue_green_load(load_fn, warm=True):
+    """
+    Run `load_fn()` (db_loader's loaders) against a shadow copy of the live
+    tables, validate it and swap it in. Raises ValidationError, leaving the
+    live tables untouched, when validation fails. The data version bumped in
+    the shadow goes live with the swap, so the caches are warmed after it
+    (cache_warmer.after_bump) unless `warm` is False.
+    """
+    from utils import db_loader
+
+    fks = foreign_keys()
+    # pooled connections must not outlive the swap (they would keep the
+    # replaced file / dropped shadow schema open); closing also checkpoints DuckDB
+    db_pool.close_all()
+
+    if storage.is_embedded():
+        live_path = storage.DB_PATH
+        shadow_path = live_path + ".shadow"
+        shutil.copy2(live_path, shadow_path)
+        storage.DB_PATH = shadow_path
+        try:
+            result = load_fn()
+        finally:
+            db_pool.close_all()
+            storage.DB_PATH = live_path
+
+        live_conn = storage.connect(path=live_path)
+        shadow_conn = storage.connect(path=shadow_path)
+        try:
+            problems = validate(table_stats(live_conn, fks=fks), table_stats(shadow_conn, fks=fks))
+        finally:
+            live_conn.close()
+            shadow_conn.close()
+        if problems:
+            raise ValidationError("; ".join(problems))
+        swap_files(live_path, shadow_path, live_path + ".old")
+        print(f"✅ Swapped {shadow_path} into {live_path}")
+        if warm:
+            cache_warmer.after_bump(db_loader.get_pool())
+        return result
+
+    live = db_loader.DB_NAME
+    shadow, old = live + SHADOW_SUFFIX, live + OLD_SUFFIX
+    conn = db_loader.get_connection()
+    try:
+        prepare_shadow_schema(conn, live, shadow)
+        print(f"✅ Shadow schema `{shadow}` prepared")
+
+        db_loader.DB_NAME = shadow
+        try:
+            result = load_fn()
+        finally:
+            db_loader.DB_NAME = live
+
+        problems = validate(table_stats(conn, live, fks), table_stats(conn, shadow, fks))
+        if problems:
+            raise ValidationError("; ".join(problems))
+        swap_schemas(conn, live, shadow, old)
+        db_pool.close_all()
+        print(f"✅ Swapped `{shadow}` into `{live}` (previous tables kept in `{old}`)")
+        if warm:
+            cache_warmer.after_bump(db_loader.get_pool())
+        return result
+    finally:
+        conn.close()
+
+
+def rollback():
+    """Put the tables from before the last blue-green load back."""
+    if storage.is_embedded():
+        live_path, old_path = storage.DB_PATH, storage.DB_PATH + ".old"
+        if not os.path.exists(old_path):
+            raise ValidationError(f"Nothing to roll back: {old_path} does not exist")
+        tmp_path = live_path + ".rollback"
+        os.link(live_path, tmp_path)
+        os.replace(old_path, live_path)
+        os.replace(tmp_path, old_path)
+        db_pool.close_all()
+        print(f"✅ Rolled back {live_path}")
+        return
+
+    from utils import db_loader
+
+    live = db_loader.DB_NAME
+    conn = db_loader.get_connection()
+    try:
+        rollback_schemas(conn, live, live + OLD_SUFFIX)
+    finally:
+        conn.close()
+    db_pool.close_all()
+    print(f"✅ Rolled back `{live}` from `{live + OLD_SUFFIX}`")
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blue-green table swap helpers (loads: python -m utils.db_loader --blue-green)")
+    parser.add_argument("--rollback", action="store_true", help="Swap the tables from before the last blue-green load back in")
+    parser.add_argument("--check", action="store_true", help="Print row counts and orphaned foreign keys of the live tables")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback()
+
+    if args.check:
+        from utils import db_loader
+
+        with db_loader.get_pool().connection() as conn:
+            counts, orphans = table_stats(conn, None if storage.is_embedded() else db_loader.DB_NAME)
+        for table, rows in counts.items():
+            print(f"{table:25} {rows}")
+        for (table, col), n in orphans.items():
+            if n:
+                print(f"⚠️ {table}.{col}: {n} orphaned rows")
+
+    if not (args.rollback or args.check):
+        print("⚠️ No arguments provided. Use --help for options.")
@@ -0,0 +1,211 @@
+import argparse
+import base64
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+from functools import lru_cache
+
+import streamlit as st
+
+from utils import cache_warmer, db_pool, storage
+
+# ----------------------
+# Shared page layout
+# ----------------------
+# app.py and every page draw the same header (CSS, logo, title) and footer
+# and share one connection pool through this module:
+#
+#   ui.header("📑 Match Analytics")
+#   with ui.get_connection() as conn: ...
+#   ui.footer()
+#
+# The logo is read, scaled down to twice its display height and base64
+# encoded once per process (the full-size PNG is ~1.4 MB, ~1.8 MB inlined
+# on every rerun); the CSS is assembled once per distinct page extra.
+# Heavy modules (pandas, mysql.connector, requests) are imported by the
+# utils that need them on first use, not when a page loads.
+#
+# Cold start and rerun times per page: python -m utils.ui --bench
+
+LOGO_PATH = os.path.join(storage.ROOT_DIR, "assets", "Match-logo.png")
+LOGO_HEIGHT = 100
+
+BASE_CSS = """
+.logo-box {
+    width: 100px; height: 10px;
+}
+.title {
+    font-size: 3rem;
+    font-weight: 700;
+    text-align: center;
+    flex: 1;
+    color: #273348;
+    color: linear-gradient(90deg, #72e4fe 0%, #7b7ffe 50%, #eebcf7 100%);
+    letter-spacing: 0.5px;
+}
+.st-emotion-cache-r44huj h1 {
+    font-size: 2.75rem;
+    font-weight: 700;
+    text-align: center;
+    padding: 1.25rem 0px 1rem;
+}
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; padding: 12px; font-size: 14px; color: #aaa;">
+    Build using <a href="https://streamlit.io/" target="_blank" style="color:#FF4B4B; text-decoration: none;">Streamlit</a> & MySQL<br>
+    © 2025 Neeraj Kumar |
+    <a href="https://github.com/Neeraj08823/Crickbuzz_project" target="_blank" style="color:#FF4B4B; text-decoration: none;">GitHub Repo</a>
+</div>
+"""
+
+PAGES = ("app.py", "pages/1_Match Timelines.py", "pages/2_Top Player.py", "pages/3_Queries.py")
+
+
+# ----------------------
+# Cached assets
+# ----------------------
+@lru_cache(maxsize=None)
+def logo_html(path=LOGO_PATH, height=LOGO_HEIGHT):
+    """<img> tag with the logo inlined, scaled to 2x `height` (encoded once per process)."""
+    if not os.path.exists(path):
+        return "LOGO Here"
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(data))
+        if img.height > 2 * height:
+            img.thumbnail((img.width * 2 * height // img.height, 2 * height))
+            out = io.BytesIO()
+            img.save(out, format="PNG", optimize=True)
+            data = out.getvalue()
+    except Exception:
+        pass  # serve the original file
+    b64_img = base64.b64encode(data).decode()
+    return f'<img src="data:image/png;base64,{b64_img}" style="height:{height}px;">'
+
+
+@lru_cache(maxsize=None)
+def style(extra_css=""):
+    """The <style> block: shared rules plus a page's own, with indentation stripped."""
+    rules = "\n".join(line.strip() for line in (BASE_CSS + extra_css).splitlines() if line.strip())
+    return f"<style>\n{rules}\n</style>"
+
+
+def header(title=None, extra_css=""):
+    """CSS, logo, the MatchInfo title and divider, then the page's own title."""
+    start_warmer()
+    st.markdown(style(extra_css), unsafe_allow_html=True)
+    st.markdown(f'<div class="logo-box">{logo_html()}</div>', unsafe_allow_html=True)
+    st.markdown('<div class="title">🏏 MatchInfo</div>', unsafe_allow_html=True)
+    st.markdown(""" <div style="border: 2px solid #01b489; margin-bottom: 15px;"> </div>""", unsafe_allow_html=True)
+    if title:
+        st.title(title)
+
+
+def footer():
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# ----------------------
+# Database
+# ----------------------
+def _has_mysql_secrets():
+    try:
+        return "mysql" in st.secrets
+    except Exception:  # no secrets.toml at all
+        return False
+
+
+# One pool per server process, shared by every page, session and rerun
+@st.cache_resource
+def get_pool():
+    if _has_mysql_secrets():  # when running on Streamlit Cloud
+        return db_pool.get_pool(
+            host=st.secrets["mysql"]["host"],
+            port=st.secrets["mysql"].get("port", "3306"),
+            user=st.secrets["mysql"]["user"],
+            password=st.secrets["mysql"]["password"],
+            database=st.secrets["mysql"]["database"]
+        )
+    else:  # local development with .env (or DB_BACKEND=duckdb/sqlite)
+        return db_pool.get_pool(
+            host=os.getenv("DB_HOST", "localhost"),
+            user=os.getenv("DB_USER", "root"),
+            password=os.getenv("DB_PASSWORD", ""),
+            database=os.getenv("DB_NAME", "cricbuzz_db")
+        )
+
+
+# Borrowed connection; close() returns it to the pool
+def get_connection():
+    return get_pool().acquire()
+
+
+# Re-warms the result cache, leaderboards and match feeds in the
+# background whenever a load bumps the data version (once per process)
+@st.cache_resource
+def start_warmer():
+    return cache_warmer.start_background(get_pool())
+
+
+# ----------------------
+# Startup benchmark
+# ----------------------
+_BENCH_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.secrets["bench"] = "1"
+t = time.perf_counter(); at.run(); first = time.perf_counter() - t
+reruns = []
+for _ in range(int(sys.argv[2])):
+    t = time.perf_counter(); at.run(); reruns.append(time.perf_counter() - t)
+sent = sum(len(m.value) for m in at.markdown)
+print(json.dumps({"first": first, "reruns": reruns, "markdown_bytes": sent,
+                  "errors": [e.value for e in at.error] + [str(e.value) for e in at.exception]}))
+"""
+
+
+def bench_page(page, reruns=5):
+    """
+    First run (fresh process) and rerun times of one page, via streamlit's
+    AppTest. The background cache warmer is off unless CACHE_WARMER is set.
+    """
+    out = subprocess.run([sys.executable, "-c", _BENCH_SCRIPT, os.path.join(storage.ROOT_DIR, page), str(reruns)],
+                         cwd=storage.ROOT_DIR, capture_output=True, text=True,
+                         env={"CACHE_WARMER": "0", **os.environ, "PYTHONPATH": storage.ROOT_DIR})
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{page}: {out.stderr.strip()[-500:]}")
+    return json.loads(lines[-1])
+
+
+# ----------------------
+# CLI
+# ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared page layout; benchmark page cold start and reruns")
+    parser.add_argument("--bench", action="store_true", help="Time the first run and reruns of every page")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), help="Pages to time (default: all)")
+    args = parser.parse_args()
+
+    if args.bench:
+        print(f"{'page':32} {'first run':>10} {'rerun (median)':>15} {'markdown':>10}")
+        for page in args.pages:
+            result = bench_page(page, args.reruns)
+            rerun = statistics.median(result["reruns"]) if result["reruns"] else 0.0
+            print(f"{page:32} {result['first'] * 1000:8.0f} ms {rerun * 1000:12.1f} ms "
+                  f"{result['markdown_bytes'] / 1024:7.0f} KB")
+            for error in result["errors"]:
+                print(f"   ⚠️ {error}")
+    else:
+        print("⚠️ No arguments provided. Use --help for options.")